@@ -0,0 +1,114 @@
+// Throughput and peak memory of CSV ingestion at 10k / 100k / 1M rows.
+//   npm run bench:csv
+//   npm run bench:csv -- --rows 100000 --mode stream
+// Each measurement runs in its own child process so peak RSS is not carried over.
+import { fork } from 'child_process';
+import { once } from 'events';
+import { createWriteStream, mkdtempSync, readFileSync, rmSync, statSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { ingestShopeeAdsCSV, parseShopeeAdsCSV } from '../server/utils/csv-parser';
+import { fileSource } from '../server/utils/csv-stream';
+
+const DEFAULT_ROWS = [10_000, 100_000, 1_000_000];
+// stream: chunked ingestion straight from disk; whole: the file read as one string and
+// collected into one array, which is what the tRPC upload does today.
+const MODES = ['stream', 'whole'] as const;
+type Mode = (typeof MODES)[number];
+
+interface Result {
+  rows: number;
+  errors: number;
+  seconds: number;
+  peakRssKb: number;
+}
+
+const HEADER = 'Product Name,Product ID,Expense,Impression,Clicks,Conversions,"Sales (฿)",Affiliate Commission\n';
+
+async function writeFixture(file: string, rows: number): Promise<void> {
+  const out = createWriteStream(file);
+  out.write(HEADER);
+  for (let i = 0; i < rows; i++) {
+    const gmv = ((i % 3000) * 1.5).toLocaleString('en-US');
+    const line = `"สินค้า ${i % 997}, รุ่น ${i}",SKU-${i},${(i % 500) + 0.5},${(i * 7) % 100000},${i % 900},${i % 40},"${gmv}",${i % 13}\n`;
+    if (!out.write(line)) await once(out, 'drain');
+  }
+  out.end();
+  await once(out, 'finish');
+}
+
+async function measure(mode: Mode, file: string): Promise<Result> {
+  const started = performance.now();
+  let rows = 0;
+  let errors = 0;
+  if (mode === 'stream') {
+    for await (const chunk of ingestShopeeAdsCSV(fileSource(file))) {
+      rows += chunk.rows.length;
+      errors = chunk.errorCount;
+    }
+  } else {
+    const { data, validationResults } = await parseShopeeAdsCSV(readFileSync(file, 'utf8'));
+    rows = data.length;
+    errors = validationResults.errorCount;
+  }
+  const seconds = (performance.now() - started) / 1000;
+  return { rows, errors, seconds, peakRssKb: process.resourceUsage().maxRSS };
+}
+
+function runChild(mode: Mode, file: string): Promise<Result> {
+  return new Promise((resolve, reject) => {
+    const child = fork(process.argv[1], ['--child', mode, file], { execArgv: process.execArgv });
+    child.once('message', (message) => resolve(message as Result));
+    child.once('error', reject);
+    child.once('exit', (code) => {
+      if (code !== 0) reject(new Error(`${mode} benchmark exited with code ${code}`));
+    });
+  });
+}
+
+function option(name: string): string | undefined {
+  const index = process.argv.indexOf(name);
+  return index === -1 ? undefined : process.argv[index + 1];
+}
+
+async function main(): Promise<void> {
+  if (process.argv[2] === '--child') {
+    const result = await measure(process.argv[3] as Mode, process.argv[4]);
+    process.send?.(result);
+    return;
+  }
+
+  const sizes = option('--rows')?.split(',').map(Number) ?? DEFAULT_ROWS;
+  const modes = (option('--mode')?.split(',') ?? [...MODES]) as Mode[];
+  const dir = mkdtempSync(join(tmpdir(), 'csv-ingest-'));
+  try {
+    console.log('rows       mode    file MB  seconds  rows/s      MB/s    peak RSS MB  errors');
+    for (const size of sizes) {
+      const file = join(dir, `shopee-ads-${size}.csv`);
+      await writeFixture(file, size);
+      const megabytes = statSync(file).size / 1024 / 1024;
+      for (const mode of modes) {
+        const result = await runChild(mode, file);
+        console.log(
+          [
+            String(size).padEnd(10),
+            mode.padEnd(7),
+            megabytes.toFixed(1).padStart(7),
+            result.seconds.toFixed(2).padStart(8),
+            Math.round(result.rows / result.seconds).toLocaleString('en-US').padStart(11),
+            (megabytes / result.seconds).toFixed(1).padStart(7),
+            (result.peakRssKb / 1024).toFixed(0).padStart(13),
+            String(result.errors).padStart(7),
+          ].join('  ')
+        );
+      }
+    }
+  } finally {
+    rmSync(dir, { recursive: true, force: true });
+  }
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
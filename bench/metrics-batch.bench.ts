@@ -0,0 +1,95 @@
+// Per-row cost of calculateMetricsBatch against calculateAllMetrics at 1M and 5M rows.
+// batch allocates its output arrays on every call; batch+into reuses them across calls.
+//   npm run bench:metrics
+//   npm run bench:metrics -- --rows 10000000
+import { calculateAllMetrics } from '../server/utils/gmv-calculations';
+import { type MetricBatch, type MetricColumns, calculateMetricsBatch } from '../server/utils/metrics-batch';
+
+const DEFAULT_ROWS = [1_000_000, 5_000_000];
+const REPEATS = 5;
+const WARMUP_ROWS = 10_000;
+
+function fixture(rows: number): MetricColumns {
+  const column = (f: (i: number) => number) => Float64Array.from({ length: rows }, (_, i) => f(i));
+  return {
+    gmv: column((i) => (i % 5000) * 37.5),
+    orders: column((i) => i % 120),
+    costs: column((i) => (i % 5000) * 20.25),
+    adSpend: column((i) => (i % 700) * 11),
+    clicks: column((i) => i % 3000),
+    impressions: column((i) => (i % 90000) * 3),
+    commissionRate: column((i) => 0.04 + (i % 5) * 0.01),
+    transactionRate: 0.02,
+    paymentRate: 0.03,
+  };
+}
+
+function scalar(columns: MetricColumns, rows: number): number {
+  const value = (column: MetricColumns[keyof MetricColumns], i: number) =>
+    typeof column === 'number' ? column : column[i];
+  let checksum = 0;
+  for (let i = 0; i < rows; i++) {
+    const metrics = calculateAllMetrics({
+      gmv: value(columns.gmv, i),
+      orders: value(columns.orders, i),
+      costs: value(columns.costs, i),
+      adSpend: value(columns.adSpend, i),
+      clicks: value(columns.clicks, i),
+      impressions: value(columns.impressions, i),
+      commissionRate: value(columns.commissionRate, i),
+      transactionRate: value(columns.transactionRate, i),
+      paymentRate: value(columns.paymentRate, i),
+    });
+    checksum += metrics.netProfit;
+  }
+  return checksum;
+}
+
+function best(run: () => unknown): number {
+  let fastest = Infinity;
+  for (let repeat = 0; repeat < REPEATS; repeat++) {
+    const started = performance.now();
+    run();
+    fastest = Math.min(fastest, performance.now() - started);
+  }
+  return fastest / 1000;
+}
+
+function option(name: string): string | undefined {
+  const index = process.argv.indexOf(name);
+  return index === -1 ? undefined : process.argv[index + 1];
+}
+
+function main(): void {
+  const sizes = option('--rows')?.split(',').map(Number) ?? DEFAULT_ROWS;
+  // Let both engines reach optimized code before anything is timed.
+  const warmup = fixture(WARMUP_ROWS);
+  for (let repeat = 0; repeat < 50; repeat++) {
+    calculateMetricsBatch(warmup);
+    scalar(warmup, WARMUP_ROWS);
+  }
+
+  console.log('rows        engine       seconds  ns/row        rows/s');
+  for (const size of sizes) {
+    const columns = fixture(size);
+    const into: MetricBatch = calculateMetricsBatch(columns);
+    const timings: Array<[string, number]> = [
+      ['batch', best(() => calculateMetricsBatch(columns))],
+      ['batch+into', best(() => calculateMetricsBatch(columns, { into }))],
+      ['scalar', best(() => scalar(columns, size))],
+    ];
+    for (const [engine, seconds] of timings) {
+      console.log(
+        [
+          String(size).padEnd(10),
+          engine.padEnd(11),
+          seconds.toFixed(3).padStart(8),
+          ((seconds * 1e9) / size).toFixed(1).padStart(6),
+          Math.round(size / seconds).toLocaleString('en-US').padStart(12),
+        ].join('  ')
+      );
+    }
+  }
+}
+
+main();
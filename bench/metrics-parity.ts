@@ -0,0 +1,89 @@
+// Checks calculateMetricsBatch against calculateAllMetrics row by row, including rows
+// with zero orders, clicks, impressions, ad spend or GMV.
+//   npm run check:metrics
+import { calculateAllMetrics } from '../server/utils/gmv-calculations';
+import {
+  METRIC_NAMES,
+  type MetricName,
+  calculateMetricsBatch,
+  metricsAt,
+  toColumns,
+} from '../server/utils/metrics-batch';
+
+// Denominator of each ratio; with the default options a zero denominator gives 0.
+const DENOMINATORS: Partial<Record<MetricName, 'gmv' | 'orders' | 'adSpend' | 'clicks' | 'impressions'>> = {
+  aov: 'orders',
+  roas: 'adSpend',
+  realRoas: 'adSpend',
+  breakEvenRoas: 'adSpend',
+  targetRoas: 'adSpend',
+  ctr: 'impressions',
+  cpc: 'clicks',
+  cpa: 'orders',
+  conversionRate: 'clicks',
+  profitMargin: 'gmv',
+};
+const ROWS = 200_000;
+
+// Small deterministic generator so a failure can be reproduced.
+let seed = 20240101;
+function random(): number {
+  seed = (seed * 1103515245 + 12345) % 2147483648;
+  return seed / 2147483648;
+}
+
+function value(scale: number): number {
+  const roll = random();
+  if (roll < 0.1) return 0;
+  if (roll < 0.12) return -random() * scale;
+  return Math.round(random() * scale * 100) / 100;
+}
+
+function fixture() {
+  return Array.from({ length: ROWS }, () => ({
+    gmv: value(500_000),
+    orders: Math.round(value(2_000)),
+    costs: value(300_000),
+    adSpend: value(80_000),
+    clicks: Math.round(value(50_000)),
+    impressions: Math.round(value(2_000_000)),
+    commissionRate: random() * 0.1,
+    transactionRate: 0.02,
+    paymentRate: random() < 0.5 ? 0.03 : 0,
+  }));
+}
+
+function same(a: number, b: number): boolean {
+  return Object.is(a, b) || (Number.isNaN(a) && Number.isNaN(b));
+}
+
+function main(): void {
+  const records = fixture();
+  const columns = toColumns(records);
+  const ieee = calculateMetricsBatch(columns, { zeroDivision: 'ieee' });
+  const zeroed = calculateMetricsBatch(columns);
+  // transactionRate is the same on every row, so passing it as a plain number must not change anything.
+  const constant = calculateMetricsBatch({ ...columns, transactionRate: 0.02 }, { zeroDivision: 'ieee' });
+  const failures: string[] = [];
+
+  records.forEach((record, i) => {
+    const scalar = calculateAllMetrics(record);
+    const ieeeRow = metricsAt(ieee, i);
+    const zeroRow = metricsAt(zeroed, i);
+    for (const name of METRIC_NAMES) {
+      const denominator = DENOMINATORS[name];
+      const expected = denominator && record[denominator] === 0 ? 0 : scalar[name];
+      if (!same(ieeeRow[name], scalar[name])) failures.push(`row ${i} ${name} (ieee): ${ieeeRow[name]} != ${scalar[name]}`);
+      if (!same(zeroRow[name], expected)) failures.push(`row ${i} ${name}: ${zeroRow[name]} != ${expected}`);
+      if (!same(constant[name][i], scalar[name])) failures.push(`row ${i} ${name} (constant column): ${constant[name][i]} != ${scalar[name]}`);
+    }
+  });
+
+  if (failures.length > 0) {
+    console.error(`❌ ${failures.length} mismatches\n${failures.slice(0, 20).join('\n')}`);
+    process.exit(1);
+  }
+  console.log(`✅ ${ROWS.toLocaleString('en-US')} rows x ${METRIC_NAMES.length} metrics match calculateAllMetrics`);
+}
+
+main();
@@ -0,0 +1,108 @@
+// Time and peak memory of matchProductData at 1k / 10k / 100k products on each side.
+//   npm run bench:match
+//   npm run bench:match -- --rows 100000
+// Each size runs in its own child process so peak RSS is not carried over.
+import { fork } from 'child_process';
+import { type BigSellerData, type ShopeeAdsData, matchProductData } from '../server/utils/csv-parser';
+
+const DEFAULT_ROWS = [1_000, 10_000, 100_000];
+const WORDS = ['เสื้อยืด', 'กางเกง', 'หมวก', 'กระเป๋า', 'รองเท้า', 'ผ้าพันคอ', 'cotton', 'oversize', 'premium', 'kids'];
+const COLORS = ['ดำ', 'ขาว', 'แดง', 'น้ำเงิน', 'เขียว', 'เทา', 'navy', 'beige'];
+const SIZES = ['S', 'M', 'L', 'XL', 'XXL'];
+
+interface Result {
+  seconds: number;
+  peakRssKb: number;
+  sku: number;
+  name: number;
+  fuzzy: number;
+  unmatched: number;
+}
+
+function productName(i: number): string {
+  return `${WORDS[i % WORDS.length]} ${WORDS[(i * 7) % WORDS.length]} สี${COLORS[i % COLORS.length]} ไซส์ ${SIZES[i % SIZES.length]} รุ่น ${i}`;
+}
+
+// One in two rows share a SKU written differently, one in four only a reworded name,
+// one in eight the exact name, and the rest have no counterpart.
+function fixture(rows: number): { shopee: ShopeeAdsData[]; bigseller: BigSellerData[] } {
+  const shopee: ShopeeAdsData[] = [];
+  const bigseller: BigSellerData[] = [];
+  for (let i = 0; i < rows; i++) {
+    const name = productName(i);
+    const kind = i % 8;
+    shopee.push({
+      productName: kind < 4 ? name : `${name} [ของแท้]`,
+      productSku: kind < 4 ? `sku-${i}` : '',
+      adSpend: i % 500, impressions: i * 7, clicks: i % 900, orders: i % 40, gmv: i * 1.5, affiliateCommission: i % 13,
+    });
+    bigseller.push({
+      productName: kind === 7 ? `ไม่มีคู่ ${i}` : kind === 6 ? `${name} [ของแท้]` : name.replace(' รุ่น ', ' รุ่นที่ '),
+      productSku: kind < 4 ? ` SKU ${String(i).replace(/\d/g, (d) => String.fromCharCode(0xff10 + Number(d)))} ` : `BS${i}`,
+      orders: i % 40, units: i % 60, gmv: i * 1.5, productCost: i % 300,
+    });
+  }
+  return { shopee, bigseller };
+}
+
+function measure(rows: number): Result {
+  const { shopee, bigseller } = fixture(rows);
+  const started = performance.now();
+  const result = matchProductData(shopee, bigseller);
+  const seconds = (performance.now() - started) / 1000;
+  const count = (method: string) => result.matched.filter((match) => match.matchedBy === method).length;
+  return {
+    seconds,
+    peakRssKb: process.resourceUsage().maxRSS,
+    sku: count('sku'),
+    name: count('name'),
+    fuzzy: count('fuzzy'),
+    unmatched: result.unmatchedShopee.length,
+  };
+}
+
+function runChild(rows: number): Promise<Result> {
+  return new Promise((resolve, reject) => {
+    const child = fork(process.argv[1], ['--child', String(rows)], { execArgv: process.execArgv });
+    child.once('message', (message) => resolve(message as Result));
+    child.once('error', reject);
+    child.once('exit', (code) => {
+      if (code !== 0) reject(new Error(`${rows}-row benchmark exited with code ${code}`));
+    });
+  });
+}
+
+function option(name: string): string | undefined {
+  const index = process.argv.indexOf(name);
+  return index === -1 ? undefined : process.argv[index + 1];
+}
+
+async function main(): Promise<void> {
+  if (process.argv[2] === '--child') {
+    process.send?.(measure(Number(process.argv[3])));
+    return;
+  }
+
+  const sizes = option('--rows')?.split(',').map(Number) ?? DEFAULT_ROWS;
+  console.log('rows x rows  seconds  us/row  peak RSS MB     sku    name   fuzzy  unmatched');
+  for (const size of sizes) {
+    const result = await runChild(size);
+    console.log(
+      [
+        String(size).padEnd(11),
+        result.seconds.toFixed(2).padStart(7),
+        ((result.seconds * 1e6) / size).toFixed(1).padStart(6),
+        (result.peakRssKb / 1024).toFixed(0).padStart(11),
+        String(result.sku).padStart(6),
+        String(result.name).padStart(6),
+        String(result.fuzzy).padStart(6),
+        String(result.unmatched).padStart(9),
+      ].join('  ')
+    );
+  }
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
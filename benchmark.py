@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# วัดความเร็วทั้ง pipeline กับ mock_api.py โดยไม่เรียก API จริง
+#   python3 benchmark.py --save benchmark-baseline.json
+#   python3 benchmark.py --compare benchmark-baseline.json
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_api import start_server
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+GENERATE_ALL = os.path.join(ROOT, "generate_all.py")
+DEFAULT_TOLERANCE = 0.2
+
+# แต่ละโหมดรันใน directory ว่างของตัวเอง ไฟล์ที่ได้ manifest cache และ log จึงไม่ปนกัน
+MODES = {
+    "sequential": ["--jobs", "1", "--no-cache"],
+    "concurrent": ["--jobs", "8", "--no-cache"],
+    "streaming": ["--jobs", "8", "--stream", "--no-cache"],
+    "batch": ["--batch", "--poll-interval", "0.2", "--no-cache"],
+    "cached": ["--jobs", "8"],
+}
+WARM_UP = {"cached": ["--jobs", "8"]}
+
+
+def run_pipeline(workdir, args, env):
+    # wait4 ให้ peak RSS ของ process นี้ตัวเดียว ไม่ใช่ค่าสูงสุดของลูกทุกตัวที่เคยรัน
+    with open(os.path.join(workdir, "output.txt"), 'a', encoding='utf-8') as output:
+        started = time.monotonic()
+        process = subprocess.Popen([sys.executable, GENERATE_ALL, "--force", *args], cwd=workdir, env=env, stdout=output, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.monotonic() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, elapsed, usage.ru_maxrss
+
+
+def tail(path, lines=5):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return "".join(f.readlines()[-lines:])
+    except OSError:
+        return ""
+
+
+def benchmark_mode(mode, server, env, repeat):
+    runs = []
+    for _ in range(repeat):
+        workdir = tempfile.mkdtemp(prefix=f"benchmark-{mode}-")
+        try:
+            if mode in WARM_UP:
+                code, _, _ = run_pipeline(workdir, WARM_UP[mode], env)
+                if code != 0:
+                    raise RuntimeError(f"{mode} warm-up failed:\n{tail(os.path.join(workdir, 'output.txt'))}")
+
+            before = dict(server.state.calls)
+            code, elapsed, peak_rss = run_pipeline(workdir, MODES[mode], env)
+            calls = {name: count - before.get(name, 0) for name, count in server.state.calls.items()}
+            if code != 0:
+                raise RuntimeError(f"{mode} run failed:\n{tail(os.path.join(workdir, 'output.txt'))}")
+            runs.append({"wall_s": round(elapsed, 3), "peak_rss_kb": peak_rss, "api_calls": calls})
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    walls = [run["wall_s"] for run in runs]
+    return {
+        "wall_s": round(statistics.median(walls), 3),
+        "wall_s_runs": walls,
+        "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+        "api_calls": runs[-1]["api_calls"],
+    }
+
+
+def answered_calls(result, name):
+    calls = result["api_calls"]
+    if name == "answered":
+        return calls.get("messages", 0) - calls.get("rate_limited", 0) - calls.get("overloaded", 0)
+    return calls.get(name, 0)
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for mode, result in results["modes"].items():
+        before = baseline.get("modes", {}).get(mode)
+        if before is None:
+            continue
+        if result["wall_s"] > before["wall_s"] * (1 + tolerance):
+            regressions.append(f"{mode}: wall time {before['wall_s']:.2f}s → {result['wall_s']:.2f}s")
+        if result["peak_rss_kb"] > before["peak_rss_kb"] * (1 + tolerance):
+            regressions.append(f"{mode}: peak RSS {before['peak_rss_kb'] // 1024} MB → {result['peak_rss_kb'] // 1024} MB")
+        # 429/529 ที่สุ่มฉีดเข้ามาไม่นับ เทียบเฉพาะ request ที่สำเร็จ
+        for name in ("answered", "batches"):
+            if answered_calls(result, name) > answered_calls(before, name):
+                regressions.append(f"{mode}: {name} calls {answered_calls(before, name)} → {answered_calls(result, name)}")
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'mode':<12} {'wall':>8} {'peak RSS':>9} {'HTTP':>5} {'messages':>9} {'batches':>8} {'429/529':>8}")
+    for mode, result in results["modes"].items():
+        calls = result["api_calls"]
+        line = (
+            f"{mode:<12} {result['wall_s']:>7.2f}s {result['peak_rss_kb'] // 1024:>6} MB {calls['http']:>5} "
+            f"{calls['messages']:>9} {calls['batches']:>8} {calls['rate_limited'] + calls['overloaded']:>8}"
+        )
+        before = (baseline or {}).get("modes", {}).get(mode)
+        if before:
+            line += f"  ({(result['wall_s'] / before['wall_s'] - 1) * 100:+.0f}% vs baseline)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time full generation runs against the local mock Messages API.")
+    parser.add_argument("--mode", action="append", choices=list(MODES), help="modes to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per mode; wall time is the median")
+    parser.add_argument("--latency", type=float, default=0.2, help="median seconds to first token (default: 0.2)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="lognormal spread of the latency (default: 0.5)")
+    parser.add_argument("--tokens-per-second", type=float, default=2000.0, help="mock output token rate (default: 2000)")
+    parser.add_argument("--output-lines", type=int, default=60, help="filler lines per canned response (default: 60)")
+    parser.add_argument("--max-concurrent", type=int, help="mock answers 429 above this many in-flight requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests the mock answers with 529")
+    parser.add_argument("--batch-delay", type=float, default=1.0, help="seconds before a mock batch ends (default: 1)")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for the mock's latency and error sampling")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a baseline JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help=f"allowed slowdown before a regression is reported (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    mock = {
+        "latency": args.latency,
+        "latency_sigma": args.latency_sigma,
+        "tokens_per_second": args.tokens_per_second,
+        "output_lines": args.output_lines,
+        "max_concurrent": args.max_concurrent,
+        "error_rate": args.error_rate,
+        "seed": args.seed,
+    }
+    server = start_server(0, args.batch_delay, **mock)
+    env = dict(
+        os.environ,
+        ANTHROPIC_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}",
+        ANTHROPIC_API_KEY="mock",
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    for name in ("GENERATION_CACHE_DIR", "GENERATION_MANIFEST", "GENERATION_LOG"):
+        env.pop(name, None)
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mock": dict(mock, batch_delay=args.batch_delay),
+        "modes": {},
+    }
+    try:
+        for mode in args.mode or list(MODES):
+            print(f"⏱️ {mode}...", flush=True)
+            results["modes"][mode] = benchmark_mode(mode, server, env, max(1, args.repeat))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 2
+    finally:
+        server.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("mock") != results["mock"]:
+            print("⚠️ mock settings differ from the baseline, timings are not comparable")
+
+    print()
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\n✅ Saved baseline to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions:\n" + "\n".join(f"  {line}" for line in regressions))
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
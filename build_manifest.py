@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import time
+
+from response_cache import cache_key
+
+MANIFEST_PATH = os.environ.get("GENERATION_MANIFEST", ".generation-manifest.json")
+
+
+def spec_sha256(job):
+    spec = {"model": job.model, "max_tokens": job.max_tokens, "system": job.system, "prompt": job.prompt}
+    # เพิ่มเฉพาะไฟล์ที่แบ่งส่วน เพื่อไม่ให้ไฟล์อื่นกลายเป็น stale
+    if job.sections:
+        spec["sections"] = [(section.name, section.prompt, section.shared, section.max_tokens) for section in job.sections]
+    return cache_key(spec)
+
+
+def file_sha256(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class BuildManifest:
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.outputs = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.outputs = json.load(f).get("outputs", {})
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        data = {"version": 1, "outputs": dict(sorted(self.outputs.items()))}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+    def record(self, job):
+        self.outputs[job.filename] = {
+            "group": job.group,
+            "model": job.model,
+            "max_tokens": job.max_tokens,
+            "prompt_sha256": spec_sha256(job),
+            # เก็บ prompt ไว้ให้ --edit ส่งเฉพาะส่วนที่เปลี่ยน
+            "prompt": job.prompt,
+            "inputs": {path: file_sha256(path) for path in job.inputs},
+            "output_sha256": file_sha256(job.filename),
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def stale_reason(self, job):
+        entry = self.outputs.get(job.filename)
+        if entry is None:
+            return "never generated"
+        if not os.path.exists(job.filename):
+            return "output missing"
+        if entry["model"] != job.model or entry["max_tokens"] != job.max_tokens:
+            return "model settings changed"
+        if entry["prompt_sha256"] != spec_sha256(job):
+            return "prompt changed"
+        if set(entry["inputs"]) != set(job.inputs):
+            return "declared inputs changed"
+        for path, digest in entry["inputs"].items():
+            if file_sha256(path) != digest:
+                return f"input {path} changed"
+        return None
+
+    def previous_prompt(self, job):
+        return self.outputs.get(job.filename, {}).get("prompt")
+
+    def stale_jobs(self, jobs):
+        stale = {}
+        for job in jobs:
+            reason = self.stale_reason(job)
+            if reason is not None:
+                stale[job.filename] = reason
+
+        # ไฟล์ที่ขึ้นกับไฟล์ที่กำลังจะถูกสร้างใหม่ก็ต้องสร้างใหม่ด้วย
+        changed = True
+        while changed:
+            changed = False
+            for job in jobs:
+                if job.filename in stale:
+                    continue
+                for path in job.inputs:
+                    if path in stale:
+                        stale[job.filename] = f"input {path} is stale"
+                        changed = True
+                        break
+
+        return [(job, stale[job.filename]) for job in jobs if job.filename in stale]
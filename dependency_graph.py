@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import asyncio
+
+
+class DependencyError(Exception):
+    pass
+
+
+def find_conflicts(declarations):
+    owners = {}
+    for owner, filename in declarations:
+        owners.setdefault(filename, []).append(owner)
+    return {filename: names for filename, names in owners.items() if len(names) > 1}
+
+
+def dependencies(jobs):
+    targets = {job.filename for job in jobs}
+    return {job.filename: [path for path in job.inputs if path in targets] for job in jobs}
+
+
+def topological_order(jobs):
+    graph = dependencies(jobs)
+    order = []
+    state = {}
+
+    def visit(filename, path):
+        if state.get(filename) == "done":
+            return
+        if state.get(filename) == "visiting":
+            cycle = path[path.index(filename):] + [filename]
+            raise DependencyError("dependency cycle: " + " -> ".join(cycle))
+
+        state[filename] = "visiting"
+        for dependency in graph[filename]:
+            visit(dependency, path + [filename])
+        state[filename] = "done"
+        order.append(filename)
+
+    for job in jobs:
+        visit(job.filename, [])
+
+    by_filename = {job.filename: job for job in jobs}
+    return [by_filename[filename] for filename in order]
+
+
+def critical_path(jobs, durations):
+    # เวลาที่เหลือจนจบสายที่ยาวที่สุดซึ่งผ่านไฟล์นี้ ไฟล์ที่ค่ามากควรได้เริ่มก่อน
+    ordered = topological_order(jobs)
+    graph = dependencies(ordered)
+    dependents = {job.filename: [] for job in ordered}
+    for filename, deps in graph.items():
+        for dependency in deps:
+            dependents[dependency].append(filename)
+
+    remaining = {}
+    for job in reversed(ordered):
+        after = max((remaining[dependent] for dependent in dependents[job.filename]), default=0.0)
+        remaining[job.filename] = durations.get(job.filename, 0.0) + after
+    return remaining
+
+
+async def run_graph(jobs, run_job, priorities=None):
+    # รันไฟล์ที่ไม่มี dependency ค้างอยู่พร้อมกัน แล้วปล่อยไฟล์ถัดไปเมื่อ dependency เสร็จ
+    # ไฟล์ที่พร้อมพร้อมกันเริ่มตาม priority มากก่อน เพื่อให้ได้ slot ของ limiter ก่อน
+    ordered = topological_order(jobs)
+    if priorities:
+        ordered.sort(key=lambda job: -priorities.get(job.filename, 0.0))
+    graph = dependencies(ordered)
+    dependents = {job.filename: [] for job in ordered}
+    for filename, deps in graph.items():
+        for dependency in deps:
+            dependents[dependency].append(filename)
+
+    by_filename = {job.filename: job for job in ordered}
+    waiting = {filename: len(deps) for filename, deps in graph.items()}
+    finished = set()
+    running = {}
+
+    def skip(filename):
+        skipped = []
+        for dependent in dependents[filename]:
+            if dependent not in finished:
+                finished.add(dependent)
+                skipped.append((dependent, filename))
+                skipped.extend(skip(dependent))
+        return skipped
+
+    for job in ordered:
+        if waiting[job.filename] == 0:
+            running[asyncio.create_task(run_job(job))] = job.filename
+
+    while running:
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            filename = running.pop(task)
+            finished.add(filename)
+            error = task.exception()
+            result = None if error is not None else task.result()
+            yield by_filename[filename], result, error
+
+            if error is not None:
+                for dependent, failed in skip(filename):
+                    yield by_filename[dependent], None, DependencyError(f"dependency {failed} failed")
+                continue
+
+            released = []
+            for dependent in dependents[filename]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0 and dependent not in finished:
+                    released.append(dependent)
+            for dependent in sorted(released, key=lambda name: -(priorities or {}).get(name, 0.0)):
+                running[asyncio.create_task(run_job(by_filename[dependent]))] = dependent
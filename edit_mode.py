@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# แก้ไฟล์เดิมด้วย search/replace block แทนการเขียนใหม่ทั้งไฟล์ เมื่อ prompt เปลี่ยนเล็กน้อย
+import difflib
+import re
+
+NO_CHANGES = "NO CHANGES"
+BLOCK = re.compile(r"<<<<<<< SEARCH\n(.*?)\n?=======\n(.*?)\n?>>>>>>> REPLACE", re.DOTALL)
+
+EDIT_INSTRUCTIONS = """The instructions for {path} have changed. The file below was generated from the previous instructions.
+
+Changes to the instructions:
+<instructions_diff>
+{diff}
+</instructions_diff>
+
+New instructions in full:
+<instructions>
+{prompt}
+</instructions>
+
+Current file:
+<file path="{path}">
+{content}
+</file>
+
+Update the file so it follows the new instructions, changing only what the new instructions require.
+Reply only with search/replace blocks in this exact format, one block per change:
+
+<<<<<<< SEARCH
+exact lines copied from the current file
+=======
+the lines that replace them
+>>>>>>> REPLACE
+
+Each SEARCH part must match the current file exactly, including indentation, and appear in it only once.
+Include enough surrounding lines to make it unique. If the file already follows the new instructions, reply {no_changes}."""
+
+
+class PatchError(Exception):
+    pass
+
+
+def edit_params(params, path, previous_prompt, prompt, content):
+    diff = "\n".join(difflib.unified_diff(previous_prompt.splitlines(), prompt.splitlines(), "previous", "new", lineterm=""))
+    message = EDIT_INSTRUCTIONS.format(path=path, diff=diff, prompt=prompt, content=content, no_changes=NO_CHANGES)
+    return dict(params, messages=[{"role": "user", "content": message}])
+
+
+def parse_patch(reply):
+    if reply.strip() == NO_CHANGES:
+        return []
+    blocks = BLOCK.findall(reply)
+    if not blocks:
+        raise PatchError("reply has no search/replace blocks")
+    # block ที่ปิดไม่ครบแปลว่า reply ถูกตัดหรือผิดรูปแบบ ใช้ไม่ได้ทั้งชุด
+    if reply.count("<<<<<<< SEARCH") != len(blocks):
+        raise PatchError("reply has a malformed search/replace block")
+    return blocks
+
+
+def apply_patch(content, blocks):
+    for number, (search, replace) in enumerate(blocks, 1):
+        if not search.strip():
+            raise PatchError(f"block {number} has an empty SEARCH part")
+        count = content.count(search)
+        if count != 1:
+            raise PatchError(f"block {number} SEARCH text {'is not in the file' if count == 0 else f'matches {count} places'}")
+        content = content.replace(search, replace, 1)
+    return content
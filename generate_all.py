@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import sys
+import time
+from fnmatch import fnmatch
+
+from build_manifest import BuildManifest
+from dependency_graph import DependencyError, critical_path, find_conflicts, run_graph, topological_order
+from generation import make_jobs
+from history import History
+from message_batches import DEFAULT_POLL_INTERVAL
+from plan import plan, predicted_durations
+from prompt_manifest import GROUPS, TARGETS
+from rate_limit import DEFAULT_RATE_LIMIT_RETRIES
+from response_cache import add_cache_arguments, cache_from_args
+from runner import DEFAULT_MAX_CONTINUATIONS, DEFAULT_MAX_RETRIES, Runner, run_jobs
+from telemetry import add_log_arguments, format_table, log_from_args
+from telemetry import main as report_main
+from validation import validate_file
+
+
+def collect_jobs(targets=TARGETS):
+    conflicts = find_conflicts((f"entry {index} ({target.group})", target.path) for index, target in enumerate(targets, 1))
+    if conflicts:
+        details = "\n".join(f"  {filename}: {', '.join(owners)}" for filename, owners in conflicts.items())
+        raise DependencyError(f"files declared more than once in prompt_manifest.py:\n{details}")
+
+    return make_jobs(targets)
+
+
+def select_jobs(jobs, groups=(), patterns=()):
+    return [
+        job for job in jobs
+        if (not groups or job.group in groups) and (not patterns or any(fnmatch(job.filename, pattern) for pattern in patterns))
+    ]
+
+
+def list_jobs(jobs, stale):
+    reasons = {job.filename: reason for job, reason in stale}
+    print(format_table(
+        ["file", "group", "model", "max tokens", "inputs", "status"],
+        [[job.filename, job.group, job.model, job.max_tokens, len(job.inputs), reasons.get(job.filename, "up to date")] for job in jobs],
+    ))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["report"]:
+        return report_main(argv[1:])
+    planning = argv[:1] == ["plan"]
+    if planning:
+        argv = argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description="Generate the files declared in prompt_manifest.py concurrently, in dependency order.",
+        epilog="Run `generate_all.py plan [options]` to estimate tokens, cost and wall time of a run without generating, "
+               "and `generate_all.py report` to summarise the telemetry log.",
+    )
+    parser.add_argument("--only", action="append", default=[], metavar="PATH", help="only generate files matching PATH (glob, repeatable)")
+    parser.add_argument("--group", action="append", default=[], choices=GROUPS, help="only generate files in GROUP (repeatable)")
+    parser.add_argument("--jobs", "-j", type=int, default=8, help="maximum concurrent API requests; lowered automatically on 429/529 (default: 8)")
+    parser.add_argument("--list", action="store_true", help="list the selected files with their group, model and status")
+    parser.add_argument("--check", action="store_true", help="list stale files without generating anything")
+    parser.add_argument("--force", action="store_true", help="regenerate every file, stale or not")
+    parser.add_argument("--stream", action="store_true", help="stream each response straight to disk as it arrives")
+    parser.add_argument("--batch", action="store_true", help="submit pending files as a Message Batch (shared context files go in a batch of their own first)")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, help=f"seconds between batch status checks (default: {DEFAULT_POLL_INTERVAL:.0f})")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES, help=f"re-requests per file that fails validation (default: {DEFAULT_MAX_RETRIES})")
+    parser.add_argument("--edit", action="store_true", help="for files whose prompt changed, ask for search/replace edits to the current file instead of a full rewrite")
+    parser.add_argument("--hedge", action="store_true", help="send a duplicate request when a file runs past its p90 latency from the telemetry log")
+    parser.add_argument("--max-continuations", type=int, default=DEFAULT_MAX_CONTINUATIONS, help=f"follow-up requests per file that stops at max_tokens (default: {DEFAULT_MAX_CONTINUATIONS})")
+    parser.add_argument("--rate-limit-retries", type=int, default=DEFAULT_RATE_LIMIT_RETRIES, help=f"re-sends per request after 429/529 or a dropped connection (default: {DEFAULT_RATE_LIMIT_RETRIES})")
+    parser.add_argument("--validate", action="store_true", help="validate the current files without generating anything")
+    parser.add_argument("--offline", action="store_true", help="with plan: estimate input tokens locally instead of calling count_tokens")
+    parser.add_argument("--touch", action="store_true", help="record the current files as up to date without generating")
+    add_cache_arguments(parser)
+    add_log_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.batch and args.stream:
+        parser.error("--batch and --stream cannot be combined")
+    if args.batch and (args.hedge or args.edit):
+        parser.error("--hedge and --edit only apply to direct requests, not --batch")
+
+    manifest = BuildManifest()
+    try:
+        jobs = collect_jobs()
+        topological_order(jobs)
+    except DependencyError as e:
+        print(f"❌ {e}")
+        return 2
+
+    # ความ stale ต้องคิดจากกราฟทั้งหมด แล้วค่อยตัดเหลือเฉพาะไฟล์ที่เลือก
+    selected = select_jobs(jobs, args.group, args.only)
+    if not selected:
+        print(f"❌ no files match {' '.join(args.only + args.group)}")
+        return 2
+    names = {job.filename for job in selected}
+
+    if args.validate:
+        invalid = 0
+        for job in selected:
+            errors = validate_file(job.filename)
+            if errors:
+                invalid += 1
+                print(f"{job.filename}: {'; '.join(errors)}")
+        print(f"\n{invalid} of {len(selected)} files failed validation")
+        return 1 if invalid else 0
+
+    if args.touch:
+        for job in selected:
+            manifest.record(job)
+        manifest.save()
+        print(f"✅ Recorded {len(selected)} files in {manifest.path}")
+        return 0
+
+    if args.force:
+        stale = [(job, "forced") for job in selected]
+    else:
+        stale = [(job, reason) for job, reason in manifest.stale_jobs(jobs) if job.filename in names]
+        # --refresh FILE ต้องขอ FILE ใหม่จริงแม้ไฟล์จะ up to date แล้ว ไม่ใช่แค่ข้าม cache
+        refresh = set(args.refresh) - {job.filename for job, _ in stale}
+        if refresh:
+            stale += [(job, "refresh requested") for job in selected if job.filename in refresh]
+
+    if args.list:
+        list_jobs(selected, stale)
+        return 0
+
+    history = History.from_log(args.log)
+    if planning:
+        if not stale:
+            print(f"✅ All {len(selected)} files are up to date, nothing to plan")
+            return 0
+        print(plan([job for job, _ in stale], history, max(1, args.jobs), args.offline))
+        return 0
+
+    if args.check:
+        for job, reason in stale:
+            print(f"{job.filename}: {reason}")
+        print(f"\n{len(stale)} of {len(selected)} files are stale")
+        return 1 if stale else 0
+
+    if not stale:
+        print(f"✅ All {len(selected)} files are up to date")
+        return 0
+
+    pending = [job for job, _ in stale]
+    # ไฟล์ที่อยู่บนสายที่ยาวที่สุด (เวลาจาก log) ได้ slot ก่อน จึงไม่เหลือไฟล์ช้าไว้ท้ายรอบ
+    priorities = critical_path(pending, predicted_durations(pending, history))
+    edits = {}
+    if args.edit:
+        edits = {
+            job.filename: manifest.previous_prompt(job)
+            for job, reason in stale if reason == "prompt changed" and manifest.previous_prompt(job)
+        }
+    if args.batch:
+        print(f"Generating {len(pending)} of {len(selected)} files as a Message Batch...")
+    else:
+        print(f"Generating {len(pending)} of {len(selected)} files with {args.jobs} concurrent requests...")
+
+    started = time.monotonic()
+    done = []
+    unchanged = []
+    try:
+        runner = Runner(
+            max(1, args.jobs),
+            cache_from_args(args),
+            set(args.refresh),
+            args.stream,
+            args.max_retries,
+            log_from_args(args),
+            rate_limit_retries=args.rate_limit_retries,
+            max_continuations=args.max_continuations,
+            hedge_history=history if args.hedge else None,
+            priorities=priorities,
+            edits=edits,
+        )
+        if args.batch:
+            results = runner.run_batch(pending, args.poll_interval)
+        else:
+            results = run_graph(pending, runner.run, priorities)
+        failed = asyncio.run(run_jobs(results, done, unchanged))
+    finally:
+        # บันทึก manifest หลังจบรอบ เพื่อให้ hash ของ inputs เป็นค่าล่าสุด
+        for job in done:
+            manifest.record(job)
+        manifest.save()
+    elapsed = time.monotonic() - started
+    changes = f"{len(done) - len(unchanged)} changed, {len(unchanged)} unchanged"
+
+    if failed:
+        print(f"\n⚠️ {len(pending) - len(failed)}/{len(pending)} files generated in {elapsed:.1f}s ({changes}), {len(failed)} failed")
+        return 1
+
+    print(f"\n🎉 All {len(pending)} files generated in {elapsed:.1f}s ({changes})!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+import copy
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+
+from build_manifest import file_sha256
+from project_context import apply_context, system_blocks
+
+DEFAULT_MODEL = "claude-3-opus-20240229"
+FAST_MODEL = "claude-3-5-haiku-20241022"
+# ไฟล์ที่ model เร็วเขียนไม่ผ่านการตรวจ จะถูกขอใหม่ด้วย model ถัดไป
+ESCALATION = {FAST_MODEL: DEFAULT_MODEL}
+
+# ไฟล์เล็กหรือ boilerplate ที่ไม่มี logic ของโปรเจกต์ ไม่ต้องรอ model ใหญ่
+FAST_MAX_TOKENS = 1500
+BOILERPLATE = (".gitignore", "index.html", "*.css", "src/main.tsx")
+
+
+@dataclass
+class Job:
+    group: str
+    filename: str
+    prompt: str
+    max_tokens: int
+    model: str = DEFAULT_MODEL
+    inputs: list = field(default_factory=list)
+    system: str = ""
+    context: list = field(default_factory=list)
+    sections: list = field(default_factory=list)
+
+
+def route_model(target):
+    if target.model:
+        return target.model
+    if target.max_tokens <= FAST_MAX_TOKENS or any(fnmatch(target.path, pattern) for pattern in BOILERPLATE):
+        return FAST_MODEL
+    return DEFAULT_MODEL
+
+
+def make_jobs(targets):
+    return [
+        apply_context(Job(target.group, target.path, target.prompt, target.max_tokens, route_model(target), list(target.inputs),
+                          sections=list(target.sections)))
+        for target in targets
+    ]
+
+
+def request_params(job):
+    params = {
+        "model": job.model,
+        "max_tokens": job.max_tokens,
+        "messages": [{"role": "user", "content": job.prompt}],
+    }
+    system = system_blocks(job)
+    if system is not None:
+        params["system"] = system
+    return params
+
+
+def section_params(params, job, section, shared=()):
+    parts = ", ".join(f'"{part.name}"' for part in job.sections)
+    prompt = f"{job.prompt}\n\nThis file is generated in parts that are joined in this order: {parts}.\n"
+    prompt += f'Write ONLY the part "{section.name}": {section.prompt}.\n'
+    prompt += "Start the part with the import statements it uses; imports repeated across parts are merged when the parts are joined."
+    if shared:
+        code = "\n\n".join(shared)
+        prompt += f"\n\nThe file starts with this shared code, which is already written. Use it and do not repeat it:\n<shared>\n{code}\n</shared>"
+    prompt += "\n\nReturn ONLY the code of this part, no explanation."
+
+    section_request = dict(params, messages=[{"role": "user", "content": prompt}])
+    if section.max_tokens:
+        section_request["max_tokens"] = section.max_tokens
+    return section_request
+
+
+def continuation_params(params, partial):
+    # ส่งข้อความที่ได้มาแล้วเป็น assistant prefill ให้ model เขียนต่อจากจุดที่ถูกตัด
+    # API ไม่รับ prefill ที่ลงท้ายด้วย whitespace จึงต้องตัดออก
+    continued = dict(params)
+    continued["messages"] = params["messages"] + [{"role": "assistant", "content": partial.rstrip()}]
+    return continued
+
+
+def stitch_text(pieces):
+    text = ""
+    for piece in pieces:
+        text = text.rstrip() + piece if text else piece
+    return text
+
+
+def merge_messages(messages, text):
+    # message เดียวแทนหลาย message: ข้อความที่ต่อแล้วกับ usage รวมของทุกตัว ใช้ตอนตรวจ retry และเก็บใน response cache
+    last = messages[-1]
+    usage = last.usage.model_copy(update={
+        "input_tokens": sum(message.usage.input_tokens for message in messages),
+        "output_tokens": sum(message.usage.output_tokens for message in messages),
+    })
+    return last.model_copy(update={"content": [last.content[0].model_copy(update={"text": text})], "usage": usage})
+
+
+def stitch_messages(messages):
+    if len(messages) == 1:
+        return messages[0]
+    return merge_messages(messages, stitch_text(message.content[0].text for message in messages))
+
+
+IMPORT = re.compile(r"^import\s+(?:(type)\s+)?(?:([^'\";]+?)\s+from\s+)?(['\"])([^'\"\n]+)\3;?[ \t]*$", re.MULTILINE | re.DOTALL)
+# ช่องว่างและ comment ที่อยู่ระหว่าง import ตอนต้นของแต่ละส่วน
+LEADING = re.compile(r"\s+|//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def leading_imports(part):
+    # แยก import ตอนต้นของส่วนออกจากเนื้อหา หยุดที่ statement แรกที่ไม่ใช่ import
+    # บรรทัดที่หน้าตาเหมือน import ใน template literal หรือ string หลายบรรทัดจึงไม่ถูกย้าย
+    imports = []
+    comments = []
+    position = 0
+    while True:
+        skipped = LEADING.match(part, position)
+        if skipped:
+            if skipped.group().strip():
+                comments.append(skipped.group())
+            position = skipped.end()
+            continue
+        match = IMPORT.match(part, position)
+        if match is None:
+            break
+        imports.append(match)
+        position = match.end()
+    return imports, "\n".join(comments + [part[position:]]).strip()
+
+
+def parse_import_clause(clause):
+    # คืน (default, namespace, named specifiers)
+    default, namespace, named = None, None, []
+    clause = clause.strip()
+    braces = re.search(r"\{(.*)\}", clause, re.DOTALL)
+    if braces:
+        named = [name.strip() for name in braces.group(1).split(",") if name.strip()]
+        clause = (clause[:braces.start()] + clause[braces.end():]).strip().strip(",").strip()
+    if clause.startswith("* as "):
+        namespace = clause[5:].strip()
+    elif clause:
+        default = clause.split(",")[0].strip()
+        rest = clause.split(",", 1)[1].strip() if "," in clause else ""
+        if rest.startswith("* as "):
+            namespace = rest[5:].strip()
+    return default, namespace, named
+
+
+def import_statements(module, kind, defaults, namespaces, named):
+    # import * as ต่อกับ { ... } ใน statement เดียวไม่ได้ จึงแยก namespace ไว้ statement ของตัวเอง
+    # ถ้าแต่ละส่วนตั้งชื่อ default ต่างกัน ชื่อที่เกินมาได้ statement ของตัวเอง ทุกชื่อจึงยังใช้ได้
+    prefix = f"import {'type ' if kind else ''}"
+    default = defaults[0] if defaults else None
+    statements = []
+    if named:
+        statements.append(f"{prefix}{default + ', ' if default else ''}{{ {', '.join(named)} }} from '{module}';")
+    elif default and not namespaces:
+        statements.append(f"{prefix}{default} from '{module}';")
+    for index, namespace in enumerate(namespaces):
+        # default ที่ยังไม่ได้ใส่ ต่อกับ namespace ได้ (import a, * as b from 'm')
+        head = f"{default}, " if default and not named and index == 0 else ""
+        statements.append(f"{prefix}{head}* as {namespace} from '{module}';")
+    statements += [f"{prefix}{name} from '{module}';" for name in defaults[1:]]
+    return statements
+
+
+def stitch_sections(parts):
+    # ย้าย import ตอนต้นของทุกส่วนขึ้นหัวไฟล์ รวม import จาก module เดียวกัน แล้วต่อเนื้อหาตามลำดับใน manifest
+    imports = {}
+    side_effects = []
+    bodies = []
+    for part in parts:
+        matches, body = leading_imports(part)
+        for match in matches:
+            kind, clause, _, module = match.groups()
+            if clause is None:
+                if module not in side_effects:
+                    side_effects.append(module)
+                continue
+            default, namespace, named = parse_import_clause(clause)
+            merged = imports.setdefault((module, kind), [[], [], []])
+            if default and default not in merged[0]:
+                merged[0].append(default)
+            if namespace and namespace not in merged[1]:
+                merged[1].append(namespace)
+            merged[2] += [name for name in named if name not in merged[2]]
+        if body:
+            bodies.append(body)
+
+    header = [f"import '{module}';" for module in side_effects]
+    for (module, kind), names in imports.items():
+        header += import_statements(module, kind, *names)
+    return "\n\n".join((["\n".join(header)] if header else []) + bodies)
+
+
+class FenceStripper:
+    # ตัด markdown code fence ทีละ chunk: ข้ามคำเกริ่นก่อน ```lang และทิ้งทุกอย่างหลัง fence ปิดตัวสุดท้าย
+    def __init__(self):
+        self.state = "start"
+        self.partial = ""
+        self.preamble = []
+        self.fence = None
+        self.tail = []
+        self.blank = []
+        self.started = False
+
+    def feed(self, text):
+        out = []
+        lines = (self.partial + text).split('\n')
+        self.partial = lines.pop()
+        for line in lines:
+            self._line(line, out)
+        return "".join(out)
+
+    def finish(self):
+        out = []
+        if self.partial:
+            self._line(self.partial, out)
+            self.partial = ""
+
+        if self.state == "preamble":
+            # ไม่เจอ fence เลย แปลว่าบรรทัดแรกไม่ใช่คำเกริ่น
+            for line in self.preamble:
+                self._emit(line, out)
+        self.preamble = []
+        self.fence = None
+        self.tail = []
+        self.blank = []
+        return "".join(out)
+
+    def _line(self, line, out):
+        is_fence = line.strip().startswith('```')
+
+        if self.state == "start":
+            if not line.strip():
+                return
+            if is_fence:
+                self.state = "body"
+            elif line.rstrip().endswith(':'):
+                self.state = "preamble"
+                self.preamble.append(line)
+            else:
+                self.state = "plain"
+                self._emit(line, out)
+        elif self.state == "preamble":
+            if is_fence:
+                self.state = "body"
+                self.preamble = []
+            else:
+                self.preamble.append(line)
+        elif self.state == "body":
+            if is_fence:
+                # fence ก่อนหน้าเป็น fence ซ้อนด้านใน ไม่ใช่ fence ปิด
+                if self.fence is not None:
+                    for held in [self.fence] + self.tail:
+                        self._emit(held, out)
+                self.fence = line
+                self.tail = []
+            elif self.fence is not None:
+                self.tail.append(line)
+            else:
+                self._emit(line, out)
+        else:
+            self._emit(line, out)
+
+    def _emit(self, line, out):
+        if not line.strip():
+            if self.started:
+                self.blank.append(line)
+            return
+        for held in self.blank:
+            out.append('\n' + held)
+        self.blank = []
+        out.append(('\n' if self.started else '') + line)
+        self.started = True
+
+
+def strip_code_fences(text):
+    stripper = FenceStripper()
+    return stripper.feed(text) + stripper.finish()
+
+
+class StreamingOutput:
+    def __init__(self, filename):
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.filename = filename
+        # ชื่อไม่ซ้ำกัน เพราะ hedge request อาจ stream ไฟล์เดียวกันพร้อมกันสองตัว
+        fd, self.tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(filename)}.", suffix=".tmp", dir=directory or ".")
+        os.fchmod(fd, FILE_MODE)
+        self.file = os.fdopen(fd, 'w', encoding='utf-8')
+        self.stripper = FenceStripper()
+        self.held = ""
+        self.lines = 0
+
+    def write(self, text):
+        # whitespace ท้ายสุดยังไม่เขียน เพราะถ้าต้องเขียนต่อ (continuation) ส่วนนี้จะถูกตัดทิ้งตาม stitch_text
+        text = self.held + text
+        content = text.rstrip()
+        self.held = text[len(content):]
+        self._feed(content)
+
+    def _feed(self, text):
+        content = self.stripper.feed(text)
+        if content:
+            self.file.write(content)
+            self.file.flush()
+            self.lines += content.count('\n')
+
+    def resume(self):
+        self.held = ""
+
+    def checkpoint(self):
+        self.file.flush()
+        return self.file.tell(), copy.deepcopy(self.stripper), self.held, self.lines
+
+    def rollback(self, checkpoint):
+        # ทิ้งข้อความของ stream ที่ขาดกลางทางก่อนส่ง request นั้นใหม่
+        position, stripper, held, lines = checkpoint
+        self.file.seek(position)
+        self.file.truncate()
+        self.stripper = copy.deepcopy(stripper)
+        self.held = held
+        self.lines = lines
+
+    def close(self):
+        self._feed(self.held)
+        self.held = ""
+        content = self.stripper.finish()
+        self.file.write(content)
+        self.file.close()
+        self.lines += content.count('\n') + (1 if self.stripper.started else 0)
+
+    def commit(self):
+        if not self.file.closed:
+            self.close()
+        if same_content(self.filename, self.tmp_path):
+            os.remove(self.tmp_path)
+            return False
+        os.replace(self.tmp_path, self.filename)
+        return True
+
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+def same_content(filename, new_path):
+    # เทียบขนาดก่อน ถ้าเท่ากันค่อยเทียบ hash
+    try:
+        if os.path.getsize(filename) != os.path.getsize(new_path):
+            return False
+    except OSError:
+        return False
+    return file_sha256(filename) == file_sha256(new_path)
+
+
+def _file_mode():
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+FILE_MODE = _file_mode()
+
+
+def write_output(filename, content):
+    # ไม่เขียนทับไฟล์ที่เนื้อหาเหมือนเดิม mtime จึงไม่เปลี่ยนและ Vite/tsc ไม่ต้อง rebuild
+    data = content.encode('utf-8')
+    try:
+        if os.path.getsize(filename) == len(data) and file_sha256(filename) == hashlib.sha256(data).hexdigest():
+            return False
+    except OSError:
+        pass
+
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(filename)}.", suffix=".tmp", dir=directory or ".")
+    try:
+        # mkstemp สร้างไฟล์เป็น 0600 ให้สิทธิ์เหมือนไฟล์ที่ open() สร้างตามปกติ
+        os.fchmod(fd, FILE_MODE)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        # เขียนหรือ replace ไม่สำเร็จ ไม่ทิ้งไฟล์ .tmp ค้างไว้ข้างไฟล์จริง
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def create_async_client():
+    from anthropic import AsyncAnthropic
+
+    # retry ของ SDK ถูกปิดไว้ เพราะ Runner จัดการ backoff และลด concurrency เอง
+    return AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"), max_retries=0)
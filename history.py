@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import math
+from collections import defaultdict
+
+from telemetry import DEFAULT_LOG_PATH, read_log
+
+# ต่ำกว่านี้ถือว่าข้อมูลของไฟล์นั้นยังไม่พอ ใช้ค่าของทุกไฟล์รวมกันแทน
+MIN_SAMPLES = 3
+
+
+def percentile(values, fraction):
+    # nearest-rank ไม่ต้อง interpolate เพราะตัวอย่างมีไม่กี่ค่า
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def mean_run(runs):
+    # (วินาที, output token) เฉลี่ยต่อรอบ
+    return sum(latency for latency, _ in runs) / len(runs), sum(tokens for _, tokens in runs) / len(runs)
+
+
+class History:
+    def __init__(self, records=()):
+        self.latencies = defaultdict(list)
+        # เวลาและ output token รวมของแต่ละไฟล์ต่อรอบ นับ retry และ continuation ด้วย
+        self.runs = defaultdict(lambda: defaultdict(lambda: [0.0, 0]))
+        # แบบเดียวกันแต่แยกตามส่วน สำหรับไฟล์ที่สร้างเป็นหลายส่วนพร้อมกัน
+        self.section_runs = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: [0.0, 0])))
+        hedges = defaultdict(lambda: [0.0, 0])
+        for record in records:
+            # ไม่รวม batch เพราะ latency ของ batch คือเวลารอคิว
+            if record.get("error") or record.get("mode") not in ("messages", "stream"):
+                continue
+            if record.get("latency_s") is None:
+                continue
+            # request ซ้ำของ hedge ทำงานพร้อมกับ request หลัก ถ้านับรวมกันเวลาของไฟล์จะเกินจริง
+            if record.get("hedge"):
+                totals = hedges[record["output"], record.get("run")]
+            else:
+                totals = self.runs[record["output"]][record.get("run")]
+            totals[0] += record["latency_s"]
+            totals[1] += record.get("output_tokens", 0)
+            if record.get("section"):
+                totals = self.section_runs[record["output"]][record["section"]][record.get("run")]
+                totals[0] += record["latency_s"]
+                totals[1] += record.get("output_tokens", 0)
+            # hedge ใช้เฉพาะ request แรกของไฟล์ ส่วนย่อยของไฟล์หลายส่วนสั้นกว่าทั้งไฟล์จึงไม่นับ
+            if not record.get("retry") and not record.get("continuation") and not record.get("section"):
+                self.latencies[record["output"]].append(record["latency_s"])
+        for (output, run), totals in hedges.items():
+            # hedge ชนะแล้ว request หลักถูกยกเลิกก่อนได้ผล จึงไม่มี record ของรอบนั้น ใช้ของ hedge แทน
+            if run not in self.runs[output]:
+                self.runs[output][run] = totals
+
+    @classmethod
+    def from_log(cls, path=DEFAULT_LOG_PATH):
+        return cls(read_log(path))
+
+    def samples(self, filename):
+        own = self.latencies.get(filename, [])
+        if len(own) >= MIN_SAMPLES:
+            return own
+        return [latency for latencies in self.latencies.values() for latency in latencies]
+
+    def latency_percentile(self, filename, fraction):
+        samples = self.samples(filename)
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return percentile(samples, fraction)
+
+    def file_estimate(self, filename):
+        # (วินาที, output token) เฉลี่ยต่อรอบ หรือ None ถ้ายังไม่เคยสร้างไฟล์นี้
+        runs = list(self.runs.get(filename, {}).values())
+        if not runs:
+            return None
+        return mean_run(runs)
+
+    def section_estimates(self, filename):
+        # {ชื่อส่วน: (วินาที, output token)} เฉลี่ยต่อรอบ ของส่วนที่เคยสร้างแล้ว
+        return {name: mean_run(list(runs.values())) for name, runs in self.section_runs.get(filename, {}).items()}
+
+    def tokens_per_second(self):
+        runs = [totals for files in self.runs.values() for totals in files.values()]
+        latency = sum(latency for latency, _ in runs)
+        tokens = sum(tokens for _, tokens in runs)
+        return tokens / latency if latency > 0 and tokens else None
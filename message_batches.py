@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import asyncio
+import time
+
+DEFAULT_POLL_INTERVAL = 15.0
+
+
+class BatchError(Exception):
+    pass
+
+
+def batch_requests(jobs):
+    # jobs เป็นคู่ (job, params) และ custom_id ใช้ได้แค่ [a-zA-Z0-9_-] จึงใช้ลำดับงานแทน path ของไฟล์
+    requests = []
+    by_id = {}
+    for index, (job, params) in enumerate(jobs):
+        custom_id = f"file-{index:04d}"
+        by_id[custom_id] = (job, params)
+        requests.append({"custom_id": custom_id, "params": params})
+    return requests, by_id
+
+
+async def run_batch(client, jobs, poll_interval=DEFAULT_POLL_INTERVAL):
+    requests, by_id = batch_requests(jobs)
+    batch = await client.messages.batches.create(requests=requests)
+    print(f"📦 Submitted batch {batch.id} with {len(requests)} requests")
+
+    started = time.monotonic()
+    while batch.processing_status != "ended":
+        await asyncio.sleep(poll_interval)
+        batch = await client.messages.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        print(f"⏳ {batch.id}: {counts.succeeded + counts.errored} done, {counts.processing} processing ({time.monotonic() - started:.0f}s)")
+
+    seen = set()
+    async for entry in await client.messages.batches.results(batch.id):
+        if entry.custom_id not in by_id:
+            continue
+        job, params = by_id[entry.custom_id]
+        seen.add(entry.custom_id)
+
+        if entry.result.type == "succeeded":
+            yield job, params, entry.result.message, None
+        else:
+            detail = getattr(entry.result, "error", None)
+            yield job, params, None, BatchError(f"batch request {entry.result.type}" + (f": {detail}" if detail else ""))
+
+    for custom_id, (job, params) in by_id.items():
+        if custom_id not in seen:
+            yield job, params, None, BatchError("missing from batch results")
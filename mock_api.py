@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# Messages API จำลองสำหรับทดสอบ pipeline แบบ offline
+#   python3 mock_api.py --port 8765
+#   ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=mock python3 generate_all.py --batch
+# จำลอง rate limit: --max-concurrent 3 ตอบ 429 เมื่อมี request ค้างเกิน 3, --error-rate 0.1 สุ่มตอบ 529
+# จำลองความเร็ว: --latency 0.5 --latency-sigma 0.4 (lognormal) --tokens-per-second 80 --output-lines 200
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def canned_text(prompt, output_lines=0):
+    title = prompt.strip().splitlines()[0] if prompt.strip() else "empty prompt"
+    digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+    if ".json" in title:
+        return json.dumps({"mock": title, "promptSha256": digest}, indent=2)
+    filler = "".join(f"// line {number}: placeholder body so the response has a realistic size\n" for number in range(output_lines))
+    return f"```\n// mock output for: {title}\n// prompt sha256: {digest}\n{filler}export {{}};\n```"
+
+
+def canned_patch(prompt):
+    # คำขอของ --edit: ตอบเป็น search/replace block ที่เพิ่ม comment ใต้บรรทัดแรกของไฟล์
+    content = prompt.rsplit("\n</file>", 1)[0].split("\">\n", 1)[-1]
+    first = next((line for line in content.splitlines() if line.strip()), None)
+    if first is None or content.count(first) != 1:
+        return "NO CHANGES"
+    title = prompt.split("<instructions>\n", 1)[-1].splitlines()[0]
+    return f"<<<<<<< SEARCH\n{first}\n=======\n{first}\n// edited for: {title}\n>>>>>>> REPLACE"
+
+
+def block_text(content):
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content)
+
+
+def count_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def request_text(params):
+    system = params.get("system") or ""
+    return block_text(system) + "".join(block_text(message["content"]) for message in params.get("messages", []))
+
+
+def make_message(params, output_lines=0, cache_usage=None):
+    # canned output มาจากข้อความของ user เท่านั้น assistant prefill ท้ายสุดคือส่วนที่เขียนไปแล้ว
+    messages = params.get("messages", [])
+    prefill = ""
+    if messages and messages[-1]["role"] == "assistant":
+        prefill = block_text(messages[-1]["content"])
+    prompt = "".join(block_text(message["content"]) for message in messages if message["role"] == "user")
+
+    text = canned_patch(prompt) if ">>>>>>> REPLACE" in prompt else canned_text(prompt, output_lines)
+    if prefill and text.startswith(prefill):
+        text = text[len(prefill):]
+
+    stop_reason = "end_turn"
+    max_tokens = params.get("max_tokens")
+    if max_tokens and count_tokens(text) > max_tokens:
+        text = text[:max_tokens * 4]
+        stop_reason = "max_tokens"
+
+    usage = {"input_tokens": count_tokens(prompt + prefill), "output_tokens": count_tokens(text)}
+    usage.update(cache_usage or {})
+    return {
+        "id": f"msg_mock_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model", "mock"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": usage,
+    }
+
+
+def stream_events(message, chunks):
+    # ลำดับ event เดียวกับ Messages API: message_start, content_block_*, message_delta, message_stop
+    start = dict(message, content=[], stop_reason=None, usage=dict(message["usage"], output_tokens=1))
+    yield "message_start", {"type": "message_start", "message": start}
+    yield "content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}
+    for chunk in chunks:
+        yield "content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}}
+    yield "content_block_stop", {"type": "content_block_stop", "index": 0}
+    yield "message_delta", {
+        "type": "message_delta",
+        "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+        "usage": {"output_tokens": message["usage"]["output_tokens"]},
+    }
+    yield "message_stop", {"type": "message_stop"}
+
+
+def text_chunks(text, lines_per_chunk=4):
+    lines = text.splitlines(keepends=True)
+    return ["".join(lines[i:i + lines_per_chunk]) for i in range(0, len(lines), lines_per_chunk)]
+
+
+def iso(timestamp):
+    if timestamp is None:
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+class MockState:
+    def __init__(self, batch_delay, latency=0.0, max_concurrent=None, error_rate=0.0, retry_after=1.0,
+                 latency_sigma=0.0, tokens_per_second=0.0, output_lines=0, seed=None):
+        self.batch_delay = batch_delay
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.output_lines = output_lines
+        self.max_concurrent = max_concurrent
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.batches = {}
+        self.cached_prefixes = set()
+        self.in_flight = 0
+        self.calls = {"http": 0, "messages": 0, "streams": 0, "batches": 0, "rate_limited": 0, "overloaded": 0}
+
+    def first_token_delay(self):
+        # lognormal รอบค่า --latency ให้มีหางยาวแบบ API จริง
+        with self.lock:
+            if self.latency_sigma <= 0:
+                return self.latency
+            return self.latency * self.random.lognormvariate(0, self.latency_sigma)
+
+    def generation_time(self, tokens):
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def cache_usage(self, params):
+        # จำลอง prompt caching: system ถึง block ที่มี cache_control ครั้งแรกเขียน cache ครั้งต่อไปอ่าน
+        system = params.get("system")
+        if not isinstance(system, list):
+            return {}
+        marked = [i for i, block in enumerate(system) if block.get("cache_control")]
+        if not marked:
+            return {}
+        prefix = json.dumps(system[:marked[-1] + 1], sort_keys=True)
+        tokens = count_tokens(prefix)
+        key = hashlib.sha256(prefix.encode('utf-8')).hexdigest()
+        with self.lock:
+            hit = key in self.cached_prefixes
+            self.cached_prefixes.add(key)
+        if hit:
+            return {"cache_creation_input_tokens": 0, "cache_read_input_tokens": tokens}
+        return {"cache_creation_input_tokens": tokens, "cache_read_input_tokens": 0}
+
+    def message(self, params):
+        return make_message(params, self.output_lines, self.cache_usage(params))
+
+    def admit(self):
+        # คืนชนิด error ที่จะตอบกลับ หรือ None ถ้ารับ request นี้
+        with self.lock:
+            self.calls["messages"] += 1
+            if self.max_concurrent is not None and self.in_flight >= self.max_concurrent:
+                self.calls["rate_limited"] += 1
+                return "rate_limit_error"
+            if self.random.random() < self.error_rate:
+                self.calls["overloaded"] += 1
+                return "overloaded_error"
+            self.in_flight += 1
+            return None
+
+    def finish(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def rate_limit_headers(self):
+        if self.max_concurrent is None:
+            return {}
+        reset = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + self.retry_after))
+        return {
+            "anthropic-ratelimit-requests-limit": str(self.max_concurrent),
+            "anthropic-ratelimit-requests-remaining": str(max(0, self.max_concurrent - self.in_flight)),
+            "anthropic-ratelimit-requests-reset": reset,
+        }
+
+    def create_batch(self, requests):
+        batch_id = f"msgbatch_mock_{uuid.uuid4().hex[:20]}"
+        results = [
+            {"custom_id": request["custom_id"], "result": {"type": "succeeded", "message": self.message(request["params"])}}
+            for request in requests
+        ]
+        with self.lock:
+            self.calls["batches"] += 1
+            self.batches[batch_id] = {"created_at": time.time(), "results": results}
+        return batch_id
+
+    def batch_object(self, batch_id, base_url):
+        batch = self.batches[batch_id]
+        ended = time.time() - batch["created_at"] >= self.batch_delay
+        count = len(batch["results"])
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": iso(batch["created_at"]),
+            "expires_at": iso(batch["created_at"] + 24 * 3600),
+            "ended_at": iso(batch["created_at"] + self.batch_delay) if ended else None,
+            "cancel_initiated_at": None,
+            "archived_at": None,
+            "results_url": f"{base_url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, content_type="application/json", headers=None):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("request-id", f"req_mock_{uuid.uuid4().hex[:16]}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(self, status, error_type, message, headers=None):
+        self.send_json(status, {"type": "error", "error": {"type": error_type, "message": message}}, headers=headers)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def count_request(self):
+        with self.state.lock:
+            self.state.calls["http"] += 1
+
+    def do_POST(self):
+        self.count_request()
+        path = self.path.split("?")[0].rstrip("/")
+        body = self.read_json()
+
+        if path == "/v1/messages":
+            self.create_message(body)
+        elif path == "/v1/messages/count_tokens":
+            self.send_json(200, {"input_tokens": count_tokens(request_text(body))})
+        elif path == "/v1/messages/batches":
+            batch_id = self.state.create_batch(body.get("requests", []))
+            self.send_json(200, self.state.batch_object(batch_id, self.base_url))
+        else:
+            self.send_error_json(404, "not_found_error", f"unknown path {path}")
+
+    def create_message(self, body):
+        error = self.state.admit()
+        if error == "rate_limit_error":
+            headers = {"retry-after": f"{self.state.retry_after:g}", **self.state.rate_limit_headers()}
+            self.send_error_json(429, error, "Number of concurrent requests exceeds your rate limit.", headers)
+            return
+        if error == "overloaded_error":
+            self.send_error_json(529, error, "Overloaded")
+            return
+
+        try:
+            message = self.state.message(body)
+            time.sleep(self.state.first_token_delay())
+            if body.get("stream"):
+                self.send_stream(message)
+                return
+            time.sleep(self.state.generation_time(message["usage"]["output_tokens"]))
+        finally:
+            self.state.finish()
+        self.send_json(200, message, headers=self.state.rate_limit_headers())
+
+    def send_stream(self, message):
+        with self.state.lock:
+            self.state.calls["streams"] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.send_header("request-id", f"req_mock_{uuid.uuid4().hex[:16]}")
+        for name, value in self.state.rate_limit_headers().items():
+            self.send_header(name, value)
+        self.end_headers()
+        # ไม่มี Content-Length จึงปิด connection เพื่อบอกว่า stream จบแล้ว
+        self.close_connection = True
+
+        for event, data in stream_events(message, text_chunks(message["content"][0]["text"])):
+            if event == "content_block_delta":
+                time.sleep(self.state.generation_time(count_tokens(data["delta"]["text"])))
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+    def do_GET(self):
+        self.count_request()
+        parts = self.path.split("?")[0].strip("/").split("/")
+
+        if parts[:3] != ["v1", "messages", "batches"] or len(parts) < 4:
+            self.send_error_json(404, "not_found_error", f"unknown path {self.path}")
+            return
+
+        batch_id = parts[3]
+        if batch_id not in self.state.batches:
+            self.send_error_json(404, "not_found_error", f"batch {batch_id} not found")
+            return
+
+        batch = self.state.batch_object(batch_id, self.base_url)
+        if len(parts) == 4:
+            self.send_json(200, batch)
+        elif parts[4:] == ["results"] and batch["processing_status"] == "ended":
+            lines = "".join(json.dumps(result) + "\n" for result in self.state.batches[batch_id]["results"])
+            self.send_json(200, lines.encode('utf-8'), "application/binary")
+        else:
+            self.send_error_json(404, "not_found_error", f"no results for batch {batch_id} yet")
+
+
+def start_server(port=0, batch_delay=1.0, **options):
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockAPIHandler)
+    server.state = MockState(batch_delay, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Anthropic Messages API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-delay", type=float, default=1.0, help="seconds before a submitted batch ends")
+    parser.add_argument("--latency", type=float, default=0.0, help="median seconds before the first token of each response")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="lognormal spread of --latency (0 = always exactly --latency)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="output token rate after the first token (0 = instant)")
+    parser.add_argument("--output-lines", type=int, default=0, help="filler lines added to every canned response")
+    parser.add_argument("--seed", type=int, help="seed for latency and error sampling")
+    parser.add_argument("--max-concurrent", type=int, help="answer 429 when more requests than this are in flight")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 529 overloaded")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds sent with 429 responses")
+    args = parser.parse_args(argv)
+
+    server = start_server(
+        args.port,
+        args.batch_delay,
+        latency=args.latency,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        output_lines=args.output_lines,
+        seed=args.seed,
+        max_concurrent=args.max_concurrent,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+    )
+    print(f"Mock Messages API listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# ประเมิน token ค่าใช้จ่าย และเวลาของรอบถัดไปก่อนเรียก API จริง
+#   python3 generate_all.py plan --jobs 8
+import asyncio
+import heapq
+
+from dependency_graph import critical_path, dependencies, topological_order
+from generation import request_params, section_params
+from telemetry import format_table
+
+# ราคา USD ต่อล้าน token (input, output) และความเร็ว output token/วินาทีโดยประมาณ
+MODEL_PRICES = {
+    "claude-3-opus-20240229": (15.0, 75.0),
+    "claude-3-5-sonnet-20241022": (3.0, 15.0),
+    "claude-3-5-haiku-20241022": (0.8, 4.0),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+}
+MODEL_SPEEDS = {
+    "claude-3-opus-20240229": 25.0,
+    "claude-3-5-sonnet-20241022": 60.0,
+    "claude-3-5-haiku-20241022": 65.0,
+    "claude-3-haiku-20240307": 120.0,
+}
+DEFAULT_SPEED = 30.0
+DEFAULT_FIRST_TOKEN_S = 2.0
+# ไฟล์ที่ไม่เคยสร้าง เดาว่าจะใช้ output ราวครึ่งหนึ่งของ max_tokens
+DEFAULT_OUTPUT_FRACTION = 0.5
+BATCH_DISCOUNT = 0.5
+HUGE_PROMPT_TOKENS = 30000
+
+
+def estimate_tokens(params):
+    # ประมาณแบบเดียวกับ tokenizer ภาษาอังกฤษ ~4 ตัวอักษรต่อ token ใช้ตอนไม่มี API key หรือสั่ง --offline
+    text = "".join(block["text"] for block in params.get("system") or [])
+    text += "".join(message["content"] for message in params["messages"])
+    return max(1, len(text) // 4)
+
+
+def job_requests(job):
+    # ไฟล์หลายส่วนส่ง prompt ของไฟล์ซ้ำไปกับทุกส่วน จึงนับทุก request ของส่วนแทน request ของทั้งไฟล์
+    params = request_params(job)
+    if not job.sections:
+        return [params]
+    return [section_params(params, job, section) for section in job.sections]
+
+
+async def count_input_tokens(client, jobs, max_jobs):
+    # count_tokens ไม่คิดเงิน แต่มี rate limit ของตัวเอง จึงจำกัดจำนวน request พร้อมกัน
+    semaphore = asyncio.Semaphore(max(1, max_jobs))
+
+    async def count(params):
+        params.pop("max_tokens")
+        async with semaphore:
+            result = await client.messages.count_tokens(**params)
+        return result.input_tokens
+
+    async def count_job(job):
+        return sum(await asyncio.gather(*(count(params) for params in job_requests(job))))
+
+    return await asyncio.gather(*(count_job(job) for job in jobs))
+
+
+def price(model, input_tokens, output_tokens):
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1_000_000
+
+
+def predict_new(job, output_tokens, history):
+    speed = history.tokens_per_second()
+    if speed is not None:
+        # ไฟล์ใหม่ ใช้ความเร็วเฉลี่ยจากไฟล์อื่นในรอบก่อน ๆ
+        return output_tokens / speed, output_tokens, "history rate"
+    return DEFAULT_FIRST_TOKEN_S + output_tokens / MODEL_SPEEDS.get(job.model, DEFAULT_SPEED), output_tokens, "default"
+
+
+def predict_sections(job, history):
+    # {ชื่อส่วน: (วินาที, output token, ที่มาของค่า)}
+    previous = history.section_estimates(job.filename)
+    predictions = {}
+    for section in job.sections:
+        if section.name in previous:
+            predictions[section.name] = (*previous[section.name], "history")
+        elif section.max_tokens:
+            predictions[section.name] = predict_new(job, section.max_tokens * DEFAULT_OUTPUT_FRACTION, history)
+        else:
+            # ส่วนที่ไม่ได้กำหนด max_tokens เดาว่าได้ output เท่า ๆ กันทุกส่วน
+            predictions[section.name] = predict_new(job, job.max_tokens * DEFAULT_OUTPUT_FRACTION / len(job.sections), history)
+    return predictions
+
+
+def predict(job, history):
+    # คืน (วินาที, output token, ที่มาของค่า)
+    if job.sections:
+        # ส่วน shared สร้างทีละส่วนก่อน ส่วนที่เหลือส่งพร้อมกัน เวลาจึงเท่ากับส่วน shared รวมกับส่วนที่ช้าที่สุด
+        # การต่อส่วนและตรวจไฟล์ทำในเครื่อง ใช้เวลาไม่กี่ ms จึงไม่นับ เหมือนไฟล์ที่สร้างทีเดียว
+        sections = predict_sections(job, history)
+        shared = sum(sections[section.name][0] for section in job.sections if section.shared)
+        rest = max((sections[section.name][0] for section in job.sections if not section.shared), default=0.0)
+        sources = {source for _, _, source in sections.values()}
+        source = sources.pop() if len(sources) == 1 else "mixed"
+        return shared + rest, sum(tokens for _, tokens, _ in sections.values()), source
+
+    previous = history.file_estimate(job.filename)
+    if previous is not None:
+        return (*previous, "history")
+    return predict_new(job, job.max_tokens * DEFAULT_OUTPUT_FRACTION, history)
+
+
+def shared_code_tokens(job, history):
+    # ทุกส่วนที่ไม่ใช่ shared ได้โค้ดของส่วน shared ไปใน prompt ด้วย ซึ่งยังไม่มีตอนวางแผน จึงใช้ output ที่คาดไว้
+    shared = [section for section in job.sections if section.shared]
+    if not shared:
+        return 0
+    sections = predict_sections(job, history)
+    return (len(job.sections) - len(shared)) * sum(sections[section.name][1] for section in shared)
+
+
+def predicted_durations(jobs, history):
+    return {job.filename: predict(job, history)[0] for job in jobs}
+
+
+class Estimate:
+    def __init__(self, job, input_tokens, history):
+        self.job = job
+        self.input_tokens = round(input_tokens + shared_code_tokens(job, history))
+        self.latency, self.output_tokens, self.source = predict(job, history)
+        self.cost = price(job.model, self.input_tokens, self.output_tokens)
+
+
+def makespan(jobs, durations, max_jobs):
+    # จำลอง run_graph: เริ่มไฟล์ที่ dependency เสร็จแล้วเมื่อมี slot ว่าง สายที่ยาวที่สุดก่อน
+    priorities = critical_path(jobs, durations)
+    ordered = sorted(topological_order(jobs), key=lambda job: -priorities[job.filename])
+    graph = dependencies(ordered)
+    waiting = {filename: len(deps) for filename, deps in graph.items()}
+    dependents = {job.filename: [] for job in ordered}
+    for filename, deps in graph.items():
+        for dependency in deps:
+            dependents[dependency].append(filename)
+
+    order = {job.filename: index for index, job in enumerate(ordered)}
+    ready = [order[filename] for filename, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    running = []
+    now = 0.0
+    while ready or running:
+        while ready and (max_jobs is None or len(running) < max_jobs):
+            filename = ordered[heapq.heappop(ready)].filename
+            heapq.heappush(running, (now + durations[filename], filename))
+        now, filename = heapq.heappop(running)
+        for dependent in dependents[filename]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                heapq.heappush(ready, order[dependent])
+    return now
+
+
+def dollars(value):
+    return "-" if value is None else f"${value:,.2f}"
+
+
+def format_plan(estimates, max_jobs, counted):
+    rows = []
+    for estimate in sorted(estimates, key=lambda estimate: -estimate.latency):
+        flag = " ⚠️" if estimate.input_tokens > HUGE_PROMPT_TOKENS else ""
+        rows.append([
+            estimate.job.filename, estimate.job.model, f"{estimate.input_tokens:,}{flag}", f"{estimate.output_tokens:,.0f}",
+            f"{estimate.latency:.1f}s", dollars(estimate.cost), estimate.source,
+        ])
+    lines = [format_table(["file", "model", "in tok", "out tok", "time", "cost", "estimate from"], rows), ""]
+
+    jobs = [estimate.job for estimate in estimates]
+    durations = {estimate.job.filename: estimate.latency for estimate in estimates}
+    input_tokens = sum(estimate.input_tokens for estimate in estimates)
+    output_tokens = sum(estimate.output_tokens for estimate in estimates)
+    costs = [estimate.cost for estimate in estimates]
+    cost = None if None in costs else sum(costs)
+
+    lines.append(
+        f"{len(estimates)} files, {input_tokens:,} input tokens ({'counted' if counted else 'estimated offline'}), "
+        f"~{output_tokens:,.0f} output tokens"
+    )
+    lines.append(f"cost: {dollars(cost)} direct, {dollars(None if cost is None else cost * BATCH_DISCOUNT)} with --batch "
+                 "(before prompt cache discounts)")
+    lines.append(
+        f"wall time: {makespan(jobs, durations, max_jobs):.0f}s with --jobs {max_jobs}, "
+        f"{makespan(jobs, durations, 1):.0f}s sequential, {makespan(jobs, durations, None):.0f}s critical path"
+    )
+
+    huge = [estimate for estimate in estimates if estimate.input_tokens > HUGE_PROMPT_TOKENS]
+    if huge:
+        lines.append(f"⚠️ {len(huge)} prompts are over {HUGE_PROMPT_TOKENS:,} input tokens: "
+                     + ", ".join(estimate.job.filename for estimate in huge))
+    return "\n".join(lines)
+
+
+def plan(jobs, history, max_jobs, offline=False):
+    counted = not offline
+    if counted:
+        from generation import create_async_client
+
+        try:
+            tokens = asyncio.run(count_input_tokens(create_async_client(), jobs, max_jobs))
+        except Exception as e:
+            print(f"⚠️ count_tokens failed ({type(e).__name__}: {e}), estimating input tokens offline")
+            counted = False
+    if not counted:
+        tokens = [sum(estimate_tokens(params) for params in job_requests(job)) for job in jobs]
+
+    estimates = [Estimate(job, count, history) for job, count in zip(jobs, tokens)]
+    return format_plan(estimates, max_jobs, counted)
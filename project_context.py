@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# ไฟล์ที่เป็นแหล่งอ้างอิงหลักของโปรเจกต์ ทุก prompt ใต้ server/ และ src/ จะเห็นเนื้อหาเดียวกัน
+CONTEXT_FILES = [
+    "server/db/schema.ts",
+    "server/db/index.ts",
+    "server/_core/trpc.ts",
+    "server/utils/gmv-calculations.ts",
+    "server/utils/csv-parser.ts",
+]
+
+PROJECT_OVERVIEW = """You are writing one file of the Shopee GMV Max Ads Tracker, a web app that tracks weekly Shopee GMV Max Ads performance.
+
+Every file in the project follows these conventions:
+- Frontend: React 19 + Vite + TypeScript, TailwindCSS, Recharts. Pages and components call the API through the tRPC React client exported as `trpc` from src/lib/trpc.ts.
+- Backend: Express + tRPC v10. Routers are built with `router`, `publicProcedure` and `protectedProcedure` from server/_core/trpc.ts, and procedure input is validated with zod.
+- Database: MySQL through Drizzle ORM (drizzle-orm/mysql2). Get the connection with `getDb()` from server/db/index.ts and import tables from server/db/schema.ts. Query with `db.select().from(table)`, `db.insert(table).values(...)`, `db.update(table).set(...)` and `db.delete(table)`. Never use Prisma-style calls such as `db.weeklyReport.create()`.
+- Tables: gmvMaxWeeklyReports, topPerformingProducts, aiRecommendations, calculationFormulas, importHistory, notionSyncLog.
+- Metric formulas live in server/utils/gmv-calculations.ts and CSV parsing/matching in server/utils/csv-parser.ts. Import those helpers instead of re-implementing them.
+- Reply with the requested file content only."""
+
+
+def uses_context(filename):
+    return filename.startswith(("server/", "src/"))
+
+
+def apply_context(job):
+    if not uses_context(job.filename):
+        return job
+
+    job.system = PROJECT_OVERVIEW
+    # ไฟล์อ้างอิงเองได้แค่ overview เพื่อไม่ให้เกิด dependency วน
+    if job.filename not in CONTEXT_FILES:
+        job.context = list(CONTEXT_FILES)
+        job.inputs += [path for path in CONTEXT_FILES if path not in job.inputs]
+    return job
+
+
+def read_context_file(path):
+    from generation import strip_code_fences
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            return strip_code_fences(f.read())
+    except OSError:
+        return None
+
+
+def context_block(paths):
+    sections = []
+    for path in paths:
+        content = read_context_file(path)
+        if content is not None:
+            sections.append(f'<file path="{path}">\n{content}\n</file>')
+
+    if not sections:
+        return None
+    return "Canonical project files. Use exactly these table names, exports and types:\n\n" + "\n\n".join(sections)
+
+
+def system_blocks(job):
+    if not job.system:
+        return None
+
+    blocks = [{"type": "text", "text": job.system}]
+    files = context_block(job.context) if job.context else None
+    if files is not None:
+        blocks.append({"type": "text", "text": files})
+
+    # breakpoint ท้าย system: ทุกไฟล์ในรอบเดียวกันใช้ prefix เดียวกัน จึงอ่านจาก prompt cache ได้
+    blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    return blocks
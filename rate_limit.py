@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from datetime import datetime
+
+DEFAULT_RATE_LIMIT_RETRIES = 8
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+RETRYABLE_STATUS = (408, 409, 429, 500, 502, 503, 504, 529)
+OVERLOAD_STATUS = (429, 529)
+ERROR_TYPE_STATUS = {"rate_limit_error": 429, "overloaded_error": 529, "api_error": 500}
+
+RATE_LIMIT_HEADERS = ("requests", "tokens", "input-tokens", "output-tokens")
+
+
+def error_status(error):
+    # error ที่มากลาง stream (SSE event "error") มี status 200 จึงต้องดูชนิดจาก body ด้วย
+    status = getattr(error, "status_code", None)
+    body = getattr(error, "body", None)
+    kind = body.get("error", {}).get("type") if isinstance(body, dict) and isinstance(body.get("error"), dict) else None
+    return ERROR_TYPE_STATUS.get(kind, status)
+
+
+def is_connection_error(error):
+    from anthropic import APIConnectionError
+    return isinstance(error, APIConnectionError)
+
+
+def error_headers(error):
+    response = getattr(error, "response", None)
+    return getattr(response, "headers", None) or {}
+
+
+def retry_after(headers):
+    value = headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def seconds_until(timestamp):
+    # header reset เป็น RFC 3339 เช่น 2024-01-01T00:00:30Z
+    try:
+        reset = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return max(0.0, reset.timestamp() - time.time())
+
+
+def backoff_delay(attempt, headers=None):
+    # full jitter: กระจายเวลา retry ของหลาย request ไม่ให้ยิงกลับพร้อมกัน
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    wait = retry_after(headers or {})
+    return max(delay, wait) if wait is not None else delay
+
+
+class AdaptiveLimiter:
+    # AIMD: เพิ่มทีละ 1 slot ต่อรอบที่สำเร็จครบ ลดครึ่งหนึ่งเมื่อโดน 429/529
+    def __init__(self, max_limit, min_limit=1, decrease=0.5):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = min(min_limit, self.max_limit)
+        self.decrease = decrease
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled = 0
+        # request ที่รอ slot เรียงตาม priority มากก่อน ถ้าเท่ากันมาก่อนได้ก่อน
+        self.waiting = []
+        self.sequence = itertools.count()
+        self.condition = asyncio.Condition()
+
+    @property
+    def window(self):
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self, priority=0):
+        async with self.condition:
+            entry = (-priority, next(self.sequence))
+            heapq.heappush(self.waiting, entry)
+            try:
+                while True:
+                    pause = self.paused_until - time.monotonic()
+                    if pause <= 0 and self.in_flight < self.window and self.waiting[0] == entry:
+                        break
+                    try:
+                        await asyncio.wait_for(self.condition.wait(), timeout=pause if pause > 0 else None)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self.waiting.remove(entry)
+                heapq.heapify(self.waiting)
+                # ตัวถัดไปในคิวอาจได้ slot ที่ยังว่างอยู่
+                self.condition.notify_all()
+            self.in_flight += 1
+            return time.monotonic()
+
+    async def release(self):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_success(self, headers):
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self.apply_headers(headers)
+
+    def on_overload(self, started, headers):
+        self.throttled += 1
+        wait = retry_after(headers)
+        if wait is not None:
+            self.pause(wait)
+
+        # request ที่เริ่มก่อนการลดครั้งล่าสุดถูกนับไปแล้ว ไม่ลดซ้ำ
+        if started < self.last_decrease:
+            return False
+        previous = self.window
+        self.limit = max(float(self.min_limit), self.limit * self.decrease)
+        self.last_decrease = time.monotonic()
+        return self.window != previous
+
+    def apply_headers(self, headers):
+        # โควตาใดหมดแล้วให้หยุดส่ง request ใหม่จนถึงเวลา reset ของโควตานั้น
+        for name in RATE_LIMIT_HEADERS:
+            remaining = headers.get(f"anthropic-ratelimit-{name}-remaining")
+            if remaining is None:
+                continue
+            try:
+                exhausted = int(remaining) <= 0
+            except ValueError:
+                continue
+            if exhausted:
+                wait = seconds_until(headers.get(f"anthropic-ratelimit-{name}-reset"))
+                if wait:
+                    self.pause(wait)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class RateLimitedCall:
+    def __init__(self, limiter, priority=0):
+        self.limiter = limiter
+        self.priority = priority
+        self.started = None
+
+    async def __aenter__(self):
+        self.started = await self.limiter.acquire(self.priority)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.limiter.release()
+        return False
+
+
+def retry_decision(limiter, error, started, attempt, max_attempts):
+    # คืนเวลารอก่อนส่งใหม่ หรือ None ถ้า error นี้ไม่ควร retry
+    status = error_status(error)
+    if status is None and not is_connection_error(error):
+        return None
+    if status is not None and status not in RETRYABLE_STATUS:
+        return None
+    if attempt >= max_attempts:
+        return None
+
+    headers = error_headers(error)
+    if status in OVERLOAD_STATUS:
+        previous = limiter.window
+        if limiter.on_overload(started, headers):
+            print(f"🐢 {'rate limited' if status == 429 else 'API overloaded'}, concurrency {previous} → {limiter.window}")
+    return backoff_delay(attempt, headers)
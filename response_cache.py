@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_CACHE_DIR = os.environ.get("GENERATION_CACHE_DIR", ".generation-cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(params):
+    # params คือ request ทั้งก้อน (model, max_tokens, system, messages)
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def response_to_dict(message):
+    if hasattr(message, "model_dump"):
+        return message.model_dump(mode="json")
+    return message
+
+
+def response_text(response):
+    return "".join(block.get("text", "") for block in response["content"] if block.get("type") == "text")
+
+
+class ResponseCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, params):
+        path = self._path(cache_key(params))
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # แตะ mtime เพื่อให้ eviction เป็นแบบ LRU
+        os.utime(path)
+        return entry
+
+    def put(self, params, message):
+        os.makedirs(self.directory, exist_ok=True)
+        key = cache_key(params)
+        entry = {
+            "key": key,
+            "model": params["model"],
+            "max_tokens": params["max_tokens"],
+            "created_at": time.time(),
+            "response": response_to_dict(message),
+        }
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self.evict()
+        return entry
+
+    def evict(self):
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        except OSError:
+            return 0
+
+        entries = []
+        total = 0
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def add_cache_arguments(parser):
+    parser.add_argument("--no-cache", action="store_true", help="ignore the response cache and call the API for every file")
+    parser.add_argument("--refresh", action="append", default=[], metavar="FILE", help="bypass the cache for FILE (repeatable)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"response cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help="evict least recently used responses above this size")
+
+
+def cache_from_args(args):
+    if args.no_cache:
+        return None
+    return ResponseCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+import asyncio
+import itertools
+import time
+
+from generation import (
+    ESCALATION,
+    StreamingOutput,
+    continuation_params,
+    create_async_client,
+    merge_messages,
+    request_params,
+    section_params,
+    stitch_messages,
+    stitch_sections,
+    stitch_text,
+    strip_code_fences,
+    write_output,
+)
+from edit_mode import PatchError, apply_patch, edit_params, parse_patch
+from message_batches import run_batch
+from rate_limit import DEFAULT_RATE_LIMIT_RETRIES, AdaptiveLimiter, RateLimitedCall, error_status, retry_decision
+from response_cache import response_text
+from validation import retry_params, validate_content, validate_file
+
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_MAX_CONTINUATIONS = 3
+HEDGE_PERCENTILE = 0.9
+# ถ้า call ช้าเกิน p90 แล้วแต่ยัง hedge ไม่ได้ (API กำลังกดกลับ) ตรวจใหม่ทุกเท่านี้วินาที
+HEDGE_RECHECK = 1.0
+
+
+class ValidationFailed(Exception):
+    pass
+
+
+class Truncated(Exception):
+    pass
+
+
+class CallClock:
+    # เวลาเริ่มของ API call ที่กำลังส่งอยู่ของ request หนึ่ง วัดหลังได้ slot แล้วเหมือน latency ใน log
+    # ช่วงรอ slot, backoff และ continuation ถัดไปจึงไม่ถูกนับรวมกับ call ก่อนหน้า
+    def __init__(self):
+        self.started = None
+        self.changed = asyncio.Event()
+
+    def start(self):
+        self.started = time.monotonic()
+        self.changed.set()
+
+    def stop(self):
+        self.started = None
+        self.changed.set()
+
+    def remaining(self, delay):
+        # วินาทีจนกว่า call ปัจจุบันจะเกิน delay หรือ None ถ้าตอนนี้ไม่มี call ที่กำลังส่ง
+        if self.started is None:
+            return None
+        return delay - (time.monotonic() - self.started)
+
+
+class Runner:
+    def __init__(self, max_jobs, cache=None, refresh=(), stream=False, max_retries=DEFAULT_MAX_RETRIES, telemetry=None,
+                 rate_limit_retries=DEFAULT_RATE_LIMIT_RETRIES, max_continuations=DEFAULT_MAX_CONTINUATIONS, hedge_history=None,
+                 priorities=None, edits=None):
+        self.client = None
+        self.limiter = AdaptiveLimiter(max_jobs)
+        self.rate_limit_retries = rate_limit_retries
+        self.max_continuations = max_continuations
+        self.hedge_history = hedge_history
+        self.priorities = priorities or {}
+        # path -> prompt ของรอบก่อน สำหรับไฟล์ที่ขอแก้แบบ patch ได้
+        self.edits = edits or {}
+        self.cache = cache
+        self.refresh = refresh
+        self.stream = stream
+        self.max_retries = max_retries
+        self.telemetry = telemetry
+        # จำนวน request ที่กำลังรอ backoff หลังโดน 429/529 หรือ error ชั่วคราว
+        self.backing_off = 0
+
+    def from_cache(self, job, params):
+        if self.cache is None or job.filename in self.refresh:
+            return None
+        entry = self.cache.get(params)
+        if entry is None:
+            return None
+
+        content = strip_code_fences(response_text(entry["response"]))
+        # response เก่าที่ไม่ผ่านการตรวจ ให้ขอใหม่แทนการเขียนไฟล์เสีย
+        if validate_content(job.filename, content):
+            return None
+        changed = write_output(job.filename, content)
+        if self.telemetry is not None:
+            self.telemetry.cache_hit(job)
+        return len(content.splitlines()), changed
+
+    def get_client(self):
+        # สร้าง client เฉพาะเมื่อมีไฟล์ที่ต้องเรียก API จริง
+        if self.client is None:
+            self.client = create_async_client()
+        return self.client
+
+    async def run(self, job):
+        # สร้าง params ตอนเริ่มงาน เพื่อให้ context เป็นเนื้อหาล่าสุดหลัง dependency เสร็จแล้ว
+        params = request_params(job)
+        cached = self.from_cache(job, params)
+        if cached is not None:
+            lines, changed = cached
+            return lines, "cached", changed
+
+        if job.filename in self.edits:
+            edited = await self.edit(job, params)
+            if edited is not None:
+                return edited
+
+        if job.sections:
+            message, output, timing = await self.sectioned(job, params)
+            return await self.accept(job, params, message, output, timing)
+
+        delay = None
+        if self.hedge_history is not None:
+            delay = self.hedge_history.latency_percentile(job.filename, HEDGE_PERCENTILE)
+        if delay is not None:
+            return await self.hedged(job, params, delay)
+
+        message, output, timing = await self.request(job, params)
+        return await self.accept(job, params, message, output, timing)
+
+    async def edit(self, job, params):
+        # ขอเฉพาะส่วนที่ต้องเปลี่ยน ถ้า patch ใช้ไม่ได้คืน None ให้สร้างใหม่ทั้งไฟล์
+        try:
+            with open(job.filename, encoding='utf-8') as f:
+                current = f.read()
+        except OSError:
+            return None
+
+        started = time.monotonic()
+        edit = edit_params(params, job.filename, self.edits[job.filename], job.prompt, current)
+        message, _ = await self.send(job, edit, None, 0, 0, mode="edit")
+        try:
+            if message.stop_reason == "max_tokens":
+                raise PatchError("patch was cut off at max_tokens")
+            blocks = parse_patch(message.content[0].text)
+            content = apply_patch(current, blocks)
+        except PatchError as e:
+            print(f"🩹 {job.filename}: {e}, regenerating the whole file")
+            return None
+
+        errors = await self.validate(job, content)
+        if errors:
+            print(f"🩹 {job.filename}: patched file failed validation ({errors[0]}), regenerating the whole file")
+            return None
+
+        changed = write_output(job.filename, content)
+        if self.cache is not None:
+            # เก็บไฟล์ที่ patch แล้วไว้ใต้ key ของ request เต็ม รอบหน้าจึงได้จาก cache
+            text = message.content[0].model_copy(update={"text": content})
+            self.cache.put(params, message.model_copy(update={"content": [text]}))
+        timing = f"{time.monotonic() - started:.1f}s, edited with {len(blocks)} {'block' if len(blocks) == 1 else 'blocks'}"
+        return len(content.splitlines()), timing, changed
+
+    async def sectioned(self, job, params):
+        # ส่วน shared ต้องเสร็จก่อน ส่วนที่เหลือส่งพร้อมกัน เวลารวมจึงเท่ากับส่วนที่ช้าที่สุด
+        started = time.monotonic()
+        shared = [section for section in job.sections if section.shared]
+        results = {}
+        for section in shared:
+            results[section.name] = await self.request(job, section_params(params, job, section), stream=False, labels={"section": section.name})
+        shared_code = [results[section.name][1] for section in shared]
+
+        rest = [section for section in job.sections if not section.shared]
+        for section, result in zip(rest, await asyncio.gather(*(
+            self.request(job, section_params(params, job, section, shared_code), stream=False, labels={"section": section.name})
+            for section in rest
+        ))):
+            results[section.name] = result
+
+        messages = [results[section.name][0] for section in job.sections]
+        content = stitch_sections(results[section.name][1] for section in job.sections)
+        timing = f"{time.monotonic() - started:.1f}s, {len(job.sections)} sections"
+        return merge_messages(messages, content), content, timing
+
+    async def attempt(self, job, params, clock=None, labels=None):
+        message, output, timing = await self.request(job, params, clock=clock, labels=labels)
+        return message, output, timing, await self.validate(job, output)
+
+    def can_hedge(self):
+        # ไม่ส่ง request ซ้ำตอน API กำลังกดกลับ: limiter ยังไม่กลับถึงเพดาน ถูก pause หรือมี request รอ backoff
+        limiter = self.limiter
+        return limiter.limit >= limiter.max_limit and limiter.paused_until <= time.monotonic() and not self.backing_off
+
+    async def hedged(self, job, params, delay):
+        # ถ้า API call ใดของ request หลักช้ากว่า p90 ของไฟล์นี้ ส่ง request ซ้ำอีกตัว ใช้ตัวแรกที่ผ่านการตรวจแล้วยกเลิกอีกตัว
+        clock = CallClock()
+        primary_started = time.monotonic()
+        primary = asyncio.create_task(self.attempt(job, params, clock))
+        while True:
+            clock.changed.clear()
+            remaining = clock.remaining(delay)
+            if remaining is not None and remaining <= 0:
+                if self.can_hedge():
+                    break
+                remaining = HEDGE_RECHECK
+            changed = asyncio.create_task(clock.changed.wait())
+            done, _ = await asyncio.wait({primary, changed}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            changed.cancel()
+            if primary in done:
+                return await self.accept(job, params, *primary.result())
+
+        print(f"🐇 {job.filename}: an API call ran past its p90 ({delay:.1f}s), sending a hedge request")
+        started = time.monotonic()
+        # ติดป้าย call ของ hedge ไว้ History จึงไม่นับเวลาและ token ของไฟล์นี้ซ้ำสองครั้ง
+        hedge = asyncio.create_task(self.attempt(job, params, labels={"hedge": True}))
+        names = {primary: "primary", hedge: "hedge"}
+        pending = set(names)
+        finished = []
+        winner = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        finished.append(task)
+                        if winner is None and not task.result()[3]:
+                            winner = task
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        elapsed = time.monotonic() - started
+        # เมื่อ hedge ชนะ request หลักยังไม่เสร็จ (หรือเสร็จแต่ไม่ผ่านการตรวจ) ตอนที่ hedge ได้ผล
+        # request หลักจึงช้ากว่า hedge อย่างน้อยเท่าเวลาที่มันวิ่งไปก่อนส่ง hedge: (เวลาของ request หลัก) - (latency ของ hedge)
+        saved = started - primary_started if winner is hedge else 0.0
+        if winner is None and not finished:
+            # ทั้งสองตัวล้ม ส่ง error ของ request แรกต่อ
+            primary.result()
+        chosen = winner or finished[0]
+        for task in finished:
+            if task is not chosen and isinstance(task.result()[1], StreamingOutput):
+                task.result()[1].abort()
+
+        message = chosen.result()[0]
+        extra = [task.result()[0] for task in finished if task is not chosen]
+        # request ที่ถูกยกเลิกไม่รู้จำนวน output token จึงนับเฉพาะ input token ที่ส่งไปซ้ำ
+        extra_input = sum(m.usage.input_tokens for m in extra) + (message.usage.input_tokens if pending else 0)
+        extra_output = sum(m.usage.output_tokens for m in extra)
+        if self.telemetry is not None:
+            self.telemetry.hedge(job, names[chosen], delay, elapsed, saved, extra_input, extra_output)
+
+        lines, timing, changed = await self.accept(job, params, *chosen.result())
+        timing += f", hedge {'won' if names[chosen] == 'hedge' else 'lost'}"
+        return lines, timing, changed
+
+    async def validate(self, job, output):
+        if isinstance(output, StreamingOutput):
+            return await asyncio.to_thread(validate_file, job.filename, output.tmp_path)
+        return await asyncio.to_thread(validate_content, job.filename, output)
+
+    def record(self, job, message, mode, latency, first_token=None, retry=0, continuation=0, error=None, labels=None):
+        if self.telemetry is not None:
+            cache = None if self.cache is None else "miss"
+            self.telemetry.call(job, message, mode, latency, first_token, retry, continuation, cache, error, labels)
+
+    async def request(self, job, params, retry=0, pieces=None, clock=None, stream=None, labels=None):
+        # ถ้าถูกตัดที่ max_tokens ขอส่วนที่เหลือต่อแล้วต่อข้อความเข้าด้วยกัน
+        pieces = list(pieces or [])
+        output = StreamingOutput(job.filename) if (self.stream if stream is None else stream) else None
+        started = time.monotonic()
+        first_token = None
+        try:
+            while not pieces or self.truncated(job, pieces):
+                attempt_params = params if not pieces else continuation_params(params, stitch_text(message.content[0].text for message in pieces))
+                if output is not None:
+                    output.resume()
+                message, token = await self.send(job, attempt_params, output, retry, len(pieces), clock, labels=labels)
+                pieces.append(message)
+                if first_token is None:
+                    first_token = token
+            if output is not None:
+                output.close()
+        except BaseException:
+            if output is not None:
+                output.abort()
+            raise
+
+        message = stitch_messages(pieces)
+        timing = f"{time.monotonic() - started:.1f}s"
+        if first_token is not None:
+            timing += f", first token {first_token:.1f}s"
+        if len(pieces) > 1:
+            timing += f", {len(pieces) - 1} {'continuation' if len(pieces) == 2 else 'continuations'}"
+        return message, output if output is not None else strip_code_fences(message.content[0].text), timing
+
+    def truncated(self, job, pieces):
+        if pieces[-1].stop_reason != "max_tokens":
+            return False
+        continuations = len(pieces) - 1
+        if continuations >= self.max_continuations:
+            # ครบจำนวน continuation แล้วยังไม่จบ ถือว่าไฟล์ล้ม ไม่เขียนลงดิสก์และยัง stale สำหรับรอบหน้า
+            raise Truncated(f"still truncated at max_tokens after {continuations} continuations")
+        print(f"✂️ {job.filename} hit max_tokens, continuing ({continuations + 1}/{self.max_continuations})")
+        return True
+
+    async def send(self, job, params, output, retry, continuation, clock=None, mode=None, labels=None):
+        # 429/529 และ error ชั่วคราวจะถูกส่งใหม่หลัง backoff แทนที่จะทำให้ทั้งรอบล้ม
+        client = self.get_client()
+        for attempt in itertools.count():
+            call = RateLimitedCall(self.limiter, self.priorities.get(job.filename, 0.0))
+            checkpoint = output.checkpoint() if output is not None else None
+            try:
+                async with call:
+                    if clock is not None:
+                        clock.start()
+                    try:
+                        return await self.call(client, job, params, output, retry, continuation, mode, labels)
+                    finally:
+                        if clock is not None:
+                            clock.stop()
+            except Exception as e:
+                delay = retry_decision(self.limiter, e, call.started, attempt, self.rate_limit_retries)
+                if delay is None:
+                    raise
+                if checkpoint is not None:
+                    output.rollback(checkpoint)
+                reason = error_status(e) or type(e).__name__
+                print(f"⏳ {job.filename}: {reason}, retrying in {delay:.1f}s ({attempt + 1}/{self.rate_limit_retries})")
+                self.backing_off += 1
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    self.backing_off -= 1
+
+    async def call(self, client, job, params, output, retry, continuation, mode=None, labels=None):
+        started = time.monotonic()
+        if output is None:
+            try:
+                response = await client.messages.with_raw_response.create(**params)
+                message = await response.parse()
+            except Exception as e:
+                self.record(job, None, mode or "messages", time.monotonic() - started, retry=retry, continuation=continuation, error=e,
+                            labels=labels)
+                raise
+            self.limiter.on_success(response.headers)
+            self.record(job, message, mode or "messages", time.monotonic() - started, retry=retry, continuation=continuation, labels=labels)
+            return message, None
+
+        first_token = None
+        try:
+            async with client.messages.stream(**params) as stream:
+                async for text in stream.text_stream:
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                    output.write(text)
+                message = await stream.get_final_message()
+                headers = stream.response.headers
+        except Exception as e:
+            self.record(job, None, "stream", time.monotonic() - started, first_token, retry, continuation, e, labels)
+            raise
+        self.limiter.on_success(headers)
+        self.record(job, message, "stream", time.monotonic() - started, first_token, retry, continuation, labels=labels)
+        return message, first_token
+
+    async def accept(self, job, params, message, output, timing, errors=None):
+        # ตรวจไฟล์ก่อนเขียนทับของเดิม ถ้าไม่ผ่านส่ง error กลับไปให้แก้เฉพาะไฟล์นี้
+        attempt_params = params
+        retries = 0
+        while True:
+            if errors is None:
+                errors = await self.validate(job, output)
+            if not errors:
+                break
+
+            if isinstance(output, StreamingOutput):
+                output.abort()
+            if retries >= self.max_retries:
+                raise ValidationFailed("; ".join(errors))
+
+            retries += 1
+            print(f"🔁 {job.filename} failed validation ({errors[0]}), retry {retries}/{self.max_retries}")
+            attempt_params = retry_params(attempt_params, message.content[0].text, errors)
+            stronger = ESCALATION.get(attempt_params["model"])
+            if stronger is not None:
+                print(f"⬆️ {job.filename}: escalating from {attempt_params['model']} to {stronger}")
+                attempt_params["model"] = stronger
+            message, output, timing = await self.request(job, attempt_params, retries)
+            errors = None
+
+        if isinstance(output, StreamingOutput):
+            lines = output.lines
+            changed = output.commit()
+        else:
+            changed = write_output(job.filename, output)
+            lines = len(output.splitlines())
+
+        # เก็บ response ที่ผ่านการตรวจไว้ใต้ key ของ request แรก
+        if self.cache is not None:
+            self.cache.put(params, message)
+        if retries:
+            timing += f", {retries} {'retry' if retries == 1 else 'retries'}"
+        return lines, timing, changed
+
+    async def run_batch(self, jobs, poll_interval):
+        # ไฟล์ที่เป็น context ของไฟล์อื่นในรอบนี้ต้องเสร็จก่อน prompt ของไฟล์เหล่านั้นจึงจะถูกต้อง
+        targets = {job.filename for job in jobs}
+        needed = {path for job in jobs for path in job.context if path in targets}
+        waves = [[job for job in jobs if job.filename in needed], [job for job in jobs if job.filename not in needed]]
+
+        started = time.monotonic()
+        for wave in waves:
+            pending = []
+            for job in wave:
+                params = request_params(job)
+                cached = self.from_cache(job, params)
+                if cached is None:
+                    pending.append((job, params))
+                else:
+                    lines, changed = cached
+                    yield job, (lines, "cached", changed), None
+
+            if not pending:
+                continue
+
+            # ไฟล์ที่ไม่ผ่านการตรวจจะถูกขอใหม่ทีละไฟล์ผ่าน Messages API ปกติ
+            submitted = time.monotonic()
+            async for job, params, message, error in run_batch(self.get_client(), pending, poll_interval):
+                # batch ไม่มีเวลาต่อ request จึงบันทึกเวลาตั้งแต่ส่ง batch จนได้ผล
+                self.record(job, message, "batch", time.monotonic() - submitted, error=error)
+                if error is not None:
+                    yield job, None, error
+                    continue
+                timing = f"batch, {time.monotonic() - started:.0f}s"
+                try:
+                    output = strip_code_fences(message.content[0].text)
+                    if message.stop_reason == "max_tokens":
+                        message, output, continued = await self.request(job, params, pieces=[message])
+                        timing += f", continued in {continued}"
+                    result = await self.accept(job, params, message, output, timing)
+                except Exception as e:
+                    yield job, None, e
+                    continue
+                yield job, result, None
+
+
+async def run_jobs(results, done, unchanged):
+    failed = []
+
+    async for job, result, error in results:
+        if error is not None:
+            failed.append(job)
+            print(f"❌ {job.filename} failed: {error}")
+            continue
+        lines, source, changed = result
+        done.append(job)
+        if changed:
+            print(f"✅ {job.filename} created! ({lines} lines, {source})")
+        else:
+            unchanged.append(job)
+            print(f"✅ {job.filename} unchanged ({lines} lines, {source})")
+
+    return failed
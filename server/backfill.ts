@@ -0,0 +1,255 @@
+// Imports a directory of weekly Shopee Ads / BigSeller exports in one go.
+//   npm run backfill -- ./exports/2024
+//   npm run backfill -- ./exports/2024 --jobs 4 --dry-run
+// Weeks are parsed, matched and computed in parallel worker processes; finished weeks
+// are written in bulk and recorded in a manifest, so a rerun skips weeks already done
+// unless one of their exports was replaced or edited since.
+import { type ChildProcess, fork } from 'child_process';
+import { existsSync, readFileSync, renameSync, writeFileSync } from 'fs';
+import { availableParallelism } from 'os';
+import { join, resolve } from 'path';
+import { type ExportFile, type WeekPair, discoverWeeks } from './utils/week-files';
+import { DEFAULT_RATES, type FeeRates, type WeekSummary, importWeek } from './utils/week-import';
+
+const MANIFEST_NAME = '.backfill-manifest.json';
+const DEFAULT_BATCH_WEEKS = 8;
+const VALUE_FLAGS = ['--jobs', '--batch', '--user', '--manifest', '--commission-rate', '--transaction-rate', '--payment-rate'];
+
+const USAGE = `usage: npm run backfill -- <dir> [options]
+
+  --jobs <n>               worker processes (default: CPU count)
+  --batch <n>              weeks per bulk write (default: ${DEFAULT_BATCH_WEEKS})
+  --user <id>              userId the reports belong to (default: 1)
+  --manifest <file>        resume manifest (default: <dir>/${MANIFEST_NAME})
+  --commission-rate <r>    Shopee commission, e.g. 0.05
+  --transaction-rate <r>   transaction fee rate
+  --payment-rate <r>       payment gateway fee rate
+  --dry-run                compute and print every week without writing`;
+
+interface Options {
+  dir: string;
+  jobs: number;
+  batch: number;
+  userId: number;
+  manifest: string;
+  rates: FeeRates;
+  dryRun: boolean;
+}
+
+interface ManifestEntry {
+  reportId: number | null;
+  files: Array<{ fileName: string; fileSize: number; modifiedMs: number }>;
+  completedAt: string;
+}
+
+interface Manifest {
+  version: 1;
+  weeks: Record<string, ManifestEntry>;
+}
+
+type WorkerReply = { key: string; summary: WeekSummary } | { key: string; error: string };
+
+function parseArgs(argv: string[]): Options {
+  const value = (name: string): string | undefined => {
+    const index = argv.indexOf(name);
+    return index === -1 ? undefined : argv[index + 1];
+  };
+  const number = (name: string, fallback: number): number => {
+    const raw = value(name);
+    if (raw === undefined) return fallback;
+    const parsed = Number(raw);
+    if (!Number.isFinite(parsed) || parsed < 0) throw new Error(`${name} must be a non-negative number, got ${raw}`);
+    return parsed;
+  };
+
+  const positional = argv.filter((arg, index) => !arg.startsWith('--') && !VALUE_FLAGS.includes(argv[index - 1]));
+  const dir = positional[0];
+  if (!dir || argv.includes('--help')) {
+    console.log(USAGE);
+    process.exit(dir ? 0 : 2);
+  }
+  return {
+    dir: resolve(dir),
+    jobs: Math.max(1, number('--jobs', availableParallelism())),
+    batch: Math.max(1, number('--batch', DEFAULT_BATCH_WEEKS)),
+    userId: number('--user', 1),
+    manifest: resolve(value('--manifest') ?? join(dir, MANIFEST_NAME)),
+    rates: {
+      commissionRate: number('--commission-rate', DEFAULT_RATES.commissionRate),
+      transactionRate: number('--transaction-rate', DEFAULT_RATES.transactionRate),
+      paymentRate: number('--payment-rate', DEFAULT_RATES.paymentRate),
+    },
+    dryRun: argv.includes('--dry-run'),
+  };
+}
+
+function loadManifest(path: string): Manifest {
+  if (!existsSync(path)) return { version: 1, weeks: {} };
+  return JSON.parse(readFileSync(path, 'utf8')) as Manifest;
+}
+
+function fileRecord({ fileName, fileSize, modifiedMs }: ExportFile): ManifestEntry['files'][number] {
+  return { fileName, fileSize, modifiedMs };
+}
+
+// A week is imported again when either export was replaced or edited since it was recorded.
+function exportsChanged(entry: ManifestEntry, pair: WeekPair): boolean {
+  const current = [pair.shopee, pair.bigseller].map(fileRecord);
+  return (
+    entry.files.length !== current.length ||
+    current.some(
+      (file, i) =>
+        file.fileName !== entry.files[i].fileName ||
+        file.fileSize !== entry.files[i].fileSize ||
+        file.modifiedMs !== entry.files[i].modifiedMs
+    )
+  );
+}
+
+// Write-then-rename, so an interrupted run never leaves a half-written manifest.
+function saveManifest(path: string, manifest: Manifest): void {
+  const temporary = `${path}.tmp`;
+  writeFileSync(temporary, JSON.stringify(manifest, null, 2));
+  renameSync(temporary, path);
+}
+
+// Hands weeks to a fixed set of forked workers, one week at a time each, and calls
+// onResult in the parent as replies arrive.
+function runPool(pairs: WeekPair[], jobs: number, rates: FeeRates, onResult: (reply: WorkerReply) => void): Promise<void> {
+  return new Promise((resolvePool, reject) => {
+    const queue = [...pairs];
+    const workers: ChildProcess[] = [];
+    const finished = new Set<ChildProcess>();
+    let active = 0;
+
+    const next = (worker: ChildProcess) => {
+      const pair = queue.shift();
+      if (!pair) {
+        finished.add(worker);
+        worker.disconnect();
+        if (--active === 0) resolvePool();
+        return;
+      }
+      worker.send({ pair, rates });
+    };
+
+    const count = Math.min(jobs, pairs.length);
+    if (count === 0) return resolvePool();
+    for (let i = 0; i < count; i++) {
+      const worker = fork(process.argv[1], ['--worker'], { execArgv: process.execArgv });
+      workers.push(worker);
+      active++;
+      worker.on('message', (reply: WorkerReply) => {
+        onResult(reply);
+        next(worker);
+      });
+      worker.once('error', reject);
+      worker.once('exit', (code) => {
+        if (!finished.has(worker)) {
+          for (const other of workers) other.kill();
+          reject(new Error(`backfill worker exited with code ${code}`));
+        }
+      });
+      next(worker);
+    }
+  });
+}
+
+function runWorker(): void {
+  process.on('message', async ({ pair, rates }: { pair: WeekPair; rates: FeeRates }) => {
+    let reply: WorkerReply;
+    try {
+      reply = { key: pair.key, summary: await importWeek(pair, rates) };
+    } catch (e) {
+      reply = { key: pair.key, error: e instanceof Error ? e.message : String(e) };
+    }
+    process.send?.(reply);
+  });
+}
+
+function describe(summary: WeekSummary): string {
+  const { totals, metrics } = summary;
+  const rows = summary.files.reduce((total, file) => total + file.validRows, 0);
+  const errors = summary.files.reduce((total, file) => total + file.errorCount, 0);
+  return (
+    `${summary.key}  ${rows.toLocaleString('en-US')} rows${errors ? ` (${errors} bad)` : ''}, ` +
+    `${summary.matched} matched, GMV ${totals.gmv.toFixed(2)}, ad spend ${totals.adSpend.toFixed(2)}, ` +
+    `ROAS ${metrics.roas.toFixed(2)}, net profit ${metrics.netProfit.toFixed(2)}`
+  );
+}
+
+async function main(): Promise<void> {
+  if (process.argv[2] === '--worker') return runWorker();
+
+  const options = parseArgs(process.argv.slice(2));
+  const { pairs, skipped } = await discoverWeeks(options.dir);
+  for (const { fileName, reason } of skipped) console.warn(`skipped ${fileName}: ${reason}`);
+
+  const manifest = loadManifest(options.manifest);
+  const changed = new Set(
+    pairs.filter((pair) => manifest.weeks[pair.key] && exportsChanged(manifest.weeks[pair.key], pair)).map((pair) => pair.key)
+  );
+  for (const key of changed) console.log(`${key}: exports changed since it was imported, importing it again`);
+  const pending = pairs.filter((pair) => options.dryRun || !manifest.weeks[pair.key] || changed.has(pair.key));
+  console.log(
+    `${pairs.length} weeks found, ${pairs.length - pending.length} already imported, ` +
+      `${pending.length} to process with ${Math.min(options.jobs, pending.length)} workers`
+  );
+
+  const started = performance.now();
+  const failed: string[] = [];
+  let buffer: WeekSummary[] = [];
+  let writing = Promise.resolve();
+  let written = 0;
+  const byKey = new Map(pending.map((pair) => [pair.key, pair]));
+
+  const flush = (summaries: WeekSummary[]) => {
+    writing = writing.then(async () => {
+      // Loaded here so dry runs and workers never open a database connection.
+      const { writeWeeks } = await import('./utils/week-writer');
+      const { reportIds: ids } = await writeWeeks(summaries, options.userId, { replace: changed });
+      for (const summary of summaries) {
+        const pair = byKey.get(summary.key)!;
+        manifest.weeks[summary.key] = {
+          reportId: ids.get(summary.key) ?? null,
+          files: [pair.shopee, pair.bigseller].map(fileRecord),
+          completedAt: new Date().toISOString(),
+        };
+      }
+      saveManifest(options.manifest, manifest);
+      written += summaries.length;
+      console.log(`wrote ${summaries.length} weeks (${written}/${pending.length})`);
+    });
+    // A failed write stops later flushes in the chain and is rethrown by `await writing`.
+    writing.catch(() => undefined);
+  };
+
+  await runPool(pending, options.jobs, options.rates, (reply) => {
+    if ('error' in reply) {
+      failed.push(reply.key);
+      console.error(`${reply.key} failed: ${reply.error}`);
+      return;
+    }
+    console.log(describe(reply.summary));
+    if (options.dryRun) return;
+    buffer.push(reply.summary);
+    if (buffer.length >= options.batch) {
+      flush(buffer);
+      buffer = [];
+    }
+  });
+  if (buffer.length > 0) flush(buffer);
+  await writing;
+
+  const seconds = (performance.now() - started) / 1000;
+  console.log(`done: ${pending.length - failed.length} weeks in ${seconds.toFixed(1)}s${options.dryRun ? ' (dry run, nothing written)' : ''}`);
+  if (failed.length > 0) {
+    console.error(`${failed.length} weeks failed and will be retried on the next run: ${failed.join(', ')}`);
+    process.exitCode = 1;
+  }
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
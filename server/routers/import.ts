@@ -1,91 +1,156 @@
-import { createTRPCRouter, publicProcedure } from './trpc';
+import { TRPCError } from '@trpc/server';
 import { z } from 'zod';
-import { parseShopeeAdsCSV, parseBigSellerCSV } from '../utils/csv-parser';
-import { matchProductData } from '../utils/gmv-calculations';
-import { db } from '../db';
+import { router, publicProcedure } from '../_core/trpc';
+import {
+  type UploadKind,
+  type UploadMeta,
+  CHUNK_BYTES,
+  PREVIEW_ROWS,
+  UploadError,
+  uploadStore,
+} from '../utils/upload-store';
+import { DEFAULT_RATES, fileStats, summarizeWeek } from '../utils/week-import';
+import { writeWeeks } from '../utils/week-writer';
 
-export const csvImportRouter = createTRPCRouter({
-  uploadShopeeCSV: publicProcedure
-    .input(z.object({ fileContent: z.string() }))
-    .mutation(async ({ input }) => {
-      const { data, validationResults } = await parseShopeeAdsCSV(input.fileContent);
-      return { data, validationResults };
-    }),
+// CSV import. Files are staged server-side under an upload ID (see ../utils/upload-store):
+// beginUpload -> uploadChunk... -> completeUpload returns a preview page and summary stats,
+// and matchAndImport takes the two upload IDs. Parsed rows never travel back to the browser.
 
-  uploadBigSellerCSV: publicProcedure
-    .input(z.object({ fileContent: z.string() }))
-    .mutation(async ({ input }) => {
-      const { data, validationResults } = await parseBigSellerCSV(input.fileContent);
-      return { data, validationResults };
-    }),
+const MAX_PAGE_ROWS = 500;
+const uploadId = z.string().uuid();
+const kind = z.enum(['shopee_ads', 'bigseller']);
 
-  matchAndImport: publicProcedure
-    .input(z.object({ 
-      shopeeData: z.array(z.any()), 
-      bigsellerData: z.array(z.any()),
-      weekNumber: z.number(),
-      year: z.number(),
-      startDate: z.date(),
-      endDate: z.date(),
-    }))
-    .mutation(async ({ input }) => {
-      const { shopeeData, bigsellerData, weekNumber, year, startDate, endDate } = input;
+async function staged<T>(task: () => Promise<T>): Promise<T> {
+  try {
+    return await task();
+  } catch (e) {
+    if (e instanceof UploadError) throw new TRPCError({ code: e.code, message: e.message });
+    throw e;
+  }
+}
+
+async function parsedUpload(meta: UploadMeta, previewRows: number) {
+  const parsed = await uploadStore.complete(meta.uploadId);
+  const preview = await uploadStore.page(meta.uploadId, 0, previewRows);
+  return {
+    uploadId: parsed.uploadId,
+    kind: parsed.kind,
+    fileName: parsed.fileName,
+    fileSize: parsed.fileSize,
+    summary: parsed.summary!,
+    preview: preview.rows,
+  };
+}
+
+// Small files in a single request: staged and parsed the same way, same response shape.
+function stageWhole(uploadKind: UploadKind) {
+  return publicProcedure
+    .input(z.object({ fileContent: z.string(), fileName: z.string().max(255).default(`${uploadKind}.csv`) }))
+    .mutation(({ input }) =>
+      staged(async () => {
+        const content = Buffer.from(input.fileContent, 'utf8');
+        const meta = await uploadStore.begin(uploadKind, input.fileName, content.length);
+        for (let offset = 0; offset < content.length; offset += CHUNK_BYTES) {
+          await uploadStore.append(meta.uploadId, offset, content.subarray(offset, offset + CHUNK_BYTES));
+        }
+        return parsedUpload(meta, PREVIEW_ROWS);
+      })
+    );
+}
+
+export const csvImportRouter = router({
+  beginUpload: publicProcedure
+    .input(z.object({ kind, fileName: z.string().max(255), fileSize: z.number().int().nonnegative() }))
+    .mutation(({ input }) =>
+      staged(async () => {
+        const meta = await uploadStore.begin(input.kind, input.fileName, input.fileSize);
+        return { uploadId: meta.uploadId, chunkSize: CHUNK_BYTES, received: meta.received };
+      })
+    ),
 
-      const matchedData = matchProductData(shopeeData, bigsellerData);
+  // data is base64 so a chunk boundary can fall inside a multi-byte UTF-8 character.
+  uploadChunk: publicProcedure
+    .input(z.object({ uploadId, offset: z.number().int().nonnegative(), data: z.string() }))
+    .mutation(({ input }) =>
+      staged(async () => {
+        const meta = await uploadStore.append(input.uploadId, input.offset, Buffer.from(input.data, 'base64'));
+        return { received: meta.received, fileSize: meta.fileSize };
+      })
+    ),
 
-      // Calculate totals and metrics
-      const totalGMV = matchedData.reduce((sum, product) => sum + product.gmv, 0);
-      const totalSpend = matchedData.reduce((sum, product) => sum + product.spend, 0);
-      const totalROAS = totalGMV / totalSpend;
-      // ... calculate other metrics
+  // Where an interrupted upload should resume from.
+  uploadStatus: publicProcedure.input(z.object({ uploadId })).query(({ input }) =>
+    staged(async () => {
+      const meta = await uploadStore.meta(input.uploadId);
+      return { received: meta.received, fileSize: meta.fileSize, state: meta.state };
+    })
+  ),
 
-      // Create weekly report in database
-      const { id: reportId } = await db.weeklyReport.create({
-        data: {
-          weekNumber,
-          year,
-          startDate,
-          endDate,
-          totalGMV,
-          totalSpend,
-          totalROAS,
-          // ... other fields
-        },
-      });
+  completeUpload: publicProcedure
+    .input(z.object({ uploadId, previewRows: z.number().int().min(1).max(MAX_PAGE_ROWS).default(PREVIEW_ROWS) }))
+    .mutation(({ input }) => staged(async () => parsedUpload(await uploadStore.meta(input.uploadId), input.previewRows))),
 
-      // Create top performing products records
-      const topPerformingProducts = matchedData
-        .sort((a, b) => b.gmv - a.gmv)
-        .slice(0, 10);
+  previewUpload: publicProcedure
+    .input(z.object({ uploadId, offset: z.number().int().nonnegative().default(0), limit: z.number().int().min(1).max(MAX_PAGE_ROWS).default(PREVIEW_ROWS) }))
+    .query(({ input }) => staged(() => uploadStore.page(input.uploadId, input.offset, input.limit))),
+
+  uploadShopeeCSV: stageWhole('shopee_ads'),
+  uploadBigSellerCSV: stageWhole('bigseller'),
+
+  matchAndImport: publicProcedure
+    .input(
+      z.object({
+        shopeeUploadId: uploadId,
+        bigsellerUploadId: uploadId,
+        weekNumber: z.number().int().min(1).max(53),
+        year: z.number().int(),
+        startDate: z.date().optional(),
+        endDate: z.date().optional(),
+        userId: z.number().int().default(1),
+        rates: z
+          .object({ commissionRate: z.number(), transactionRate: z.number(), paymentRate: z.number() })
+          .default(DEFAULT_RATES),
+      })
+    )
+    .mutation(({ input }) =>
+      staged(async () => {
+        const [shopeeMeta, bigsellerMeta, shopeeData, bigsellerData] = await Promise.all([
+          uploadStore.meta(input.shopeeUploadId),
+          uploadStore.meta(input.bigsellerUploadId),
+          uploadStore.rows(input.shopeeUploadId, 'shopee_ads'),
+          uploadStore.rows(input.bigsellerUploadId, 'bigseller'),
+        ]);
+        const files = [shopeeMeta, bigsellerMeta].map((meta) =>
+          fileStats({ fileName: meta.fileName, fileSize: meta.fileSize, kind: meta.kind }, meta.summary!)
+        );
+        const summary = summarizeWeek(input, shopeeData, bigsellerData, input.rates, files);
 
-      await db.topPerformingProduct.createMany({
-        data: topPerformingProducts.map((product) => ({
-          reportId,
-          productName: product.name,
-          gmv: product.gmv,
-          spend: product.spend,
-          roas: product.gmv / product.spend,
-          // ... other fields
-        })),
-      });
+        const { reportIds, existing } = await writeWeeks([summary], input.userId);
+        if (existing.includes(summary.key)) {
+          throw new TRPCError({
+            code: 'CONFLICT',
+            message: `week ${summary.weekNumber}/${summary.year} is already imported as report ${reportIds.get(summary.key)}`,
+          });
+        }
+        await Promise.all([uploadStore.remove(input.shopeeUploadId), uploadStore.remove(input.bigsellerUploadId)]);
 
-      // Log to import history
-      await db.importHistory.create({
-        data: {
-          reportId,
-          importedAt: new Date(),
-          // ... other fields
-        },
-      });
+        return {
+          reportId: reportIds.get(summary.key)!,
+          matchedProducts: summary.matched,
+          unmatchedShopee: summary.unmatchedShopee,
+          unmatchedBigSeller: summary.unmatchedBigSeller,
+          summary: {
+            gmv: summary.totals.gmv,
+            orders: summary.totals.orders,
+            products: summary.matched,
+            adSpend: summary.totals.adSpend,
+            roas: summary.metrics.roas,
+            netProfit: summary.metrics.netProfit,
+          },
+          topProducts: summary.topProducts,
+        };
+      })
+    ),
+});
 
-      return {
-        reportId,
-        summary: {
-          totalGMV,
-          totalSpend,
-          totalROAS,
-          // ... other summary data
-        },
-      };
-    }),
-});
\ No newline at end of file
+export default csvImportRouter;
@@ -1,11 +1,13 @@
 import Papa from 'papaparse';
+import { type ColumnSpec, type IngestOptions, collectCSV, ingestCSV, stringSource } from './csv-stream';
+import { type MatchOptions, type ProductMatchResult, matchProducts } from './product-matcher';
 
 interface ParseCSVOptions {
   header: boolean;
   dynamicTyping: boolean;
 }
 
-interface ShopeeAdsData {
+export interface ShopeeAdsData {
   productName: string;
   productSku: string;
   adSpend: number;
@@ -16,7 +18,7 @@ interface ShopeeAdsData {
   affiliateCommission: number;
 }
 
-interface BigSellerData {
+export interface BigSellerData {
   productName: string;
   productSku: string;
   orders: number;
@@ -25,14 +27,7 @@ interface BigSellerData {
   productCost: number;
 }
 
-interface MatchedData {
-  matched: Array<{
-    shopeeData: ShopeeAdsData;
-    bigsellerData: BigSellerData;
-  }>;
-  unmatchedShopee: ShopeeAdsData[];
-  unmatchedBigSeller: BigSellerData[];
-}
+type MatchedData = ProductMatchResult<ShopeeAdsData, BigSellerData>;
 
 interface SummaryData {
   totalOrders: number;
@@ -53,40 +48,52 @@ export function parseCSV<T>(fileContent: string, options?: ParseCSVOptions): T[]
   return data as T[];
 }
 
-export function parseShopeeAdsCSV(fileContent: string): ShopeeAdsData[] {
-  return parseCSV<ShopeeAdsData>(fileContent);
+// Header variations seen in Shopee Ads and BigSeller exports (English and Thai).
+export const SHOPEE_ADS_COLUMNS: ColumnSpec<ShopeeAdsData>[] = [
+  { field: 'productName', aliases: ['product', 'name', 'product name', 'ชื่อสินค้า'], type: 'string', required: true },
+  { field: 'productSku', aliases: ['sku', 'product sku', 'product id', 'parent sku', 'รหัสสินค้า', 'เลข sku'], type: 'string' },
+  { field: 'adSpend', aliases: ['spend', 'expense', 'cost', 'ad spend', 'ค่าใช้จ่าย', 'ค่าโฆษณา'], type: 'number', required: true },
+  { field: 'impressions', aliases: ['impression', 'views', 'การแสดงผล'], type: 'integer' },
+  { field: 'clicks', aliases: ['click', 'จำนวนคลิก', 'คลิก'], type: 'integer' },
+  { field: 'orders', aliases: ['conversions', 'order', 'คำสั่งซื้อ'], type: 'integer' },
+  { field: 'gmv', aliases: ['sales', 'gross merchandise value', 'revenue', 'ยอดขาย'], type: 'number', required: true },
+  { field: 'affiliateCommission', aliases: ['affiliate commission', 'commission', 'ค่าคอมมิชชั่น'], type: 'number' },
+];
+
+export const BIGSELLER_COLUMNS: ColumnSpec<BigSellerData>[] = [
+  { field: 'productName', aliases: ['product', 'name', 'product name', 'item name', 'ชื่อสินค้า'], type: 'string', required: true },
+  { field: 'productSku', aliases: ['sku', 'product sku', 'merchant sku', 'seller sku', 'รหัสสินค้า'], type: 'string' },
+  { field: 'orders', aliases: ['order', 'order count', 'คำสั่งซื้อ'], type: 'integer' },
+  { field: 'units', aliases: ['quantity', 'qty', 'units sold', 'จำนวน'], type: 'integer' },
+  { field: 'gmv', aliases: ['sales', 'revenue', 'sales amount', 'ยอดขาย'], type: 'number', required: true },
+  { field: 'productCost', aliases: ['cost', 'product cost', 'cogs', 'ต้นทุน'], type: 'number' },
+];
+
+// Parses through the streaming engine, so header aliases, number formats and row errors
+// are handled the same way as for large files read with ingestShopeeAdsCSV.
+export function parseShopeeAdsCSV(fileContent: string, options?: IngestOptions) {
+  return collectCSV(stringSource(fileContent), SHOPEE_ADS_COLUMNS, options);
+}
+
+export function parseBigSellerCSV(fileContent: string, options?: IngestOptions) {
+  return collectCSV(stringSource(fileContent), BIGSELLER_COLUMNS, options);
+}
+
+export function ingestShopeeAdsCSV(source: AsyncIterable<string | Uint8Array>, options?: IngestOptions) {
+  return ingestCSV(source, SHOPEE_ADS_COLUMNS, options);
 }
 
-export function parseBigSellerCSV(fileContent: string): BigSellerData[] {
-  return parseCSV<BigSellerData>(fileContent);
+export function ingestBigSellerCSV(source: AsyncIterable<string | Uint8Array>, options?: IngestOptions) {
+  return ingestCSV(source, BIGSELLER_COLUMNS, options);
 }
 
+// Matches are ordered by confidence: SKU, then exact name, then fuzzy name similarity.
 export function matchProductData(
   shopeeData: ShopeeAdsData[],
-  bigsellerData: BigSellerData[]
+  bigsellerData: BigSellerData[],
+  options?: MatchOptions
 ): MatchedData {
-  const matched: MatchedData['matched'] = [];
-  const unmatchedShopee: ShopeeAdsData[] = [];
-  const unmatchedBigSeller: BigSellerData[] = [];
-
-  const bigsellerMap = new Map(
-    bigsellerData.map((data) => [data.productSku || data.productName, data])
-  );
-
-  for (const shopeeItem of shopeeData) {
-    const key = shopeeItem.productSku || shopeeItem.productName;
-    const bigsellerItem = bigsellerMap.get(key);
-    if (bigsellerItem) {
-      matched.push({ shopeeData: shopeeItem, bigsellerData: bigsellerItem });
-      bigsellerMap.delete(key);
-    } else {
-      unmatchedShopee.push(shopeeItem);
-    }
-  }
-
-  unmatchedBigSeller.push(...bigsellerMap.values());
-
-  return { matched, unmatchedShopee, unmatchedBigSeller };
+  return matchProducts(shopeeData, bigsellerData, options);
 }
 
 export function validateShopeeAdsData(data: ShopeeAdsData[]): boolean {
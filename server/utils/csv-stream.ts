@@ -0,0 +1,374 @@
+import { createReadStream } from 'fs';
+
+// Streaming CSV ingestion: the file is read, tokenized, validated and handed to the
+// caller in bounded chunks, so memory depends on the chunk size, not the file size.
+
+export type ColumnType = 'string' | 'number' | 'integer';
+
+export interface ColumnSpec<T> {
+  field: keyof T & string;
+  aliases: string[];
+  type: ColumnType;
+  required?: boolean;
+}
+
+export interface RowError {
+  line: number;
+  column?: string;
+  value?: string;
+  message: string;
+}
+
+export interface IngestChunk<T> {
+  rows: T[];
+  errors: RowError[];
+  rowsRead: number;
+  errorCount: number;
+}
+
+export interface IngestOptions {
+  chunkRows?: number;
+  maxErrors?: number;
+  delimiter?: string;
+}
+
+export interface ValidationResults {
+  rowCount: number;
+  validRows: number;
+  errorCount: number;
+  errors: RowError[];
+}
+
+export class CSVHeaderError extends Error {}
+
+export interface CSVRecord {
+  fields: string[];
+  line: number;
+}
+
+export const DEFAULT_CHUNK_ROWS = 5000;
+export const DEFAULT_MAX_ERRORS = 1000;
+export const DEFAULT_READ_SIZE = 64 * 1024;
+
+const QUOTE = 34;
+const LF = 10;
+const CR = 13;
+
+// "Sales (฿)", "sales_amount" and "Sales Amount" all become "salesamount"-style keys;
+// \p{M} keeps Thai vowel and tone marks.
+export function normalizeHeader(name: string): string {
+  return name.replace(/\([^)]*\)/g, '').toLowerCase().replace(/[^\p{L}\p{M}\p{N}]+/gu, '');
+}
+
+// Incremental RFC 4180 tokenizer. push() may receive any slice of the file; quoted
+// fields, escaped quotes and CRLF pairs that straddle two slices are carried over.
+export class CSVTokenizer {
+  private field = '';
+  private fields: string[] = [];
+  private quoted = false;
+  private quoteSeen = false;
+  private fieldStart = true;
+  private skipLF = false;
+  private line = 1;
+  private recordLine = 1;
+  private readonly delimiter: number;
+
+  constructor(delimiter = ',') {
+    this.delimiter = delimiter.charCodeAt(0);
+  }
+
+  get unterminated(): boolean {
+    return this.quoted && !this.quoteSeen;
+  }
+
+  get pendingLine(): number {
+    return this.recordLine;
+  }
+
+  push(text: string, records: CSVRecord[]): void {
+    const n = text.length;
+    let i = 0;
+    if (this.skipLF && n > 0) {
+      this.skipLF = false;
+      if (text.charCodeAt(0) === LF) i = 1;
+    }
+
+    while (i < n) {
+      if (this.quoted) {
+        if (this.quoteSeen) {
+          this.quoteSeen = false;
+          if (text.charCodeAt(i) === QUOTE) {
+            this.field += '"';
+            i++;
+            continue;
+          }
+          // The previous quote closed the field; anything up to the delimiter is kept as-is.
+          this.quoted = false;
+        } else {
+          const close = text.indexOf('"', i);
+          const end = close === -1 ? n : close;
+          const chunk = text.slice(i, end);
+          this.field += chunk;
+          this.countLines(chunk);
+          if (close === -1) return;
+          this.quoteSeen = true;
+          i = close + 1;
+          continue;
+        }
+      }
+
+      const c = text.charCodeAt(i);
+      if (c === QUOTE && this.fieldStart) {
+        this.quoted = true;
+        this.fieldStart = false;
+        i++;
+        continue;
+      }
+      if (c === this.delimiter) {
+        this.endField();
+        i++;
+        continue;
+      }
+      if (c === LF || c === CR) {
+        this.endRecord(records);
+        this.line++;
+        this.recordLine = this.line;
+        i++;
+        if (c === CR) {
+          if (i < n) {
+            if (text.charCodeAt(i) === LF) i++;
+          } else {
+            this.skipLF = true;
+          }
+        }
+        continue;
+      }
+
+      // Plain run of characters up to the next delimiter, quote or line break.
+      let j = i + 1;
+      while (j < n) {
+        const d = text.charCodeAt(j);
+        if (d === this.delimiter || d === LF || d === CR || d === QUOTE) break;
+        j++;
+      }
+      this.field += text.slice(i, j);
+      this.fieldStart = false;
+      i = j;
+      if (j < n && text.charCodeAt(j) === QUOTE) {
+        // A quote in the middle of an unquoted field is literal.
+        this.field += '"';
+        i++;
+      }
+    }
+  }
+
+  end(records: CSVRecord[]): void {
+    if (this.quoteSeen) {
+      this.quoted = false;
+      this.quoteSeen = false;
+    }
+    if (this.field !== '' || this.fields.length > 0 || this.quoted) {
+      this.endRecord(records);
+    }
+  }
+
+  private countLines(chunk: string): void {
+    let at = chunk.indexOf('\n');
+    while (at !== -1) {
+      this.line++;
+      at = chunk.indexOf('\n', at + 1);
+    }
+  }
+
+  private endField(): void {
+    this.fields.push(this.field);
+    this.field = '';
+    this.quoted = false;
+    this.quoteSeen = false;
+    this.fieldStart = true;
+  }
+
+  private endRecord(records: CSVRecord[]): void {
+    this.endField();
+    const fields = this.fields;
+    this.fields = [];
+    // Blank lines are skipped rather than reported as rows with every column missing.
+    if (fields.length > 1 || fields[0] !== '') {
+      records.push({ fields, line: this.recordLine });
+    }
+  }
+}
+
+type Converter = (raw: string) => unknown;
+
+class CoercionError extends Error {}
+
+const NUMBER_NOISE = /[,\s฿%]|THB/g;
+
+function toNumber(raw: string): number {
+  const direct = Number(raw);
+  if (raw !== '' && !Number.isNaN(direct)) return direct;
+
+  const cleaned = raw.replace(NUMBER_NOISE, '');
+  if (cleaned === '' || cleaned === '-') return 0;
+  const value = Number(cleaned);
+  if (Number.isNaN(value)) throw new CoercionError('not a number');
+  return value;
+}
+
+function converter(type: ColumnType, required: boolean): Converter {
+  if (type === 'string') {
+    return (raw) => {
+      const value = raw.trim();
+      if (required && value === '') throw new CoercionError('missing value');
+      return value;
+    };
+  }
+  return (raw) => {
+    if (required && raw.trim() === '') throw new CoercionError('missing value');
+    const value = toNumber(raw);
+    if (type === 'integer' && !Number.isInteger(value)) throw new CoercionError('not a whole number');
+    return value;
+  };
+}
+
+export interface ResolvedColumns {
+  indexes: number[];
+  converters: Converter[];
+}
+
+// Header aliases are matched once per file; rows are then read by column index.
+export function resolveColumns<T>(header: string[], columns: ColumnSpec<T>[]): ResolvedColumns {
+  const positions = new Map<string, number>();
+  header.forEach((name, index) => {
+    const key = normalizeHeader(name);
+    if (!positions.has(key)) positions.set(key, index);
+  });
+
+  const indexes = columns.map((column) => {
+    for (const alias of [column.field, ...column.aliases]) {
+      const index = positions.get(normalizeHeader(alias));
+      if (index !== undefined) return index;
+    }
+    return -1;
+  });
+
+  const missing = columns.filter((column, i) => column.required && indexes[i] === -1).map((column) => column.field);
+  if (missing.length > 0) {
+    throw new CSVHeaderError(`missing required columns: ${missing.join(', ')} (header: ${header.join(', ')})`);
+  }
+
+  return {
+    indexes,
+    converters: columns.map((column) => converter(column.type, column.required ?? false)),
+  };
+}
+
+export async function* ingestCSV<T>(
+  source: AsyncIterable<string | Uint8Array> | Iterable<string | Uint8Array>,
+  columns: ColumnSpec<T>[],
+  options: IngestOptions = {}
+): AsyncGenerator<IngestChunk<T>> {
+  const chunkRows = options.chunkRows ?? DEFAULT_CHUNK_ROWS;
+  const maxErrors = options.maxErrors ?? DEFAULT_MAX_ERRORS;
+  const decoder = new TextDecoder('utf-8');
+  const tokenizer = new CSVTokenizer(options.delimiter);
+  const records: CSVRecord[] = [];
+
+  let resolved: ResolvedColumns | null = null;
+  let rows: T[] = [];
+  let errors: RowError[] = [];
+  let rowsRead = 0;
+  let errorCount = 0;
+  let first = true;
+
+  const report = (error: RowError) => {
+    errorCount++;
+    if (errorCount <= maxErrors) errors.push(error);
+  };
+
+  const handle = (record: CSVRecord) => {
+    if (resolved === null) {
+      resolved = resolveColumns(record.fields, columns);
+      return;
+    }
+
+    rowsRead++;
+    const row: Record<string, unknown> = {};
+    let valid = true;
+    for (let i = 0; i < columns.length; i++) {
+      const index = resolved.indexes[i];
+      const raw = index >= 0 && index < record.fields.length ? record.fields[index] : '';
+      try {
+        row[columns[i].field] = resolved.converters[i](raw);
+      } catch (e) {
+        if (!(e instanceof CoercionError)) throw e;
+        valid = false;
+        report({ line: record.line, column: columns[i].field, value: raw.slice(0, 100), message: e.message });
+      }
+    }
+    if (valid) rows.push(row as T);
+  };
+
+  const take = (): IngestChunk<T> => {
+    const chunk = { rows, errors, rowsRead, errorCount };
+    rows = [];
+    errors = [];
+    return chunk;
+  };
+
+  for await (const piece of source) {
+    let text = typeof piece === 'string' ? piece : decoder.decode(piece, { stream: true });
+    if (first) {
+      text = text.replace(/^\uFEFF/, '');
+      first = false;
+    }
+    tokenizer.push(text, records);
+    for (const record of records) {
+      handle(record);
+      if (rows.length >= chunkRows) yield take();
+    }
+    records.length = 0;
+  }
+
+  tokenizer.push(decoder.decode(), records);
+  if (tokenizer.unterminated) {
+    // The rest of the file is one open quoted field; drop it instead of guessing.
+    report({ line: tokenizer.pendingLine, message: 'unterminated quoted field' });
+  } else {
+    tokenizer.end(records);
+  }
+  for (const record of records) handle(record);
+
+  if (resolved === null) throw new CSVHeaderError('file is empty');
+  yield take();
+}
+
+export function fileSource(path: string, readSize = DEFAULT_READ_SIZE): AsyncIterable<Uint8Array> {
+  return createReadStream(path, { highWaterMark: readSize });
+}
+
+export function* stringSource(content: string, readSize = DEFAULT_READ_SIZE): Iterable<string> {
+  for (let i = 0; i < content.length; i += readSize) {
+    yield content.slice(i, i + readSize);
+  }
+}
+
+// Collects every chunk; for callers that need the whole array (previews, small files).
+export async function collectCSV<T>(
+  source: AsyncIterable<string | Uint8Array> | Iterable<string | Uint8Array>,
+  columns: ColumnSpec<T>[],
+  options: IngestOptions = {}
+): Promise<{ data: T[]; validationResults: ValidationResults }> {
+  const data: T[] = [];
+  const errors: RowError[] = [];
+  let rowCount = 0;
+  let errorCount = 0;
+  for await (const chunk of ingestCSV(source, columns, options)) {
+    for (const row of chunk.rows) data.push(row);
+    errors.push(...chunk.errors);
+    rowCount = chunk.rowsRead;
+    errorCount = chunk.errorCount;
+  }
+  return { data, validationResults: { rowCount, validRows: data.length, errorCount, errors } };
+}
@@ -0,0 +1,171 @@
+// Columnar version of calculateAllMetrics in ./gmv-calculations for backfills and
+// per-product analytics: one pass over typed arrays instead of one object per row.
+// The formulas are the same expressions in the same order, so results match the
+// scalar functions bit for bit with zeroDivision: 'ieee' (see bench/metrics-parity.ts).
+
+export type Column = ArrayLike<number> | number;
+
+// One entry per product-week. A plain number is used for every row (e.g. a shop-wide fee rate).
+export interface MetricColumns {
+  gmv: Column;
+  orders: Column;
+  costs: Column;
+  adSpend: Column;
+  clicks: Column;
+  impressions: Column;
+  commissionRate: Column;
+  transactionRate: Column;
+  paymentRate: Column;
+}
+
+export const METRIC_NAMES = [
+  'aov',
+  'totalFees',
+  'vat',
+  'netProfit',
+  'roas',
+  'realRoas',
+  'breakEvenRoas',
+  'targetRoas',
+  'ctr',
+  'cpc',
+  'cpa',
+  'conversionRate',
+  'profitMargin',
+] as const;
+
+export type MetricName = (typeof METRIC_NAMES)[number];
+export type MetricBatch = Record<MetricName, Float64Array>;
+
+export interface BatchOptions {
+  // Value of a ratio whose denominator is 0 (AOV with no orders, ROAS with no ad spend, ...).
+  // 'ieee' keeps JavaScript division, i.e. Infinity or NaN, exactly like the scalar functions.
+  zeroDivision?: number | 'ieee';
+  targetMargin?: number;
+  // Output arrays from an earlier call with the same row count, reused instead of allocated.
+  into?: MetricBatch;
+}
+
+export const VAT_RATE = 0.07;
+export const DEFAULT_TARGET_MARGIN = 0.1;
+const INPUT_NAMES: Array<keyof MetricColumns> = [
+  'gmv',
+  'orders',
+  'costs',
+  'adSpend',
+  'clicks',
+  'impressions',
+  'commissionRate',
+  'transactionRate',
+  'paymentRate',
+];
+
+function batchLength(columns: MetricColumns): number {
+  let length: number | undefined;
+  for (const name of INPUT_NAMES) {
+    const column = columns[name];
+    if (typeof column === 'number') continue;
+    if (length === undefined) length = column.length;
+    else if (column.length !== length) {
+      throw new RangeError(`column ${name} has ${column.length} rows, expected ${length}`);
+    }
+  }
+  return length ?? 1;
+}
+
+// A constant column is read as a one-element array with stride 0, so the loop indexes
+// every input the same way without allocating and filling a full column on each call.
+function asArray(column: Column): ArrayLike<number> {
+  return typeof column === 'number' ? Float64Array.of(column) : column;
+}
+
+function stride(column: Column): number {
+  return typeof column === 'number' ? 0 : 1;
+}
+
+export function calculateMetricsBatch(columns: MetricColumns, options: BatchOptions = {}): MetricBatch {
+  const n = batchLength(columns);
+  const targetDivisor = 1 - (options.targetMargin ?? DEFAULT_TARGET_MARGIN);
+
+  const gmv = asArray(columns.gmv);
+  const orders = asArray(columns.orders);
+  const costs = asArray(columns.costs);
+  const adSpend = asArray(columns.adSpend);
+  const clicks = asArray(columns.clicks);
+  const impressions = asArray(columns.impressions);
+  const commissionRate = asArray(columns.commissionRate);
+  const transactionRate = asArray(columns.transactionRate);
+  const paymentRate = asArray(columns.paymentRate);
+  const gmvStride = stride(columns.gmv);
+  const ordersStride = stride(columns.orders);
+  const costsStride = stride(columns.costs);
+  const adSpendStride = stride(columns.adSpend);
+  const clicksStride = stride(columns.clicks);
+  const impressionsStride = stride(columns.impressions);
+  const commissionStride = stride(columns.commissionRate);
+  const transactionStride = stride(columns.transactionRate);
+  const paymentStride = stride(columns.paymentRate);
+
+  const out = options.into ?? ({} as MetricBatch);
+  for (const name of METRIC_NAMES) {
+    if (out[name]?.length !== n) out[name] = new Float64Array(n);
+  }
+  const { aov, totalFees, vat, netProfit, roas, realRoas, breakEvenRoas, targetRoas, ctr, cpc, cpa, conversionRate, profitMargin } = out;
+
+  // Plain IEEE division first so the hot loop has no branches; rows with a zero
+  // denominator are overwritten afterwards.
+  for (let i = 0; i < n; i++) {
+    const g = gmv[i * gmvStride];
+    const o = orders[i * ordersStride];
+    const cost = costs[i * costsStride];
+    const spend = adSpend[i * adSpendStride];
+    const c = clicks[i * clicksStride];
+
+    const fees = g * (commissionRate[i * commissionStride] + transactionRate[i * transactionStride] + paymentRate[i * paymentStride]);
+    const tax = (fees + spend) * VAT_RATE;
+    const profit = g - cost - fees - spend - tax;
+    const breakEven = (cost + fees + tax) / spend;
+
+    aov[i] = g / o;
+    totalFees[i] = fees;
+    vat[i] = tax;
+    netProfit[i] = profit;
+    roas[i] = g / spend;
+    realRoas[i] = profit / spend;
+    breakEvenRoas[i] = breakEven;
+    targetRoas[i] = breakEven / targetDivisor;
+    ctr[i] = (c / impressions[i * impressionsStride]) * 100;
+    cpc[i] = spend / c;
+    cpa[i] = spend / o;
+    conversionRate[i] = (o / c) * 100;
+    profitMargin[i] = (profit / g) * 100;
+  }
+  if (options.zeroDivision === 'ieee') return out;
+
+  const fill = options.zeroDivision ?? 0;
+  for (let i = 0; i < n; i++) {
+    if (orders[i * ordersStride] === 0) aov[i] = cpa[i] = fill;
+    if (adSpend[i * adSpendStride] === 0) roas[i] = realRoas[i] = breakEvenRoas[i] = targetRoas[i] = fill;
+    if (impressions[i * impressionsStride] === 0) ctr[i] = fill;
+    if (clicks[i * clicksStride] === 0) cpc[i] = conversionRate[i] = fill;
+    if (gmv[i * gmvStride] === 0) profitMargin[i] = fill;
+  }
+  return out;
+}
+
+// Row i of a batch in the shape calculateAllMetrics returns.
+export function metricsAt(batch: MetricBatch, index: number): Record<MetricName, number> {
+  const row = {} as Record<MetricName, number>;
+  for (const name of METRIC_NAMES) row[name] = batch[name][index];
+  return row;
+}
+
+// Builds columns from per-row records, for callers that start from query results.
+export function toColumns(records: Array<Record<keyof MetricColumns, number>>): MetricColumns {
+  const columns = {} as Record<keyof MetricColumns, Float64Array>;
+  for (const name of INPUT_NAMES) columns[name] = new Float64Array(records.length);
+  records.forEach((record, i) => {
+    for (const name of INPUT_NAMES) columns[name][i] = record[name];
+  });
+  return columns;
+}
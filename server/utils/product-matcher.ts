@@ -0,0 +1,210 @@
+// Product matching between Shopee Ads and BigSeller rows, built once per import.
+// Pass 1 matches normalized SKUs, pass 2 normalized names, and pass 3 retrieves fuzzy
+// name candidates from a character-trigram inverted index. Every pass is a hash or index
+// lookup per row, so 100k x 100k lists stay near-linear instead of an O(n*m) scan.
+
+export interface MatchableProduct {
+  productName: string;
+  productSku: string;
+}
+
+export type MatchMethod = 'sku' | 'name' | 'fuzzy';
+
+export interface ProductMatch<S, B> {
+  shopeeData: S;
+  bigsellerData: B;
+  confidence: number;
+  matchedBy: MatchMethod;
+}
+
+export interface ProductMatchResult<S, B> {
+  matched: ProductMatch<S, B>[];
+  unmatchedShopee: S[];
+  unmatchedBigSeller: B[];
+}
+
+export interface MatchOptions {
+  // Lowest trigram similarity (Dice coefficient, 0..1) accepted as a fuzzy match.
+  minConfidence?: number;
+  // Rarest trigrams of a name used to look up candidates.
+  probeTrigrams?: number;
+  // Trigrams shared by more names than this are too common to narrow anything down.
+  maxPostings?: number;
+  // Candidates per row whose similarity is computed exactly.
+  candidates?: number;
+}
+
+export const SKU_CONFIDENCE = 1;
+export const NAME_CONFIDENCE = 0.95;
+const DEFAULTS: Required<MatchOptions> = {
+  minConfidence: 0.6,
+  probeTrigrams: 8,
+  maxPostings: 1000,
+  candidates: 20,
+};
+
+const THAI_DIGITS = /[\u0E50-\u0E59]/g;
+// Zero-width spaces and soft hyphens are common in Thai product names copied from the web.
+const INVISIBLE = /[\u200B-\u200D\uFEFF\u00AD]/g;
+
+function foldText(value: string): string {
+  // NFKC folds full-width Latin and digits; Thai digits become ASCII digits.
+  return (value ?? '')
+    .normalize('NFKC')
+    .replace(INVISIBLE, '')
+    .replace(THAI_DIGITS, (digit) => String(digit.charCodeAt(0) - 0x0e50))
+    .toLowerCase();
+}
+
+export function normalizeSku(sku: string): string {
+  return foldText(sku).replace(/[^\p{L}\p{M}\p{N}]+/gu, '');
+}
+
+export function normalizeName(name: string): string {
+  return foldText(name).replace(/[^\p{L}\p{M}\p{N}]+/gu, ' ').trim();
+}
+
+function trigrams(name: string): string[] {
+  const padded = ` ${name} `;
+  const grams = new Set<string>();
+  for (let i = 0; i + 3 <= padded.length; i++) grams.add(padded.slice(i, i + 3));
+  return [...grams];
+}
+
+// Inverted index from trigram id to the BigSeller rows whose name contains it.
+class TrigramIndex {
+  private readonly ids = new Map<string, number>();
+  private readonly postings: number[][] = [];
+  private readonly grams: Uint32Array[] = [];
+
+  constructor(names: string[]) {
+    names.forEach((name, row) => {
+      const ids = trigrams(name).map((gram) => this.id(gram));
+      for (const id of ids) this.postings[id].push(row);
+      this.grams.push(Uint32Array.from(ids).sort());
+    });
+  }
+
+  private id(gram: string): number {
+    let id = this.ids.get(gram);
+    if (id === undefined) {
+      id = this.postings.length;
+      this.ids.set(gram, id);
+      this.postings.push([]);
+    }
+    return id;
+  }
+
+  search(name: string, options: Required<MatchOptions>, available: Uint8Array, counts: Uint32Array): Array<[number, number]> {
+    const grams = trigrams(name);
+    const known = grams
+      .map((gram) => this.ids.get(gram))
+      .filter((id): id is number => id !== undefined)
+      .sort((a, b) => this.postings[a].length - this.postings[b].length);
+    if (known.length === 0) return [];
+
+    // Count how many of the rarest trigrams each row shares with the query.
+    const touched: number[] = [];
+    let probed = 0;
+    for (const id of known) {
+      if (probed >= options.probeTrigrams) break;
+      const rows = this.postings[id];
+      if (rows.length > options.maxPostings) break;
+      probed++;
+      for (const row of rows) {
+        if (!available[row]) continue;
+        if (counts[row] === 0) touched.push(row);
+        counts[row]++;
+      }
+    }
+
+    touched.sort((a, b) => counts[b] - counts[a]);
+    const query = Uint32Array.from(known).sort();
+    const scored: Array<[number, number]> = [];
+    for (const row of touched.slice(0, options.candidates)) {
+      const score = dice(query, grams.length, this.grams[row]);
+      if (score >= options.minConfidence) scored.push([row, score]);
+    }
+    for (const row of touched) counts[row] = 0;
+    return scored;
+  }
+}
+
+// Dice coefficient over sorted trigram ids; querySize includes trigrams the index has never seen.
+function dice(query: Uint32Array, querySize: number, row: Uint32Array): number {
+  let shared = 0;
+  let i = 0;
+  let j = 0;
+  while (i < query.length && j < row.length) {
+    if (query[i] === row[j]) {
+      shared++;
+      i++;
+      j++;
+    } else if (query[i] < row[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return (2 * shared) / (querySize + row.length);
+}
+
+export function matchProducts<S extends MatchableProduct, B extends MatchableProduct>(
+  shopeeData: S[],
+  bigsellerData: B[],
+  options: MatchOptions = {}
+): ProductMatchResult<S, B> {
+  const settings = { ...DEFAULTS, ...options };
+  const matched: ProductMatch<S, B>[] = [];
+  const shopeeDone = new Uint8Array(shopeeData.length);
+  const available = new Uint8Array(bigsellerData.length).fill(1);
+
+  const bigsellerNames = bigsellerData.map((item) => normalizeName(item.productName));
+  const pair = (s: number, b: number, confidence: number, matchedBy: MatchMethod) => {
+    shopeeDone[s] = 1;
+    available[b] = 0;
+    matched.push({ shopeeData: shopeeData[s], bigsellerData: bigsellerData[b], confidence, matchedBy });
+  };
+
+  // Exact passes: first unused BigSeller row with the same normalized key wins.
+  const exactPass = (key: (item: MatchableProduct, name: string) => string, confidence: number, matchedBy: MatchMethod) => {
+    const rows = new Map<string, number[]>();
+    bigsellerData.forEach((item, b) => {
+      const value = key(item, bigsellerNames[b]);
+      if (!value || !available[b]) return;
+      const list = rows.get(value);
+      if (list) list.push(b);
+      else rows.set(value, [b]);
+    });
+    shopeeData.forEach((item, s) => {
+      if (shopeeDone[s]) return;
+      const list = rows.get(key(item, normalizeName(item.productName)));
+      const b = list?.find((row) => available[row]);
+      if (b !== undefined) pair(s, b, confidence, matchedBy);
+    });
+  };
+  exactPass((item) => normalizeSku(item.productSku), SKU_CONFIDENCE, 'sku');
+  exactPass((_, name) => name, NAME_CONFIDENCE, 'name');
+
+  // Fuzzy pass: gather scored candidates for every remaining row, then assign
+  // one-to-one from the most confident pair down.
+  const index = new TrigramIndex(bigsellerNames);
+  const counts = new Uint32Array(bigsellerData.length);
+  const candidates: Array<[number, number, number]> = [];
+  shopeeData.forEach((item, s) => {
+    if (shopeeDone[s]) return;
+    const name = normalizeName(item.productName);
+    if (!name) return;
+    for (const [b, score] of index.search(name, settings, available, counts)) candidates.push([score, s, b]);
+  });
+  candidates.sort((a, b) => b[0] - a[0]);
+  for (const [score, s, b] of candidates) {
+    if (!shopeeDone[s] && available[b]) pair(s, b, Math.round(score * 1000) / 1000, 'fuzzy');
+  }
+
+  return {
+    matched,
+    unmatchedShopee: shopeeData.filter((_, s) => !shopeeDone[s]),
+    unmatchedBigSeller: bigsellerData.filter((_, b) => available[b]),
+  };
+}
@@ -0,0 +1,253 @@
+import { randomUUID } from 'crypto';
+import { createReadStream, createWriteStream } from 'fs';
+import { appendFile, mkdir, readFile, readdir, rename, rm, stat, writeFile } from 'fs/promises';
+import { once } from 'events';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { createInterface } from 'readline';
+import { type BigSellerData, type ShopeeAdsData, BIGSELLER_COLUMNS, SHOPEE_ADS_COLUMNS } from './csv-parser';
+import { type ColumnSpec, type RowError, CSVHeaderError, fileSource, ingestCSV } from './csv-stream';
+
+// Server-side staging for CSV uploads. The browser sends the raw file in chunks under an
+// upload ID, the server parses it once into newline-delimited JSON next to it, and only
+// a preview page and summary stats go back over the wire. matchAndImport then reads the
+// parsed rows by ID instead of receiving both arrays from the browser.
+
+export type UploadKind = 'shopee_ads' | 'bigseller';
+export type UploadState = 'receiving' | 'parsed';
+
+export interface UploadSummary {
+  rowCount: number;
+  validRows: number;
+  errorCount: number;
+  errors: RowError[];
+  // Sum of every numeric column, e.g. gmv and adSpend.
+  totals: Record<string, number>;
+}
+
+export interface UploadMeta {
+  uploadId: string;
+  kind: UploadKind;
+  fileName: string;
+  fileSize: number;
+  received: number;
+  state: UploadState;
+  createdAt: string;
+  summary?: UploadSummary;
+}
+
+export interface UploadPage<T> {
+  rows: T[];
+  offset: number;
+  total: number;
+}
+
+type RowsOf<K extends UploadKind> = K extends 'shopee_ads' ? ShopeeAdsData : BigSellerData;
+
+// code is the tRPC error code the router reports it as.
+export class UploadError extends Error {
+  readonly code: 'NOT_FOUND' | 'BAD_REQUEST' | 'CONFLICT';
+
+  constructor(code: UploadError['code'], message: string) {
+    super(message);
+    this.code = code;
+  }
+}
+
+export const CHUNK_BYTES = 2 * 1024 * 1024;
+export const MAX_CHUNK_BYTES = 8 * 1024 * 1024;
+export const MAX_FILE_BYTES = 1024 * 1024 * 1024;
+export const PREVIEW_ROWS = 50;
+export const MAX_REPORTED_ERRORS = 20;
+export const UPLOAD_TTL_MS = 24 * 60 * 60 * 1000;
+
+const COLUMNS: Record<UploadKind, ColumnSpec<any>[]> = {
+  shopee_ads: SHOPEE_ADS_COLUMNS,
+  bigseller: BIGSELLER_COLUMNS,
+};
+const UPLOAD_ID = /^[0-9a-f-]{36}$/;
+
+export class UploadStore {
+  // Chunks and parses for one upload run one after another, even if requests overlap.
+  private readonly locks = new Map<string, Promise<unknown>>();
+
+  readonly dir: string;
+
+  constructor(dir: string) {
+    this.dir = dir;
+  }
+
+  private path(uploadId: string, extension: 'json' | 'csv' | 'ndjson'): string {
+    if (!UPLOAD_ID.test(uploadId)) throw new UploadError('BAD_REQUEST', `invalid upload id ${uploadId}`);
+    return join(this.dir, `${uploadId}.${extension}`);
+  }
+
+  private serialized<T>(uploadId: string, task: () => Promise<T>): Promise<T> {
+    const previous = this.locks.get(uploadId) ?? Promise.resolve();
+    const next = previous.then(task, task);
+    const settled = next.catch(() => undefined);
+    this.locks.set(uploadId, settled);
+    settled.then(() => {
+      if (this.locks.get(uploadId) === settled) this.locks.delete(uploadId);
+    });
+    return next;
+  }
+
+  private async save(meta: UploadMeta): Promise<void> {
+    const file = this.path(meta.uploadId, 'json');
+    await writeFile(`${file}.tmp`, JSON.stringify(meta));
+    await rename(`${file}.tmp`, file);
+  }
+
+  async meta(uploadId: string): Promise<UploadMeta> {
+    try {
+      return JSON.parse(await readFile(this.path(uploadId, 'json'), 'utf8')) as UploadMeta;
+    } catch (e) {
+      if ((e as NodeJS.ErrnoException).code === 'ENOENT') throw new UploadError('NOT_FOUND', `upload ${uploadId} not found or expired`);
+      throw e;
+    }
+  }
+
+  async begin(kind: UploadKind, fileName: string, fileSize: number): Promise<UploadMeta> {
+    if (fileSize > MAX_FILE_BYTES) throw new UploadError('BAD_REQUEST', `file is larger than ${MAX_FILE_BYTES} bytes`);
+    await mkdir(this.dir, { recursive: true });
+    await this.sweep();
+    const meta: UploadMeta = {
+      uploadId: randomUUID(),
+      kind,
+      fileName,
+      fileSize,
+      received: 0,
+      state: 'receiving',
+      createdAt: new Date().toISOString(),
+    };
+    await writeFile(this.path(meta.uploadId, 'csv'), '');
+    await this.save(meta);
+    return meta;
+  }
+
+  // Appends bytes at `offset`. A chunk that was already stored (a retry after a lost
+  // response) is acknowledged without writing; a gap is refused with the offset to resume from.
+  append(uploadId: string, offset: number, data: Buffer): Promise<UploadMeta> {
+    return this.serialized(uploadId, async () => {
+      const meta = await this.meta(uploadId);
+      if (meta.state !== 'receiving') throw new UploadError('CONFLICT', `upload ${uploadId} is already complete`);
+      if (data.length > MAX_CHUNK_BYTES) throw new UploadError('BAD_REQUEST', `chunk is larger than ${MAX_CHUNK_BYTES} bytes`);
+      if (offset > meta.received) {
+        throw new UploadError('CONFLICT', `expected offset ${meta.received}, got ${offset}; resume from ${meta.received}`);
+      }
+      const fresh = data.subarray(meta.received - offset);
+      if (meta.received + fresh.length > meta.fileSize) {
+        throw new UploadError('BAD_REQUEST', `chunk runs past the declared size of ${meta.fileSize} bytes`);
+      }
+      if (fresh.length > 0) {
+        await appendFile(this.path(uploadId, 'csv'), fresh);
+        meta.received += fresh.length;
+        await this.save(meta);
+      }
+      return meta;
+    });
+  }
+
+  // Parses the staged file once. Calling it again returns the stored summary.
+  complete(uploadId: string): Promise<UploadMeta> {
+    return this.serialized(uploadId, async () => {
+      const meta = await this.meta(uploadId);
+      if (meta.state === 'parsed') return meta;
+      if (meta.received !== meta.fileSize) {
+        throw new UploadError('CONFLICT', `received ${meta.received} of ${meta.fileSize} bytes; resume from ${meta.received}`);
+      }
+
+      const raw = this.path(uploadId, 'csv');
+      const parsed = this.path(uploadId, 'ndjson');
+      const out = createWriteStream(`${parsed}.tmp`);
+      const errors: RowError[] = [];
+      const totals: Record<string, number> = {};
+      const numeric = COLUMNS[meta.kind].filter((column) => column.type !== 'string').map((column) => column.field);
+      for (const field of numeric) totals[field] = 0;
+      let rowCount = 0;
+      let validRows = 0;
+      let errorCount = 0;
+
+      try {
+        for await (const chunk of ingestCSV(fileSource(raw), COLUMNS[meta.kind], { maxErrors: MAX_REPORTED_ERRORS })) {
+          let lines = '';
+          for (const row of chunk.rows) {
+            lines += JSON.stringify(row) + '\n';
+            for (const field of numeric) totals[field] += row[field];
+          }
+          if (!out.write(lines)) await once(out, 'drain');
+          errors.push(...chunk.errors);
+          validRows += chunk.rows.length;
+          rowCount = chunk.rowsRead;
+          errorCount = chunk.errorCount;
+        }
+      } catch (e) {
+        out.destroy();
+        await rm(`${parsed}.tmp`, { force: true });
+        if (e instanceof CSVHeaderError) throw new UploadError('BAD_REQUEST', e.message);
+        throw e;
+      }
+      out.end();
+      await once(out, 'finish');
+      await rename(`${parsed}.tmp`, parsed);
+      await rm(raw, { force: true });
+
+      meta.state = 'parsed';
+      meta.summary = { rowCount, validRows, errorCount, errors, totals };
+      await this.save(meta);
+      return meta;
+    });
+  }
+
+  private async *parsedRows<T>(uploadId: string): AsyncGenerator<T> {
+    const meta = await this.meta(uploadId);
+    if (meta.state !== 'parsed') throw new UploadError('CONFLICT', `upload ${uploadId} has not been completed`);
+    const input = createReadStream(this.path(uploadId, 'ndjson'));
+    const lines = createInterface({ input, crlfDelay: Infinity });
+    try {
+      for await (const line of lines) {
+        if (line) yield JSON.parse(line) as T;
+      }
+    } finally {
+      lines.close();
+      input.destroy();
+    }
+  }
+
+  async page<T = unknown>(uploadId: string, offset = 0, limit = PREVIEW_ROWS): Promise<UploadPage<T>> {
+    const meta = await this.meta(uploadId);
+    const rows: T[] = [];
+    let index = 0;
+    for await (const row of this.parsedRows<T>(uploadId)) {
+      if (index++ < offset) continue;
+      rows.push(row);
+      if (rows.length >= limit) break;
+    }
+    return { rows, offset, total: meta.summary?.validRows ?? 0 };
+  }
+
+  async rows<K extends UploadKind>(uploadId: string, kind: K): Promise<RowsOf<K>[]> {
+    const meta = await this.meta(uploadId);
+    if (meta.kind !== kind) throw new UploadError('BAD_REQUEST', `upload ${uploadId} is a ${meta.kind} export, not ${kind}`);
+    const rows: RowsOf<K>[] = [];
+    for await (const row of this.parsedRows<RowsOf<K>>(uploadId)) rows.push(row);
+    return rows;
+  }
+
+  async remove(uploadId: string): Promise<void> {
+    await Promise.all((['json', 'csv', 'ndjson'] as const).map((extension) => rm(this.path(uploadId, extension), { force: true })));
+  }
+
+  // Drops uploads that were abandoned or never imported.
+  async sweep(now = Date.now()): Promise<void> {
+    for (const name of await readdir(this.dir)) {
+      const uploadId = name.split('.')[0];
+      if (!UPLOAD_ID.test(uploadId) || !name.endsWith('.json')) continue;
+      const info = await stat(join(this.dir, name)).catch(() => null);
+      if (info && now - info.mtimeMs > UPLOAD_TTL_MS) await this.remove(uploadId);
+    }
+  }
+}
+
+export const uploadStore = new UploadStore(process.env.UPLOAD_DIR ?? join(tmpdir(), 'gmv-uploads'));
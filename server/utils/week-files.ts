@@ -0,0 +1,240 @@
+import { open, readdir, stat } from 'fs/promises';
+import { basename, extname, join } from 'path';
+import { BIGSELLER_COLUMNS, SHOPEE_ADS_COLUMNS } from './csv-parser';
+import { type CSVRecord, type ColumnSpec, CSVTokenizer, normalizeHeader, resolveColumns } from './csv-stream';
+
+// Finds paired Shopee Ads / BigSeller exports in a directory and works out which ISO
+// week each pair covers, from the file name or, failing that, a date column.
+
+export type ExportKind = 'shopee_ads' | 'bigseller';
+
+export interface ExportFile {
+  path: string;
+  fileName: string;
+  fileSize: number;
+  modifiedMs: number;
+  kind: ExportKind;
+}
+
+export interface WeekKey {
+  weekNumber: number;
+  year: number;
+}
+
+export interface WeekPair extends WeekKey {
+  key: string;
+  shopee: ExportFile;
+  bigseller: ExportFile;
+}
+
+export interface DiscoveryResult {
+  pairs: WeekPair[];
+  // Files that could not be classified, dated or paired, with the reason.
+  skipped: Array<{ fileName: string; reason: string }>;
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const SNIFF_BYTES = 256 * 1024;
+const SNIFF_ROWS = 2000;
+const DATE_ALIASES = ['date', 'day', 'order date', 'create time', 'created at', 'time', 'วันที่', 'วันที่สั่งซื้อ', 'วันที่สร้าง'];
+
+// Thai exports often use Buddhist-era years (2567 = 2024).
+const YEAR = '(20\\d{2}|25\\d{2})';
+const WEEK_PATTERNS: Array<[RegExp, 'year-week' | 'week-year']> = [
+  [new RegExp(`${YEAR}[-_ .]?w(?:ee)?k?[-_ .]?(\\d{1,2})(?!\\d)`, 'i'), 'year-week'],
+  [new RegExp(`(?<![a-z])w(?:ee)?k?[-_ .]?(\\d{1,2})[-_ .]+${YEAR}`, 'i'), 'week-year'],
+  [new RegExp(`(?:สัปดาห์|week)[-_ .]?(\\d{1,2})[-_ .]+${YEAR}`, 'i'), 'week-year'],
+];
+const ISO_DATE = /(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})/;
+const DMY_DATE = /(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})/;
+const COMPACT_DATE = new RegExp(`${YEAR}(\\d{2})(\\d{2})`);
+
+function headerNames(columns: ColumnSpec<any>[]): Set<string> {
+  return new Set(columns.flatMap((column) => [column.field, ...column.aliases]).map(normalizeHeader));
+}
+
+// Header names only one of the two exports uses. Shared aliases such as 'cost' (Ads spend,
+// BigSeller product cost), 'sales' or 'name' say nothing about which export a file is.
+function distinctive(columns: ColumnSpec<any>[], other: ColumnSpec<any>[], extra: string[] = []): Set<string> {
+  const shared = headerNames(other);
+  return new Set([...headerNames(columns), ...extra.map(normalizeHeader)].filter((name) => !shared.has(name)));
+}
+
+const ADS_ONLY = distinctive(SHOPEE_ADS_COLUMNS, BIGSELLER_COLUMNS, ['roas', 'ctr', 'cpc']);
+const BIGSELLER_ONLY = distinctive(BIGSELLER_COLUMNS, SHOPEE_ADS_COLUMNS);
+
+function gregorian(year: number): number {
+  return year > 2400 ? year - 543 : year;
+}
+
+export function weekKey(week: WeekKey): string {
+  return `${week.year}-W${String(week.weekNumber).padStart(2, '0')}`;
+}
+
+export function isoWeek(date: Date): WeekKey {
+  const day = new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate()));
+  // The Thursday of the same week decides which year the week belongs to.
+  day.setUTCDate(day.getUTCDate() + 3 - ((day.getUTCDay() + 6) % 7));
+  const firstThursday = new Date(Date.UTC(day.getUTCFullYear(), 0, 4));
+  firstThursday.setUTCDate(firstThursday.getUTCDate() + 3 - ((firstThursday.getUTCDay() + 6) % 7));
+  return {
+    weekNumber: 1 + Math.round((day.getTime() - firstThursday.getTime()) / (7 * DAY_MS)),
+    year: day.getUTCFullYear(),
+  };
+}
+
+// Monday 00:00 to Sunday 23:59:59.999 UTC of an ISO week.
+export function weekRange(week: WeekKey): { startDate: Date; endDate: Date } {
+  const jan4 = new Date(Date.UTC(week.year, 0, 4));
+  const start = jan4.getTime() - ((jan4.getUTCDay() + 6) % 7) * DAY_MS + (week.weekNumber - 1) * 7 * DAY_MS;
+  return { startDate: new Date(start), endDate: new Date(start + 7 * DAY_MS - 1) };
+}
+
+export function parseDate(value: string): Date | null {
+  let year: number;
+  let month: number;
+  let day: number;
+  let match = ISO_DATE.exec(value);
+  if (match) {
+    [year, month, day] = [Number(match[1]), Number(match[2]), Number(match[3])];
+  } else if ((match = DMY_DATE.exec(value))) {
+    // BigSeller and Shopee TH write dates day first.
+    [day, month, year] = [Number(match[1]), Number(match[2]), Number(match[3])];
+  } else if ((match = COMPACT_DATE.exec(value))) {
+    [year, month, day] = [Number(match[1]), Number(match[2]), Number(match[3])];
+  } else {
+    return null;
+  }
+  year = gregorian(year);
+  if (month < 1 || month > 12 || day < 1 || day > 31) return null;
+  const date = new Date(Date.UTC(year, month - 1, day));
+  return date.getUTCDate() === day ? date : null;
+}
+
+export function weekFromFileName(fileName: string): WeekKey | null {
+  const name = basename(fileName, extname(fileName));
+  for (const [pattern, order] of WEEK_PATTERNS) {
+    const match = pattern.exec(name);
+    if (!match) continue;
+    const [year, weekNumber] = order === 'year-week' ? [match[1], match[2]] : [match[2], match[1]];
+    const week = { weekNumber: Number(weekNumber), year: gregorian(Number(year)) };
+    if (week.weekNumber >= 1 && week.weekNumber <= 53) return week;
+  }
+  const date = parseDate(name);
+  return date ? isoWeek(date) : null;
+}
+
+// Header plus the first rows of a file, without reading the whole export.
+async function sniff(path: string): Promise<CSVRecord[]> {
+  const handle = await open(path, 'r');
+  try {
+    const buffer = Buffer.alloc(SNIFF_BYTES);
+    const { bytesRead } = await handle.read(buffer, 0, SNIFF_BYTES, 0);
+    const text = new TextDecoder('utf-8').decode(buffer.subarray(0, bytesRead), { stream: true });
+    const records: CSVRecord[] = [];
+    // end() is never called, so a row cut off by the read limit is not emitted.
+    new CSVTokenizer().push(text.replace(/^\uFEFF/, ''), records);
+    return records.slice(0, SNIFF_ROWS + 1);
+  } finally {
+    await handle.close();
+  }
+}
+
+function resolves(header: string[], columns: Parameters<typeof resolveColumns>[1]): boolean {
+  try {
+    resolveColumns(header, columns);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+// 'ambiguous' when the header fits both exports and nothing in it or the name tells them apart.
+function classify(fileName: string, header: string[]): ExportKind | 'ambiguous' | null {
+  // BigSeller first: its exports are often named after the Shopee shop they came from.
+  if (/big[-_ ]?seller/i.test(fileName)) return 'bigseller';
+  if (/(?<![a-z])ads?(?![a-z])|โฆษณา/i.test(fileName)) return 'shopee_ads';
+
+  const names = header.map(normalizeHeader);
+  const ads = resolves(header, SHOPEE_ADS_COLUMNS);
+  const bigseller = resolves(header, BIGSELLER_COLUMNS);
+  const adsColumns = ads && names.some((name) => ADS_ONLY.has(name));
+  const bigsellerColumns = bigseller && names.some((name) => BIGSELLER_ONLY.has(name));
+  if (adsColumns !== bigsellerColumns) return adsColumns ? 'shopee_ads' : 'bigseller';
+  if (adsColumns) return 'ambiguous';
+
+  // Nothing distinctive in the header: fall back to weaker hints in the name.
+  if (/shopee/i.test(fileName) && ads) return 'shopee_ads';
+  if (/(?<![a-z])orders?(?![a-z])|คำสั่งซื้อ/i.test(fileName) && bigseller) return 'bigseller';
+  if (ads && bigseller) return 'ambiguous';
+  return ads ? 'shopee_ads' : bigseller ? 'bigseller' : null;
+}
+
+// Most common ISO week among the dates in the first rows.
+export function weekFromRecords(records: CSVRecord[]): WeekKey | null {
+  if (records.length < 2) return null;
+  const aliases = new Set(DATE_ALIASES.map(normalizeHeader));
+  const column = records[0].fields.findIndex((name) => aliases.has(normalizeHeader(name)));
+  if (column === -1) return null;
+
+  const counts = new Map<string, { week: WeekKey; count: number }>();
+  for (const record of records.slice(1)) {
+    const date = parseDate(record.fields[column] ?? '');
+    if (!date) continue;
+    const week = isoWeek(date);
+    const entry = counts.get(weekKey(week)) ?? { week, count: 0 };
+    entry.count++;
+    counts.set(weekKey(week), entry);
+  }
+  let best: { week: WeekKey; count: number } | null = null;
+  for (const entry of counts.values()) {
+    if (!best || entry.count > best.count) best = entry;
+  }
+  return best?.week ?? null;
+}
+
+export async function discoverWeeks(dir: string): Promise<DiscoveryResult> {
+  const skipped: DiscoveryResult['skipped'] = [];
+  const byWeek = new Map<string, { week: WeekKey; files: ExportFile[] }>();
+
+  const names = (await readdir(dir)).filter((name) => extname(name).toLowerCase() === '.csv').sort();
+  for (const fileName of names) {
+    const path = join(dir, fileName);
+    const records = await sniff(path);
+    const kind = classify(fileName, records[0]?.fields ?? []);
+    if (!kind) {
+      skipped.push({ fileName, reason: 'not a Shopee Ads or BigSeller export' });
+      continue;
+    }
+    if (kind === 'ambiguous') {
+      skipped.push({ fileName, reason: "could be a Shopee Ads or a BigSeller export; put 'ads' or 'bigseller' in the file name" });
+      continue;
+    }
+    const week = weekFromFileName(fileName) ?? weekFromRecords(records);
+    if (!week) {
+      skipped.push({ fileName, reason: 'no week in the file name and no date column' });
+      continue;
+    }
+    const info = await stat(path);
+    const key = weekKey(week);
+    const entry = byWeek.get(key) ?? { week, files: [] };
+    entry.files.push({ path, fileName, fileSize: info.size, modifiedMs: info.mtimeMs, kind });
+    byWeek.set(key, entry);
+  }
+
+  const pairs: WeekPair[] = [];
+  for (const [key, { week, files }] of [...byWeek].sort(([a], [b]) => a.localeCompare(b))) {
+    const shopee = files.filter((file) => file.kind === 'shopee_ads');
+    const bigseller = files.filter((file) => file.kind === 'bigseller');
+    if (shopee.length === 1 && bigseller.length === 1) {
+      pairs.push({ key, ...week, shopee: shopee[0], bigseller: bigseller[0] });
+      continue;
+    }
+    const reason =
+      shopee.length === 0 || bigseller.length === 0
+        ? `${key} has no ${shopee.length === 0 ? 'Shopee Ads' : 'BigSeller'} export to pair with`
+        : `${key} has ${shopee.length} Shopee Ads and ${bigseller.length} BigSeller exports`;
+    for (const file of files) skipped.push({ fileName: file.fileName, reason });
+  }
+  return { pairs, skipped };
+}
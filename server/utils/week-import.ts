@@ -0,0 +1,183 @@
+import { type BigSellerData, type ShopeeAdsData, BIGSELLER_COLUMNS, SHOPEE_ADS_COLUMNS, matchProductData } from './csv-parser';
+import { type ValidationResults, collectCSV, fileSource } from './csv-stream';
+import { type MetricName, calculateMetricsBatch, metricsAt } from './metrics-batch';
+import { type ExportFile, type WeekKey, type WeekPair, weekKey, weekRange } from './week-files';
+
+// Match and compute metrics for one week of parsed exports. The result is plain JSON,
+// so it can cross the backfill worker IPC channel as it is.
+
+export interface FeeRates {
+  commissionRate: number;
+  transactionRate: number;
+  paymentRate: number;
+}
+
+export interface FileStats {
+  fileName: string;
+  fileType: ExportFile['kind'];
+  fileSize: number;
+  rowsRead: number;
+  validRows: number;
+  errorCount: number;
+  firstError?: string;
+}
+
+export interface WeekTotals {
+  gmv: number;
+  orders: number;
+  units: number;
+  costs: number;
+  adSpend: number;
+  impressions: number;
+  clicks: number;
+  affiliateCommission: number;
+  shopeeCommission: number;
+  transactionFee: number;
+  paymentGatewayFee: number;
+  productsAdvertised: number;
+}
+
+export interface ProductResult {
+  rank: number;
+  productName: string;
+  productSku: string;
+  gmv: number;
+  orders: number;
+  units: number;
+  adSpend: number;
+  roas: number;
+  netProfit: number;
+  profitMargin: number;
+  confidence: number;
+}
+
+export interface WeekSummary {
+  key: string;
+  weekNumber: number;
+  year: number;
+  startDate: string;
+  endDate: string;
+  totals: WeekTotals;
+  metrics: Record<MetricName, number>;
+  topProducts: ProductResult[];
+  files: FileStats[];
+  matched: number;
+  unmatchedShopee: number;
+  unmatchedBigSeller: number;
+}
+
+export interface WeekInput extends WeekKey {
+  startDate?: Date;
+  endDate?: Date;
+}
+
+export const TOP_PRODUCTS = 10;
+// Fee rates used when none are given; pass the shop's own rates instead where known.
+export const DEFAULT_RATES: FeeRates = { commissionRate: 0.05, transactionRate: 0.02, paymentRate: 0.02 };
+
+export function fileStats(
+  file: { fileName: string; fileSize: number; kind: ExportFile['kind'] },
+  validation: ValidationResults
+): FileStats {
+  const first = validation.errors[0];
+  return {
+    fileName: file.fileName,
+    fileType: file.kind,
+    fileSize: file.fileSize,
+    rowsRead: validation.rowCount,
+    validRows: validation.validRows,
+    errorCount: validation.errorCount,
+    firstError: first ? `line ${first.line}: ${first.message}` : undefined,
+  };
+}
+
+function sum<T>(rows: T[], field: (row: T) => number): number {
+  let total = 0;
+  for (const row of rows) total += field(row);
+  return total;
+}
+
+export async function importWeek(pair: WeekPair, rates: FeeRates): Promise<WeekSummary> {
+  const [shopee, bigseller] = await Promise.all([
+    collectCSV(fileSource(pair.shopee.path), SHOPEE_ADS_COLUMNS),
+    collectCSV(fileSource(pair.bigseller.path), BIGSELLER_COLUMNS),
+  ]);
+  return summarizeWeek(pair, shopee.data, bigseller.data, rates, [
+    fileStats(pair.shopee, shopee.validationResults),
+    fileStats(pair.bigseller, bigseller.validationResults),
+  ]);
+}
+
+export function summarizeWeek(
+  week: WeekInput,
+  shopeeData: ShopeeAdsData[],
+  bigsellerData: BigSellerData[],
+  rates: FeeRates,
+  files: FileStats[]
+): WeekSummary {
+  const { matched, unmatchedShopee, unmatchedBigSeller } = matchProductData(shopeeData, bigsellerData);
+
+  // Sales and costs come from BigSeller (every order), ad figures from Shopee Ads.
+  const gmv = sum(bigsellerData, (row) => row.gmv);
+  const adSpend = sum(shopeeData, (row) => row.adSpend);
+  const totals: WeekTotals = {
+    gmv,
+    orders: sum(bigsellerData, (row) => row.orders),
+    units: sum(bigsellerData, (row) => row.units),
+    costs: sum(bigsellerData, (row) => row.productCost),
+    adSpend,
+    impressions: sum(shopeeData, (row) => row.impressions),
+    clicks: sum(shopeeData, (row) => row.clicks),
+    affiliateCommission: sum(shopeeData, (row) => row.affiliateCommission),
+    shopeeCommission: gmv * rates.commissionRate,
+    transactionFee: gmv * rates.transactionRate,
+    paymentGatewayFee: gmv * rates.paymentRate,
+    productsAdvertised: shopeeData.length,
+  };
+  const weekMetrics = calculateMetricsBatch({ ...totals, ...rates });
+
+  // Per-product metrics for every matched product in one batch; only the top ones are kept.
+  const products = calculateMetricsBatch({
+    gmv: Float64Array.from(matched, (match) => match.bigsellerData.gmv),
+    orders: Float64Array.from(matched, (match) => match.bigsellerData.orders),
+    costs: Float64Array.from(matched, (match) => match.bigsellerData.productCost),
+    adSpend: Float64Array.from(matched, (match) => match.shopeeData.adSpend),
+    clicks: Float64Array.from(matched, (match) => match.shopeeData.clicks),
+    impressions: Float64Array.from(matched, (match) => match.shopeeData.impressions),
+    ...rates,
+  });
+  const top = matched
+    .map((match, index) => ({ match, index }))
+    .sort((a, b) => b.match.bigsellerData.gmv - a.match.bigsellerData.gmv)
+    .slice(0, TOP_PRODUCTS);
+
+  const range = weekRange(week);
+  const startDate = week.startDate ?? range.startDate;
+  const endDate = week.endDate ?? range.endDate;
+  return {
+    key: weekKey(week),
+    weekNumber: week.weekNumber,
+    year: week.year,
+    startDate: startDate.toISOString(),
+    endDate: endDate.toISOString(),
+    totals,
+    metrics: metricsAt(weekMetrics, 0),
+    topProducts: top.map(({ match, index }, rank) => ({
+      rank: rank + 1,
+      productName: match.bigsellerData.productName,
+      productSku: match.bigsellerData.productSku || match.shopeeData.productSku,
+      gmv: match.bigsellerData.gmv,
+      orders: match.bigsellerData.orders,
+      units: match.bigsellerData.units,
+      adSpend: match.shopeeData.adSpend,
+      roas: products.roas[index],
+      netProfit: products.netProfit[index],
+      profitMargin: products.profitMargin[index],
+      confidence: match.confidence,
+    })),
+    files,
+    matched: matched.length,
+    unmatchedShopee: unmatchedShopee.length,
+    unmatchedBigSeller: unmatchedBigSeller.length,
+  };
+}
@@ -0,0 +1,145 @@
+import { and, eq, inArray } from 'drizzle-orm';
+import { getDb } from '../db';
+import { gmvMaxWeeklyReports, importHistory, topPerformingProducts } from '../db/schema';
+import { weekKey } from './week-files';
+import { type WeekSummary } from './week-import';
+
+// Bulk writes of computed weeks: shared by the backfill command and the import router.
+
+// decimal(5, 2) columns (ROAS, CTR, margins) hold at most 999.99.
+const RATIO_LIMIT = 999.99;
+
+export interface WriteResult {
+  // Report id of every week written, including the ones that already existed.
+  reportIds: Map<string, number>;
+  // Weeks that already had a report and were left as they are.
+  existing: string[];
+  // Weeks that already had a report and were overwritten (see WriteOptions.replace).
+  replaced: string[];
+}
+
+export interface WriteOptions {
+  // Week keys whose existing report is overwritten in place instead of kept, e.g. because
+  // their exports were corrected. The report id stays the same, so recommendations and
+  // sync logs that point at it keep working; its top products are replaced.
+  replace?: Iterable<string>;
+}
+
+function money(value: number): string {
+  return (Number.isFinite(value) ? value : 0).toFixed(2);
+}
+
+function ratio(value: number): string {
+  return money(Math.max(-RATIO_LIMIT, Math.min(RATIO_LIMIT, value)));
+}
+
+function reportRow(summary: WeekSummary, userId: number) {
+  const { totals, metrics } = summary;
+  return {
+    userId,
+    weekNumber: summary.weekNumber,
+    year: summary.year,
+    startDate: new Date(summary.startDate),
+    endDate: new Date(summary.endDate),
+    gmv: money(totals.gmv),
+    orders: totals.orders,
+    aov: money(metrics.aov),
+    adSpend: money(totals.adSpend),
+    impressions: totals.impressions,
+    clicks: totals.clicks,
+    ctr: ratio(metrics.ctr),
+    cpc: money(metrics.cpc),
+    cpa: money(metrics.cpa),
+    shopeeCommission: money(totals.shopeeCommission),
+    transactionFee: money(totals.transactionFee),
+    paymentGatewayFee: money(totals.paymentGatewayFee),
+    shippingFee: money(0),
+    affiliateCommission: money(totals.affiliateCommission),
+    totalCost: money(totals.costs),
+    totalFees: money(metrics.totalFees),
+    vat: money(metrics.vat),
+    netProfit: money(metrics.netProfit),
+    roas: ratio(metrics.roas),
+    realRoas: ratio(metrics.realRoas),
+    targetRoas: ratio(metrics.targetRoas),
+    breakEvenRoas: ratio(metrics.breakEvenRoas),
+    productsAdvertised: totals.productsAdvertised,
+    productViews: totals.clicks,
+    conversionRate: ratio(metrics.conversionRate),
+    notes: `${summary.matched} matched, ${summary.unmatchedShopee} Shopee Ads and ${summary.unmatchedBigSeller} BigSeller products unmatched`,
+  };
+}
+
+// One transaction per call: a multi-row insert for the reports, then one each for their
+// top products and import history. Weeks that already have a report (e.g. from a backfill
+// that died before saving its manifest) are left as they are and listed in `existing`,
+// unless they are listed in options.replace.
+export async function writeWeeks(summaries: WeekSummary[], userId: number, options: WriteOptions = {}): Promise<WriteResult> {
+  const db = getDb();
+  const replace = new Set(options.replace ?? []);
+
+  return db.transaction(async (tx) => {
+    const findReports = () =>
+      tx
+        .select({ id: gmvMaxWeeklyReports.id, weekNumber: gmvMaxWeeklyReports.weekNumber, year: gmvMaxWeeklyReports.year })
+        .from(gmvMaxWeeklyReports)
+        .where(
+          and(
+            eq(gmvMaxWeeklyReports.userId, userId),
+            inArray(gmvMaxWeeklyReports.year, [...new Set(summaries.map((summary) => summary.year))]),
+            inArray(gmvMaxWeeklyReports.weekNumber, [...new Set(summaries.map((summary) => summary.weekNumber))])
+          )
+        );
+
+    const found = new Map((await findReports()).map((row): [string, number] => [weekKey(row), row.id]));
+    const fresh = summaries.filter((summary) => !found.has(summary.key));
+    const replaced = summaries.filter((summary) => found.has(summary.key) && replace.has(summary.key));
+    const existing = summaries.filter((summary) => found.has(summary.key) && !replace.has(summary.key)).map((summary) => summary.key);
+    if (fresh.length > 0) {
+      await tx.insert(gmvMaxWeeklyReports).values(fresh.map((summary) => reportRow(summary, userId)));
+    }
+    for (const summary of replaced) {
+      await tx.update(gmvMaxWeeklyReports).set(reportRow(summary, userId)).where(eq(gmvMaxWeeklyReports.id, found.get(summary.key)!));
+    }
+    if (replaced.length > 0) {
+      const replacedIds = replaced.map((summary) => found.get(summary.key)!);
+      await tx.delete(topPerformingProducts).where(inArray(topPerformingProducts.reportId, replacedIds));
+    }
+
+    const written = [...fresh, ...replaced];
+    const ids = new Map((await findReports()).map((row): [string, number] => [weekKey(row), row.id]));
+    const products = written.flatMap((summary) =>
+      summary.topProducts.map((product) => ({
+        reportId: ids.get(summary.key)!,
+        productName: product.productName.slice(0, 255),
+        productSku: product.productSku.slice(0, 100),
+        productCategory: '',
+        gmv: money(product.gmv),
+        orders: product.orders,
+        units: product.units,
+        adSpend: money(product.adSpend),
+        roas: ratio(product.roas),
+        netProfit: money(product.netProfit),
+        profitMargin: ratio(product.profitMargin),
+        rank: product.rank,
+      }))
+    );
+    if (products.length > 0) await tx.insert(topPerformingProducts).values(products);
+
+    const history = written.flatMap((summary) =>
+      summary.files.map((file) => ({
+        userId,
+        reportId: ids.get(summary.key)!,
+        fileName: file.fileName.slice(0, 255),
+        fileType: file.fileType,
+        fileSize: file.fileSize,
+        status: file.errorCount > 0 ? 'partial' : 'success',
+        recordsImported: file.validRows,
+        recordsFailed: file.rowsRead - file.validRows,
+        errorMessage: file.firstError ?? null,
+      }))
+    );
+    if (history.length > 0) await tx.insert(importHistory).values(history);
+    return { reportIds: ids, existing, replaced: replaced.map((summary) => summary.key) };
+  });
+}
@@ -0,0 +1,71 @@
+// Sends a CSV file to the import router in chunks (beginUpload -> uploadChunk... ->
+// completeUpload). A failed chunk is retried from the offset the server reports, and an
+// upload interrupted by a reload can be resumed by passing its uploadId back in.
+
+export type UploadKind = 'shopee_ads' | 'bigseller';
+
+export interface StagedUploadClient<Result> {
+  beginUpload(input: { kind: UploadKind; fileName: string; fileSize: number }): Promise<{ uploadId: string; chunkSize: number }>;
+  uploadChunk(input: { uploadId: string; offset: number; data: string }): Promise<{ received: number }>;
+  uploadStatus(input: { uploadId: string }): Promise<{ received: number; fileSize: number; state: string }>;
+  completeUpload(input: { uploadId: string }): Promise<Result>;
+}
+
+export interface StagedUploadOptions {
+  uploadId?: string;
+  chunkSize?: number;
+  retries?: number;
+  onStart?: (uploadId: string) => void;
+  onProgress?: (received: number, total: number) => void;
+}
+
+const DEFAULT_CHUNK_SIZE = 2 * 1024 * 1024;
+const RETRY_DELAY_MS = 1000;
+
+function toBase64(bytes: Uint8Array): string {
+  let binary = '';
+  // String.fromCharCode takes its arguments on the stack, so convert in slices.
+  for (let i = 0; i < bytes.length; i += 0x8000) {
+    binary += String.fromCharCode(...bytes.subarray(i, i + 0x8000));
+  }
+  return btoa(binary);
+}
+
+export async function uploadStaged<Result>(
+  file: File,
+  kind: UploadKind,
+  client: StagedUploadClient<Result>,
+  options: StagedUploadOptions = {}
+): Promise<Result> {
+  const retries = options.retries ?? 3;
+  let uploadId = options.uploadId;
+  let chunkSize = options.chunkSize ?? DEFAULT_CHUNK_SIZE;
+  let offset = 0;
+
+  if (uploadId) {
+    const status = await client.uploadStatus({ uploadId });
+    if (status.state !== 'receiving') return client.completeUpload({ uploadId });
+    offset = status.received;
+  } else {
+    const begun = await client.beginUpload({ kind, fileName: file.name, fileSize: file.size });
+    uploadId = begun.uploadId;
+    chunkSize = options.chunkSize ?? begun.chunkSize;
+  }
+  options.onStart?.(uploadId);
+
+  let failures = 0;
+  while (offset < file.size) {
+    const bytes = new Uint8Array(await file.slice(offset, offset + chunkSize).arrayBuffer());
+    try {
+      offset = (await client.uploadChunk({ uploadId, offset, data: toBase64(bytes) })).received;
+      failures = 0;
+      options.onProgress?.(offset, file.size);
+    } catch (error) {
+      if (++failures > retries) throw error;
+      await new Promise((resolve) => setTimeout(resolve, RETRY_DELAY_MS * failures));
+      // The chunk may have been stored before the response was lost.
+      offset = (await client.uploadStatus({ uploadId })).received;
+    }
+  }
+  return client.completeUpload({ uploadId });
+}
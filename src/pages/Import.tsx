@@ -1,8 +1,6 @@
-Here's the TypeScript React component for the Import Page with the requested features:
-
-```tsx
 import { useState } from 'react';
 import { trpc } from '../utils/trpc';
+import { type StagedUploadClient, type UploadKind, uploadStaged } from '../lib/staged-upload';
 import { CSVUploader } from './CSVUploader';
 import { DataPreviewTable } from './DataPreviewTable';
 import { ImportStepper } from './ImportStepper';
@@ -14,37 +12,85 @@ export const ImportPage: React.FC = () => {
   const [shopeeCSV, setShopeeCSV] = useState<File | null>(null);
   const [bigSellerCSV, setBigSellerCSV] = useState<File | null>(null);
   const [selectedWeek, setSelectedWeek] = useState<{ number: number; year: number; dates: [Date, Date] } | null>(null);
-  
-  const uploadShopeeCSV = trpc.import.uploadShopeeCSV.useMutation();
-  const uploadBigSellerCSV = trpc.import.uploadBigSellerCSV.useMutation();
+  // Covers the whole staged upload (begin, every chunk, then the parse), not just completeUpload.
+  const [uploading, setUploading] = useState<UploadKind | null>(null);
+  const [uploadProgress, setUploadProgress] = useState(0);
+  const [uploadError, setUploadError] = useState<string | null>(null);
+
+  const utils = trpc.useContext();
+  const beginUpload = trpc.import.beginUpload.useMutation();
+  const uploadChunk = trpc.import.uploadChunk.useMutation();
+  const uploadShopeeCSV = trpc.import.completeUpload.useMutation();
+  const uploadBigSellerCSV = trpc.import.completeUpload.useMutation();
   const matchAndImport = trpc.import.matchAndImport.useMutation();
 
-  const handleShopeeCSVUpload = async () => {
-    if (shopeeCSV) {
-      await uploadShopeeCSV.mutateAsync({ file: shopeeCSV });
-      setStep(2);
+  // Files go up in chunks and are parsed on the server; only a preview and stats come back.
+  const stagedClient = (complete: typeof uploadShopeeCSV): StagedUploadClient<NonNullable<typeof complete.data>> => ({
+    beginUpload: beginUpload.mutateAsync,
+    uploadChunk: uploadChunk.mutateAsync,
+    uploadStatus: (input) => utils.import.uploadStatus.fetch(input),
+    completeUpload: complete.mutateAsync,
+  });
+
+  const upload = async (file: File, kind: UploadKind, complete: typeof uploadShopeeCSV, next: ImportStep) => {
+    setUploading(kind);
+    setUploadProgress(0);
+    setUploadError(null);
+    try {
+      await uploadStaged(file, kind, stagedClient(complete), {
+        onProgress: (received, total) => setUploadProgress(total > 0 ? received / total : 1),
+      });
+      setStep(next);
+    } catch (error) {
+      setUploadError(error instanceof Error ? error.message : String(error));
+    } finally {
+      setUploading(null);
     }
   };
 
-  const handleBigSellerCSVUpload = async () => {
-    if (bigSellerCSV) {
-      await uploadBigSellerCSV.mutateAsync({ file: bigSellerCSV });
-      setStep(3);
-    }
+  const handleShopeeCSVUpload = () => {
+    if (shopeeCSV) void upload(shopeeCSV, 'shopee_ads', uploadShopeeCSV, 2);
+  };
+
+  const handleBigSellerCSVUpload = () => {
+    if (bigSellerCSV) void upload(bigSellerCSV, 'bigseller', uploadBigSellerCSV, 3);
+  };
+
+  const uploadLabel = (kind: UploadKind) => {
+    if (uploading !== kind) return 'Parse';
+    return uploadProgress < 1 ? `Uploading... ${Math.round(uploadProgress * 100)}%` : 'Parsing...';
   };
 
   const handleMatchAndImport = async () => {
-    if (selectedWeek) {
-      await matchAndImport.mutateAsync({ week: selectedWeek });
-      setStep(4);
+    if (selectedWeek && uploadShopeeCSV.data && uploadBigSellerCSV.data) {
+      try {
+        await matchAndImport.mutateAsync({
+          shopeeUploadId: uploadShopeeCSV.data.uploadId,
+          bigsellerUploadId: uploadBigSellerCSV.data.uploadId,
+          weekNumber: selectedWeek.number,
+          year: selectedWeek.year,
+          startDate: selectedWeek.dates[0],
+          endDate: selectedWeek.dates[1],
+        });
+        setStep(4);
+      } catch {
+        // Shown below through matchAndImport.error.
+      }
     }
   };
 
   const handleStartNewImport = () => {
     setStep(1);
+    setUploadError(null);
     setShopeeCSV(null);
     setBigSellerCSV(null);
     setSelectedWeek(null);
+    // Drop the previous upload's preview, stagedId and result so the next import cannot reuse them.
+    beginUpload.reset();
+    uploadChunk.reset();
+    uploadShopeeCSV.reset();
+    uploadBigSellerCSV.reset();
+    matchAndImport.reset();
   };
 
   return (
@@ -58,12 +104,12 @@ export const ImportPage: React.FC = () => {
           <button
             className="bg-blue-500 text-white px-4 py-2 rounded mt-4"
             onClick={handleShopeeCSVUpload}
-            disabled={!shopeeCSV || uploadShopeeCSV.isLoading}
+            disabled={!shopeeCSV || uploading !== null}
           >
-            {uploadShopeeCSV.isLoading ? 'Parsing...' : 'Parse'}
+            {uploadLabel('shopee_ads')}
           </button>
-          {uploadShopeeCSV.isSuccess && <DataPreviewTable data={uploadShopeeCSV.data} />}
-          {uploadShopeeCSV.isError && <p className="text-red-500">{uploadShopeeCSV.error.message}</p>}
+          {uploadShopeeCSV.isSuccess && <DataPreviewTable data={uploadShopeeCSV.data.preview} />}
+          {uploadError && <p className="text-red-500">{uploadError}</p>}
         </div>
       )}
 
@@ -74,12 +120,12 @@ export const ImportPage: React.FC = () => {
           <button
             className="bg-blue-500 text-white px-4 py-2 rounded mt-4"
             onClick={handleBigSellerCSVUpload}
-            disabled={!bigSellerCSV || uploadBigSellerCSV.isLoading}
+            disabled={!bigSellerCSV || uploading !== null}
           >
-            {uploadBigSellerCSV.isLoading ? 'Parsing...' : 'Parse'}
+            {uploadLabel('bigseller')}
           </button>
-          {uploadBigSellerCSV.isSuccess && <DataPreviewTable data={uploadBigSellerCSV.data} />}
-          {uploadBigSellerCSV.isError && <p className="text-red-500">{uploadBigSellerCSV.error.message}</p>}
+          {uploadBigSellerCSV.isSuccess && <DataPreviewTable data={uploadBigSellerCSV.data.preview} />}
+          {uploadError && <p className="text-red-500">{uploadError}</p>}
         </div>
       )}
 
@@ -128,10 +174,3 @@ const WeekSelector: React.FC<WeekSelectorProps> = ({ onWeekSelect }) => {
   // Implement week selector logic here
   return null;
 };
-```
-
-Note: This component assumes the existence of `CSVUploader`, `DataPreviewTable`, `ImportStepper`, and `WeekSelector` components, which you'll need to implement separately. Also, make sure to replace the `trpc` import with your actual tRPC client instance.
-
-The component handles the different steps of the import process, including uploading Shopee Ads CSV, uploading BigSeller CSV, matching and importing data, and displaying the success summary. It uses the tRPC hooks for the corresponding API endpoints and handles the loading and error states.
-
-The component is styled using Tailwind CSS classes for a clean and responsive layout.
\ No newline at end of file
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+# requests.jsonl ใน repo เป็น backlog ของงาน จึงแยก log ไว้อีกไฟล์
+DEFAULT_LOG_PATH = os.environ.get("GENERATION_LOG", ".generation-log.jsonl")
+DEFAULT_TOP = 10
+
+
+def usage_tokens(message):
+    usage = getattr(message, "usage", None)
+    return {
+        "input_tokens": getattr(usage, "input_tokens", None) or 0,
+        "output_tokens": getattr(usage, "output_tokens", None) or 0,
+        "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+    }
+
+
+class TelemetryLog:
+    def __init__(self, path=DEFAULT_LOG_PATH):
+        self.path = path
+        self.run = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+    def write(self, record):
+        # หนึ่งบรรทัดต่อหนึ่ง write เพื่อให้หลาย process ต่อท้ายไฟล์เดียวกันได้
+        line = json.dumps({"run": self.run, "time": time.time(), **record}, ensure_ascii=False) + "\n"
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def call(self, job, message, mode, latency, first_token=None, retry=0, continuation=0, cache=None, error=None, labels=None):
+        record = {
+            "group": job.group,
+            "output": job.filename,
+            "model": getattr(message, "model", None) or job.model,
+            "mode": mode,
+            "retry": retry,
+            "continuation": continuation,
+            "cache": cache,
+            "latency_s": round(latency, 3),
+            "first_token_s": None if first_token is None else round(first_token, 3),
+            "stop_reason": getattr(message, "stop_reason", None),
+            **usage_tokens(message),
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        # เช่น {"section": ชื่อส่วน} ของไฟล์ที่สร้างเป็นหลายส่วน
+        record.update(labels or {})
+        self.write(record)
+
+    def hedge(self, job, winner, delay, elapsed, saved, extra_input, extra_output):
+        self.write({
+            "group": job.group,
+            "output": job.filename,
+            "model": job.model,
+            "mode": "hedge",
+            "winner": winner,
+            "hedge_after_s": round(delay, 3),
+            "latency_s": round(elapsed, 3),
+            # ขอบล่างของเวลาที่ประหยัดได้ เวลาจริงของ request หลักที่ถูกยกเลิกไม่มีใครรู้
+            "latency_saved_min_s": round(saved, 3),
+            "extra_input_tokens": extra_input,
+            "extra_output_tokens": extra_output,
+        })
+
+    def cache_hit(self, job):
+        self.write({"group": job.group, "output": job.filename, "model": job.model, "mode": "cache", "retry": 0, "cache": "hit"})
+
+
+def add_log_arguments(parser):
+    parser.add_argument("--log", default=DEFAULT_LOG_PATH, help=f"append per-request telemetry to this JSONL file (default: {DEFAULT_LOG_PATH})")
+    parser.add_argument("--no-log", action="store_true", help="do not write telemetry")
+
+
+def log_from_args(args):
+    if args.no_log:
+        return None
+    return TelemetryLog(args.log)
+
+
+def read_log(path):
+    records = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # บรรทัดสุดท้ายอาจเขียนไม่จบถ้า process ถูก kill
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+class Totals:
+    def __init__(self):
+        self.files = set()
+        self.calls = 0
+        self.hits = 0
+        self.retries = 0
+        self.continuations = 0
+        self.errors = 0
+        self.truncated = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read = 0
+        self.cache_write = 0
+        self.latency = 0.0
+        self.first_token = []
+
+    def add(self, record):
+        self.files.add(record["output"])
+        if record.get("cache") == "hit":
+            self.hits += 1
+            return
+
+        self.calls += 1
+        self.retries += 1 if record.get("retry") else 0
+        self.continuations += 1 if record.get("continuation") else 0
+        self.errors += 1 if record.get("error") else 0
+        self.truncated += 1 if record.get("stop_reason") == "max_tokens" else 0
+        self.input_tokens += record.get("input_tokens", 0)
+        self.output_tokens += record.get("output_tokens", 0)
+        self.cache_read += record.get("cache_read_input_tokens", 0)
+        self.cache_write += record.get("cache_creation_input_tokens", 0)
+        self.latency += record.get("latency_s") or 0.0
+        if record.get("first_token_s") is not None:
+            self.first_token.append(record["first_token_s"])
+
+    @property
+    def mean_latency(self):
+        return self.latency / self.calls if self.calls else 0.0
+
+    @property
+    def mean_first_token(self):
+        return sum(self.first_token) / len(self.first_token) if self.first_token else None
+
+    @property
+    def truncation_rate(self):
+        return self.truncated / self.calls if self.calls else 0.0
+
+    @property
+    def hit_rate(self):
+        total = self.calls + self.hits
+        return self.hits / total if total else 0.0
+
+
+def aggregate(records, key):
+    groups = defaultdict(Totals)
+    for record in records:
+        groups[record.get(key, "-")].add(record)
+    return groups
+
+
+def format_table(headers, rows):
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(str(header)), *(len(row[i]) for row in rows)) if rows else len(str(header)) for i, header in enumerate(headers)]
+    lines = ["  ".join(str(header).ljust(width) for header, width in zip(headers, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    for row in rows:
+        # คอลัมน์แรกเป็นชื่อ ชิดซ้าย ที่เหลือเป็นตัวเลข ชิดขวา
+        lines.append("  ".join(cell.ljust(width) if i == 0 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))))
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def seconds(value):
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def percent(value):
+    return f"{value * 100:.0f}%"
+
+
+def hedge_summary(hedges):
+    won = [record for record in hedges if record["winner"] == "hedge"]
+    saved = sum(record.get("latency_saved_min_s", 0.0) for record in hedges)
+    extra_input = sum(record["extra_input_tokens"] for record in hedges)
+    extra_output = sum(record["extra_output_tokens"] for record in hedges)
+    return (
+        f"Hedging: {len(hedges)} hedge requests, {len(won)} won, at least {saved:.1f}s saved "
+        f"(time each losing primary had already run before its hedge was sent), "
+        f"{extra_input:,} extra input and {extra_output:,} extra output tokens"
+    )
+
+
+def report(records, top=DEFAULT_TOP):
+    hedges = [record for record in records if record.get("mode") == "hedge"]
+    records = [record for record in records if record.get("mode") != "hedge"]
+    overall = Totals()
+    for record in records:
+        overall.add(record)
+    runs = len({record["run"] for record in records})
+
+    sections = [
+        f"{runs} runs, {overall.calls} API calls, {overall.hits} cache hits ({percent(overall.hit_rate)}), "
+        f"{overall.retries} retries, {overall.errors} errors, {overall.truncated} truncated ({percent(overall.truncation_rate)}), "
+        f"{overall.continuations} continuations\n"
+        f"tokens: {overall.input_tokens:,} in, {overall.output_tokens:,} out, "
+        f"{overall.cache_read:,} read from prompt cache, {overall.cache_write:,} written to prompt cache"
+    ]
+
+    groups = aggregate(records, "group")
+    sections.append("Per group\n" + format_table(
+        ["group", "files", "calls", "hits", "retries", "in tok", "out tok", "total time", "mean", "truncated"],
+        [
+            [group, len(t.files), t.calls, t.hits, t.retries, f"{t.input_tokens:,}", f"{t.output_tokens:,}",
+             seconds(t.latency), seconds(t.mean_latency), percent(t.truncation_rate)]
+            for group, t in sorted(groups.items(), key=lambda item: -item[1].latency)
+        ],
+    ))
+
+    files = {output: t for output, t in aggregate(records, "output").items() if t.calls}
+    slowest = sorted(files.items(), key=lambda item: -item[1].mean_latency)[:top]
+    sections.append(f"Slowest files (top {top})\n" + format_table(
+        ["file", "calls", "mean", "first token", "out tok/call"],
+        [[output, t.calls, seconds(t.mean_latency), seconds(t.mean_first_token), f"{t.output_tokens // t.calls:,}"] for output, t in slowest],
+    ))
+
+    hogs = sorted(files.items(), key=lambda item: -(item[1].input_tokens + item[1].output_tokens) / item[1].calls)[:top]
+    sections.append(f"Token hogs per call (top {top})\n" + format_table(
+        ["file", "calls", "in tok/call", "out tok/call", "cache read/call", "retries"],
+        [[output, t.calls, f"{t.input_tokens // t.calls:,}", f"{t.output_tokens // t.calls:,}", f"{t.cache_read // t.calls:,}", t.retries]
+         for output, t in hogs],
+    ))
+
+    truncated = sorted(((output, t) for output, t in files.items() if t.truncated), key=lambda item: -item[1].truncation_rate)
+    if truncated:
+        sections.append("Truncated at max_tokens\n" + format_table(
+            ["file", "calls", "truncated", "rate", "continuations"],
+            [[output, t.calls, t.truncated, percent(t.truncation_rate), t.continuations] for output, t in truncated],
+        ))
+    else:
+        sections.append("Truncated at max_tokens: none")
+
+    if hedges:
+        sections.append(hedge_summary(hedges))
+
+    return "\n\n".join(sections)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="generate_all.py report", description="Summarise the generation telemetry log.")
+    parser.add_argument("--log", default=DEFAULT_LOG_PATH, help=f"telemetry file to read (default: {DEFAULT_LOG_PATH})")
+    parser.add_argument("--last", type=int, metavar="N", help="only include the last N runs")
+    parser.add_argument("--group", action="append", default=[], help="only include files from GROUP (repeatable)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"rows in the slowest/token tables (default: {DEFAULT_TOP})")
+    args = parser.parse_args(argv)
+
+    records = read_log(args.log)
+    if args.last:
+        runs = list(dict.fromkeys(record["run"] for record in records))[-args.last:]
+        records = [record for record in records if record["run"] in runs]
+    if args.group:
+        records = [record for record in records if record.get("group") in args.group]
+
+    if not records:
+        print(f"No telemetry in {args.log}")
+        return 1
+
+    print(report(records, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+import json
+import os
+import re
+import shutil
+import subprocess
+
+TYPESCRIPT = os.path.join("node_modules", "typescript")
+CODE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".json", ".css", ".html")
+SCRIPT_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+
+PROSE_START = re.compile(r"^(Here(?:'s| is| are)|Sure|Certainly|Below|The following|I've|I have|This (?:code|file|component))\b", re.IGNORECASE)
+
+# ใช้ TypeScript ของโปรเจกต์เอง (pnpm install) ตรวจเฉพาะ syntax ไม่ต้องมี type ของไฟล์อื่น
+TS_SYNTAX_CHECK = r"""
+const path = require('path');
+const ts = require(path.resolve(process.argv[1]));
+const fileName = process.argv[2];
+const text = require('fs').readFileSync(0, 'utf8');
+const result = ts.transpileModule(text, {
+  fileName,
+  reportDiagnostics: true,
+  compilerOptions: { jsx: ts.JsxEmit.Preserve, allowJs: true },
+});
+process.stdout.write(JSON.stringify((result.diagnostics || []).map((d) => {
+  const message = ts.flattenDiagnosticMessageText(d.messageText, '\n');
+  if (d.file === undefined || d.start === undefined) return message;
+  const { line, character } = d.file.getLineAndCharacterOfPosition(d.start);
+  return `line ${line + 1}:${character + 1}: ${message}`;
+})));
+"""
+
+
+def first_line(content):
+    for line in content.splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+def check_prose(content):
+    errors = []
+    line = first_line(content)
+    is_comment = line.startswith(('//', '/*', '*', '<!--'))
+    if not is_comment and (PROSE_START.match(line) or (line.endswith(':') and ' ' in line and not re.search(r"[{}();=<>]", line))):
+        errors.append(f"file starts with prose instead of code: {line[:80]!r}")
+
+    for number, text in enumerate(content.splitlines(), 1):
+        if text.strip().startswith('```'):
+            errors.append(f"line {number}: leftover markdown code fence")
+            break
+    return errors
+
+
+def check_json(content):
+    try:
+        json.loads(content)
+    except ValueError as e:
+        return [f"invalid JSON: {e}"]
+    return []
+
+
+def typescript_available():
+    return shutil.which("node") is not None and os.path.isdir(TYPESCRIPT)
+
+
+def check_typescript(filename, content):
+    result = subprocess.run(
+        ["node", "-e", TS_SYNTAX_CHECK, TYPESCRIPT, filename],
+        input=content,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    if result.returncode != 0:
+        return [f"TypeScript syntax check crashed: {result.stderr.strip()[:200]}"]
+    return [f"syntax error at {message}" for message in json.loads(result.stdout or "[]")]
+
+
+def check_brackets(content):
+    # ใช้เมื่อยังไม่ได้ pnpm install: ตรวจว่าวงเล็บปิดครบ (จับไฟล์ที่ถูกตัดกลางทาง)
+    pairs = {')': '(', ']': '[', '}': '{'}
+    stack = []
+    i = 0
+    while i < len(content):
+        char = content[i]
+        if content.startswith('//', i):
+            i = content.find('\n', i)
+            if i == -1:
+                break
+        elif content.startswith('/*', i):
+            end = content.find('*/', i + 2)
+            if end == -1:
+                return ["unterminated block comment"]
+            i = end + 1
+        elif char in '\'"`':
+            i += 1
+            while i < len(content) and content[i] != char:
+                if content[i] == '\\':
+                    i += 1
+                elif content[i] == '\n' and char != '`':
+                    break
+                i += 1
+        elif char in '([{':
+            stack.append((char, content.count('\n', 0, i) + 1))
+        elif char in ')]}':
+            if not stack or stack[-1][0] != pairs[char]:
+                return [f"line {content.count(chr(10), 0, i) + 1}: unexpected {char!r}"]
+            stack.pop()
+        i += 1
+
+    if stack:
+        char, line = stack[-1]
+        return [f"line {line}: {char!r} is never closed (output looks truncated)"]
+    return []
+
+
+def validate_content(filename, content):
+    if not content.strip():
+        return ["file is empty"]
+
+    errors = []
+    if filename.endswith(CODE_EXTENSIONS):
+        errors += check_prose(content)
+    if filename.endswith(".json"):
+        errors += check_json(content)
+    elif filename.endswith(SCRIPT_EXTENSIONS):
+        if typescript_available():
+            errors += check_typescript(filename, content)
+        elif filename.endswith(".ts"):
+            errors += check_brackets(content)
+    return errors
+
+
+def validate_file(filename, path=None):
+    try:
+        with open(path or filename, encoding='utf-8') as f:
+            return validate_content(filename, f.read())
+    except OSError as e:
+        return [f"cannot read output: {e}"]
+
+
+def retry_params(params, reply, errors):
+    feedback = "The file you returned failed validation:\n" + "\n".join(f"- {error}" for error in errors)
+    feedback += "\n\nReturn the complete corrected file. Reply with the file content only, no explanation."
+    retry = dict(params)
+    retry["messages"] = params["messages"] + [
+        {"role": "assistant", "content": reply.rstrip() or "(empty)"},
+        {"role": "user", "content": feedback},
+    ]
+    return retry